@@ -1,6 +1,7 @@
 from airflow.decorators import dag
 from airflow.operators.bash import BashOperator
 from airflow.models import Variable
+from airflow.utils.task_group import TaskGroup
 from datetime import datetime, timedelta
 import json
 import os
@@ -40,12 +41,26 @@ dbt_env = {
     'ELEMENTARY_WAREHOUSE': Variable.get('ELEMENTARY_WAREHOUSE'),
     'ELEMENTARY_DATABASE': Variable.get('ELEMENTARY_DATABASE'),
     'ELEMENTARY_SCHEMA': Variable.get('ELEMENTARY_SCHEMA'),
-    'ELEMENTARY_ENV': Variable.get('ELEMENTARY_ENV')
+    'ELEMENTARY_ENV': Variable.get('ELEMENTARY_ENV'),
+    # Warehouse of the generated profile: 'snowflake' or 'duckdb' (single-writer file, see DBT_DUCKDB_POOL)
+    'DBT_TARGET_TYPE': Variable.get('DBT_TARGET_TYPE', default_var='snowflake'),
+    # Thresholds of the per-model performance gate (current / baseline ratio)
+    'DBT_PERF_WARN_RATIO': Variable.get('DBT_PERF_WARN_RATIO', default_var='2.0'),
+    'DBT_PERF_FAIL_RATIO': Variable.get('DBT_PERF_FAIL_RATIO', default_var='5.0')
 }
 
 # Path to the generate_profiles.py script in the container
 GENERATE_PROFILES_SCRIPT_PATH = os.path.join(PROJECT_ROOT_DIR_AIRFLOW_VAR, 'scripts', 'generate_profiles.py')
 
+# Path to the per-model performance gate (compares the last dbt run with the rolling baseline of each model)
+DBT_PERF_GATE_SCRIPT_PATH = os.path.join(PROJECT_ROOT_DIR_AIRFLOW_VAR, 'scripts', 'dbt_perf_gate.py')
+
+# Path to the single-process dbt runner (debug / deps / parse / seed with cached packages and parse state)
+DBT_RUNNER_SCRIPT_PATH = os.path.join(PROJECT_ROOT_DIR_AIRFLOW_VAR, 'scripts', 'dbt_runner.py')
+
+# Path to the change-driven selection (models downstream of changed sources / changed code since the last successful run)
+DBT_SELECT_CHANGED_SCRIPT_PATH = os.path.join(PROJECT_ROOT_DIR_AIRFLOW_VAR, 'scripts', 'dbt_select_changed.py')
+
 # The path is consistent to the dbt project directory in the container
 DBT_PROJECT_ROOT_IN_CONTAINER = os.path.join(PROJECT_ROOT_DIR_AIRFLOW_VAR, Variable.get('DBT_FOLDER_NAME'))
 
@@ -73,6 +88,159 @@ for key in ['DBT_VAR_YEAR', 'DBT_VAR_MONTH', 'DBT_VAR_QUARTER', 'DBT_VAR_DATE']:
 
 vars_str = json.dumps(dbt_vars)
 
+# Per-model tasks skip the on-run-end elementary upload of the project and the dbt artifacts upload of the
+# elementary package: both run once per dbt invocation, the DAG runs them once after the model groups (elementary_upload).
+# dbt_prepare and dbt_select_changed parse with the same vars: partial parsing is only reused when the CLI vars match.
+task_vars_str = json.dumps(dict(dbt_vars, elementary_upload_run_results=False, disable_dbt_artifacts_autoupload=True))
+
+# Rebuild everything instead of the changed subgraph: backfills (date vars) or the DBT_FULL_RUN Airflow Variable
+dbt_full_run = bool(dbt_vars) or str(get_optional_var('DBT_FULL_RUN')).lower() == 'true'
+
+# --------------- MODEL TASK GRAPH ---------------
+# The task graph is read from the manifest of the last `dbt parse` (task dbt_prepare refreshes it for the next DAG parse)
+DBT_MANIFEST_PATH = os.path.join(DBT_PROJECT_ROOT_IN_CONTAINER, 'target', 'manifest.json')
+
+# Each dbt task writes its artifacts in its own folder, concurrent tasks would overwrite target/ otherwise
+DBT_TASK_TARGET_DIR = 'target/airflow'
+
+# Nodes selected by dbt_select_changed for this run, one name per line ('*' = everything)
+DBT_SELECTION_PATH = os.path.join(DBT_PROJECT_ROOT_IN_CONTAINER, DBT_TASK_TARGET_DIR, 'selected_nodes.txt')
+
+# Airflow pool limiting the number of concurrent dbt tasks (created by airflow-init, see docker-compose)
+DBT_POOL = Variable.get('DBT_POOL', default_var='dbt_models')
+
+# A DuckDB file has a single writer: on the duckdb target, dbt tasks run one at a time in this 1-slot pool
+DBT_DUCKDB_POOL = 'dbt_duckdb'
+if dbt_env['DBT_TARGET_TYPE'].lower() == 'duckdb':
+    DBT_POOL = DBT_DUCKDB_POOL
+
+
+def load_dbt_task_graph(manifest_path, project_name):
+    """
+    Build the task graph of the dbt project from its manifest.
+    Project models get one task group each, the models of an installed package (e.g., elementary)
+    one group for the whole package. Ephemeral models are compiled into their children and get no task.
+
+    Tests run with the group of their model (`--indirect-selection buildable`: tests whose other parents are
+    upstream of it are included). Tests no group covers (sources, seeds, models on parallel branches)
+    are returned as remaining tests.
+
+    Returns:
+        dict: {'groups': {group_id: {'select': str, 'upstream': set}}, 'remaining_tests': list}
+              or None if there is no manifest yet.
+    """
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        nodes = json.load(f).get('nodes', {})
+    parents = {uid: node.get('depends_on', {}).get('nodes', []) for uid, node in nodes.items()}
+
+    def is_model(uid):
+        return uid in nodes and nodes[uid]['resource_type'] == 'model'
+
+    def has_task(uid):
+        return is_model(uid) and nodes[uid].get('config', {}).get('materialized') != 'ephemeral'
+
+    def group_of(uid):
+        node = nodes[uid]
+        return node['name'] if node['package_name'] == project_name else f"package_{node['package_name']}"
+
+    def upstream_models(uid):
+        """Models with a task directly upstream of a node, looking through ephemeral models."""
+        result = set()
+        for parent in parents.get(uid, []):
+            if has_task(parent):
+                result.add(parent)
+            elif is_model(parent):
+                result |= upstream_models(parent)
+        return result
+
+    ancestors_cache = {}
+    def ancestors(uid):
+        if uid not in ancestors_cache:
+            result = set()
+            for parent in parents.get(uid, []):
+                result |= {parent} | ancestors(parent)
+            ancestors_cache[uid] = result
+        return ancestors_cache[uid]
+
+    groups, members = {}, {}
+    for uid, node in nodes.items():
+        if not has_task(uid):
+            continue
+        group_id = group_of(uid)
+        is_project = node['package_name'] == project_name
+        group = groups.setdefault(group_id, {
+            'select': node['name'] if is_project else f"package:{node['package_name']}",
+            'upstream': set(),
+        })
+        group['upstream'] |= {group_of(p) for p in upstream_models(uid)} - {group_id}
+        members.setdefault(group_id, set()).add(uid)
+
+    remaining_tests = []
+    for uid, node in nodes.items():
+        if node['resource_type'] != 'test':
+            continue
+        test_parents = set(parents[uid])
+        covered = any(
+            test_parents - {p} <= ancestors(p) | members[group_of(p)]
+            for p in test_parents if has_task(p)
+        )
+        if not covered:
+            remaining_tests.append(node['name'])
+    return {'groups': groups, 'remaining_tests': sorted(remaining_tests)}
+
+
+def dbt_command(command, target_path, selection_keys=None):
+    """
+    Bash command running dbt in the project with its own target path.
+    The partial parse state of dbt_prepare is copied first so the task does not re-parse the whole project.
+    With selection_keys, dbt only runs if one of them is in the selection file of dbt_select_changed.
+    """
+    dbt = f"{DBT_CLI_PATH} {command} --vars '{task_vars_str}' --target-path {target_path} 2>&1"
+    if selection_keys:
+        patterns = " ".join(f"-e '{key}'" for key in ['*', *selection_keys])
+        dbt = f"""if grep -qxF {patterns} {DBT_SELECTION_PATH}; then
+                {dbt}
+            else
+                echo "⏭️ Not downstream of a changed source or model, skipped"
+            fi"""
+    return f"""
+            set -ex
+            cd {DBT_PROJECT_ROOT_IN_CONTAINER}
+            mkdir -p {target_path}
+            cp -f target/partial_parse.msgpack {target_path}/ 2>/dev/null || true
+            {dbt}
+        """
+
+
+def dbt_remaining_tests_command(tests, target_path):
+    """Bash command running the remaining tests that are in the selection file (all of them on a full run)."""
+    patterns = " ".join(f"-e '{test}'" for test in tests)
+    return f"""
+            set -ex
+            cd {DBT_PROJECT_ROOT_IN_CONTAINER}
+            if grep -qxF '*' {DBT_SELECTION_PATH}; then
+                TESTS="{' '.join(tests)}"
+            else
+                TESTS=$(grep -xF {patterns} {DBT_SELECTION_PATH} | tr '\\n' ' ')
+            fi
+            if [ -n "$TESTS" ]; then
+                mkdir -p {target_path}
+                cp -f target/partial_parse.msgpack {target_path}/ 2>/dev/null || true
+                {DBT_CLI_PATH} test --select $TESTS --vars '{task_vars_str}' --target-path {target_path} 2>&1
+            else
+                echo "⏭️ No remaining test in the selection, skipped"
+            fi
+        """
+
+
+dbt_task_graph = load_dbt_task_graph(DBT_MANIFEST_PATH, dbt_env['DBT_PROJECT_NAME'])
+if dbt_task_graph is None:
+    # First deployment: no manifest yet, run the whole project as one group until dbt_prepare has written it
+    print(f"Warning: dbt manifest not found at '{DBT_MANIFEST_PATH}', running all models in one task")
+    dbt_task_graph = {'groups': {'all_models': {'select': None, 'upstream': set()}}, 'remaining_tests': []}
+
 # Define DAG using decorator style (AIP-48)
 @dag(
     dag_id='dbt_full_pipeline_dag',
@@ -100,57 +268,106 @@ def dbt_full_pipeline_dag_pipeline():
         env=dbt_env # Script will read env vars from dbt_env
     )
 
-    # Task dbt debug
-    dbt_debug = BashOperator(
-        task_id='dbt_debug',
+    # Task dbt prepare: debug / deps / parse / seed in one process (scripts/dbt_runner.py, dbtRunner).
+    # debug and deps are skipped when profiles / packages did not change, the partial parse state and
+    # dbt_packages are cached between runs. The parse refreshes the manifest (task graph of the next DAG parse).
+    dbt_prepare = BashOperator(
+        task_id='dbt_prepare',
         bash_command=f"""
             set -ex
-            cd {DBT_PROJECT_ROOT_IN_CONTAINER} && \\
-            {DBT_CLI_PATH} debug 2>&1
+            rm -rf {DBT_PROJECT_ROOT_IN_CONTAINER}/{DBT_TASK_TARGET_DIR}
+            python {DBT_RUNNER_SCRIPT_PATH} --vars '{task_vars_str}' 2>&1
         """,
         env=dbt_env
     )
 
-    # Task dbt deps
-    dbt_deps = BashOperator(
-        task_id='dbt_deps',
+    # Task change-driven selection: models downstream of sources whose ingest changed (ingest manifest) or of code
+    # changed since the last successful run (state:modified+ against its manifest). Unselected models and tests are skipped.
+    dbt_select_changed = BashOperator(
+        task_id='dbt_select_changed',
         bash_command=f"""
             set -ex
-            cd {DBT_PROJECT_ROOT_IN_CONTAINER} && \\
-            {DBT_CLI_PATH} deps 2>&1
+            python {DBT_SELECT_CHANGED_SCRIPT_PATH} --vars '{task_vars_str}' {'--full' if dbt_full_run else ''} 2>&1
         """,
         env=dbt_env
     )
 
-    # Task dbt seed
-    dbt_seed = BashOperator(
-        task_id='dbt_seed',
+    # One task group per model (or package): run the model, then its tests, if selected by dbt_select_changed.
+    # Retries redo one model, the pool limits how many models run at once.
+    model_groups = {}
+    for group_id, group in dbt_task_graph['groups'].items():
+        select = f" --select {group['select']}" if group['select'] else ""
+        selection_keys = [group_id] if group['select'] else None # The fallback group always runs
+        with TaskGroup(group_id=group_id) as model_group:
+            dbt_run_model = BashOperator(
+                task_id='run',
+                bash_command=dbt_command(f"run{select}", f"{DBT_TASK_TARGET_DIR}/run/{group_id}", selection_keys),
+                env=dbt_env,
+                pool=DBT_POOL
+            )
+            dbt_test_model = BashOperator(
+                task_id='test',
+                bash_command=dbt_command(f"test{select} --indirect-selection buildable", f"{DBT_TASK_TARGET_DIR}/test/{group_id}", selection_keys),
+                env=dbt_env,
+                pool=DBT_POOL
+            )
+            dbt_run_model >> dbt_test_model
+        model_groups[group_id] = model_group
+
+    # Wire the groups by ref() dependencies, independent branches run in parallel
+    for group_id, group in dbt_task_graph['groups'].items():
+        upstream = [model_groups[u] for u in sorted(group['upstream']) if u in model_groups]
+        if upstream:
+            upstream >> model_groups[group_id]
+        else:
+            dbt_select_changed >> model_groups[group_id]
+    downstream_ids = {u for group in dbt_task_graph['groups'].values() for u in group['upstream']}
+    last_groups = [model_groups[g] for g in model_groups if g not in downstream_ids]
+
+    # Task performance gate: per-model execution time / rows / bytes scanned vs the rolling baseline
+    # Warns on DBT_PERF_WARN_RATIO, fails the DAG on DBT_PERF_FAIL_RATIO (see scripts/dbt_perf_gate.py)
+    dbt_perf_gate = BashOperator(
+        task_id='dbt_perf_gate',
         bash_command=f"""
             set -ex
-            cd {DBT_PROJECT_ROOT_IN_CONTAINER} && \\
-            {DBT_CLI_PATH} seed 2>&1
+            python {DBT_PERF_GATE_SCRIPT_PATH} \\
+                --target-dir {DBT_PROJECT_ROOT_IN_CONTAINER}/target \\
+                --run-results-glob '{DBT_PROJECT_ROOT_IN_CONTAINER}/{DBT_TASK_TARGET_DIR}/run/*/run_results.json' 2>&1
         """,
-        env=dbt_env
+        env=dbt_env,
+        retries=0 # A regression does not go away on retry
     )
 
-    # Task dbt run
-    dbt_run = BashOperator(
-        task_id='dbt_run',
+    # Task dbt test for the tests no model group covers (sources, seeds, models on parallel branches)
+    dbt_test_remaining = BashOperator(
+        task_id='dbt_test_remaining',
+        bash_command=dbt_remaining_tests_command(dbt_task_graph['remaining_tests'], f"{DBT_TASK_TARGET_DIR}/test/remaining")
+            if dbt_task_graph['remaining_tests'] else "echo 'No remaining tests'",
+        env=dbt_env,
+        pool=DBT_POOL
+    )
+
+    # Task elementary upload: the dbt artifacts (models, tests, sources, ...) the per-model tasks did not upload, once per DAG run.
+    # Their run and test results are still recorded by the elementary package's own on-run-end hook.
+    # Runs with the uploads on (other vars than the tasks), so it does its own parse instead of reusing dbt_prepare's.
+    elementary_upload = BashOperator(
+        task_id='elementary_upload',
         bash_command=f"""
             set -ex
-            cd {DBT_PROJECT_ROOT_IN_CONTAINER} && \\
-            {DBT_CLI_PATH} run --vars '{vars_str}' 2>&1
+            cd {DBT_PROJECT_ROOT_IN_CONTAINER}
+            mkdir -p {DBT_TASK_TARGET_DIR}/elementary
+            {DBT_CLI_PATH} run-operation elementary.upload_dbt_artifacts --vars '{vars_str}' --target-path {DBT_TASK_TARGET_DIR}/elementary 2>&1
         """,
-        env=dbt_env
+        env=dbt_env,
+        pool=DBT_POOL
     )
 
-    # Task dbt test
-    dbt_test = BashOperator(
-        task_id='dbt_test',
+    # Task save the production state: the next run only rebuilds what changed after this successful run
+    dbt_save_state = BashOperator(
+        task_id='dbt_save_state',
         bash_command=f"""
             set -ex
-            cd {DBT_PROJECT_ROOT_IN_CONTAINER} && \\
-            {DBT_CLI_PATH} test 2>&1
+            python {DBT_SELECT_CHANGED_SCRIPT_PATH} --save-state 2>&1
         """,
         env=dbt_env
     )
@@ -178,7 +395,8 @@ def dbt_full_pipeline_dag_pipeline():
     )
 
     # Define workflow using operator >>
-    generate_dbt_profiles >> dbt_debug >> dbt_deps >> dbt_seed >> dbt_run >> dbt_test >> dbt_docs_generate >> elementary_run_report
+    generate_dbt_profiles >> dbt_prepare >> dbt_select_changed
+    last_groups >> dbt_perf_gate >> dbt_test_remaining >> elementary_upload >> dbt_save_state >> dbt_docs_generate >> elementary_run_report
 
 # Initialize the DAG by calling the decorated pipeline function
 dbt_full_pipeline_dag = dbt_full_pipeline_dag_pipeline()
@@ -1,8 +1,12 @@
 from airflow.decorators import dag
 from airflow.operators.bash import BashOperator
+from airflow.operators.python import PythonOperator
 from airflow.models import Variable
 from datetime import datetime, timedelta
 
+import os
+import json
+
 default_args = {
     'owner': 'airflow',
     'depends_on_past': False,
@@ -22,6 +26,27 @@ snowflake_env_vars = {
     'SNOWFLAKE_ENV': Variable.get('SNOWFLAKE_ENV')
 }
 
+# Metrics written by extract_load/utils/ingest_metrics.py (INGEST_METRICS_DIR)
+INGEST_LAST_RUN_PATH = "/opt/airflow/logs/metrics/ingest_last_run.json"
+
+def push_ingest_metrics(ti):
+    """
+    Push the per-stage metrics of the last ingest run to XCom.
+    The return value (duration per table and stage) is the default XCom, the full stage records go under 'stages'.
+    """
+    if not os.path.exists(INGEST_LAST_RUN_PATH):
+        print(f"⚠️ No ingest metrics found at {INGEST_LAST_RUN_PATH}")
+        return None
+    with open(INGEST_LAST_RUN_PATH, "r", encoding="utf-8") as f:
+        last_run = json.load(f)
+
+    durations = {}
+    for stage in last_run.get("stages", []):
+        durations.setdefault(stage["table"], {})[stage["stage"]] = stage["duration_seconds"]
+    ti.xcom_push(key="stages", value=last_run.get("stages", []))
+    print(f"📊 Ingest run {last_run.get('run_id')}: {json.dumps(durations, indent=2)}")
+    return {"run_id": last_run.get("run_id"), "status": last_run.get("status"), "durations": durations}
+
 # Define DAG using decorator style (AIP-48)
 @dag(
     dag_id='ingest_all_raw_data_dag',
@@ -54,7 +79,14 @@ def ingest_all_raw_data_pipeline():
         env=snowflake_env_vars
     )
 
-    ingest_all_data
+    # Runs even if the ingest failed, so slow / failed runs are still visible
+    push_metrics = PythonOperator(
+        task_id='push_ingest_metrics',
+        python_callable=push_ingest_metrics,
+        trigger_rule='all_done'
+    )
+
+    ingest_all_data >> push_metrics
 
 # Initialize the DAG by calling the decorated pipeline function
 ingest_all_raw_data_dag = ingest_all_raw_data_pipeline()
\ No newline at end of file
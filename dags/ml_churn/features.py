@@ -0,0 +1,66 @@
+import pyarrow as pa
+import pandas as pd
+from ml_churn.ml_config import FEATURE_TABLE, FEATURE_SCHEMA, FEATURE_BATCH_SIZE, ML_WAREHOUSE
+from ml_churn.warehouse import qualified_table
+
+def feature_schema(columns: list = None) -> pa.Schema:
+    """Arrow schema of the fetched columns (all columns of the feature table by default)."""
+    if not columns:
+        return FEATURE_SCHEMA
+    return pa.schema([FEATURE_SCHEMA.field(c) for c in columns])
+
+def feature_query(columns: list = None, table: str = FEATURE_TABLE) -> str:
+    """SELECT of the needed columns only."""
+    return f"SELECT {', '.join(feature_schema(columns).names)} FROM {table}"
+
+def iter_arrow_batches(conn, columns: list = None, batch_size: int = FEATURE_BATCH_SIZE, warehouse: str = ML_WAREHOUSE):
+    """
+    Stream the feature table as Arrow record batches of at most `batch_size` rows,
+    cast to FEATURE_SCHEMA. Rows never go through Python objects.
+    """
+    schema = feature_schema(columns)
+    query = feature_query(columns, qualified_table(FEATURE_TABLE, warehouse))
+    if warehouse == "duckdb":
+        chunks = (pa.Table.from_batches([batch]) for batch in conn.execute(query).fetch_record_batch(batch_size))
+        cs = None
+    else:
+        cs = conn.cursor()
+        cs.execute(query)
+        # Result chunks as Arrow tables (size decided by Snowflake), split to batch_size below
+        chunks = cs.fetch_arrow_batches()
+    try:
+        for chunk in chunks:
+            chunk = chunk.rename_columns([name.lower() for name in chunk.column_names]).select(schema.names)
+            for batch in chunk.cast(schema).to_batches(max_chunksize=batch_size):
+                yield batch
+    finally:
+        if cs is not None:
+            cs.close()
+
+def table_to_frame(table: pa.Table) -> pd.DataFrame:
+    """
+    Arrow table to pandas without object columns: datetime64 dates, Arrow backed strings.
+    The Arrow buffers are released while converting, so the data is not held twice.
+    """
+    return table.to_pandas(
+        date_as_object=False,
+        types_mapper={pa.string(): pd.StringDtype("pyarrow")}.get,
+        split_blocks=True,
+        self_destruct=True,
+    )
+
+def iter_feature_frames(conn, columns: list = None, batch_size: int = FEATURE_BATCH_SIZE, warehouse: str = ML_WAREHOUSE):
+    """Stream the feature table as DataFrames of at most `batch_size` rows (memory bounded by one batch)."""
+    for batch in iter_arrow_batches(conn, columns, batch_size, warehouse):
+        yield table_to_frame(pa.Table.from_batches([batch]))
+
+def load_features(conn, columns: list = None, batch_size: int = FEATURE_BATCH_SIZE, warehouse: str = ML_WAREHOUSE) -> pd.DataFrame:
+    """
+    Load the feature table in one DataFrame, fetched batch by batch.
+    Batches are kept in their compact Arrow form and converted once at the end (no concat of DataFrames).
+    """
+    schema = feature_schema(columns)
+    table = pa.Table.from_batches(list(iter_arrow_batches(conn, columns, batch_size, warehouse)), schema=schema)
+    df = table_to_frame(table)
+    print(f"📥 Loaded {len(df)} rows x {len(df.columns)} columns from {FEATURE_TABLE} ({df.memory_usage(deep=True).sum() / 1024 ** 2:.1f} MB in memory)")
+    return df
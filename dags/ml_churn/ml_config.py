@@ -0,0 +1,92 @@
+import os
+import pyarrow as pa
+
+# --- Project root (dags/ml_churn/ -> project root), /opt/airflow in the containers ---
+PROJECT_ROOT_DIR = os.getenv("PROJECT_ROOT_DIR", os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+# --------------- WAREHOUSE ---------------
+# Where features are read from and predictions are written to:
+#   - "snowflake": the MART schema (Airflow Variables SNOWFLAKE_*)
+#   - "duckdb": local stand-in, the DuckDB file of the dbt duckdb target (see scripts/generate_profiles.py)
+ML_WAREHOUSE = os.getenv("ML_WAREHOUSE", "snowflake").lower()
+DUCKDB_PATH = os.getenv("INGEST_DUCKDB_PATH", os.path.join(PROJECT_ROOT_DIR, "data", "warehouse", "olist.duckdb"))
+DUCKDB_MART_SCHEMA = os.getenv("ML_DUCKDB_SCHEMA", "mart")
+
+# --------------- FEATURE TABLE ---------------
+# dbt model with one row per customer (models/marts/facts/customer_analytics/fct_customer_features_ml.sql)
+FEATURE_TABLE = os.getenv("ML_FEATURE_TABLE", "fct_customer_features_ml")
+
+ID_COLUMN = "customer_unique_id"
+DATE_COLUMNS = ["first_purchase_date", "last_purchase_date"]
+LABEL_COLUMN = "is_churned"
+# Model inputs, in the order the model is trained on
+MODEL_FEATURES = ["total_orders", "total_accounts", "total_revenue", "avg_revenue_per_order", "days_since_last_order"]
+
+# Arrow type of each column once fetched: narrow numerics and native dates, no object columns.
+# float32 loses nothing for the model (scikit-learn trees work on float32 internally).
+FEATURE_SCHEMA = pa.schema([
+    (ID_COLUMN, pa.string()),
+    ("first_purchase_date", pa.date32()),
+    ("last_purchase_date", pa.date32()),
+    ("total_orders", pa.int32()),
+    ("total_accounts", pa.int32()),
+    ("total_revenue", pa.float32()),
+    ("avg_revenue_per_order", pa.float32()),
+    ("days_since_last_order", pa.int32()),
+    (LABEL_COLUMN, pa.bool_()),
+])
+
+# --------------- FEATURE FETCH ---------------
+# Max rows per Arrow record batch read from the warehouse (bounds the memory of one batch)
+FEATURE_BATCH_SIZE = int(os.getenv("ML_FEATURE_BATCH_SIZE", "100000"))
+
+# --------------- MODELS ---------------
+# Trained models, one churn_model_<timestamp>.pkl per training run (/opt/airflow/ml_models in the containers)
+MODEL_DIR = os.getenv("ML_MODEL_DIR", os.path.join(PROJECT_ROOT_DIR, "ml_models"))
+# Registry of the trained models: feature table fingerprint, config, metrics and artifact of each (see ml_churn/registry.py)
+REGISTRY_PATH = os.getenv("ML_REGISTRY_PATH", os.path.join(MODEL_DIR, "registry.json"))
+# Model artifacts kept on disk (newest first), older ones are deleted after each training
+MODEL_RETENTION = int(os.getenv("ML_MODEL_RETENTION", "5"))
+
+# --------------- TRAINING ---------------
+# Cores used by the model search and the final fit (see ml_churn/training.py)
+TRAINING_WORKERS = int(os.getenv("ML_TRAINING_WORKERS", str(os.cpu_count() or 1)))
+# Wall-clock budget of the opt-in model search and the refit of its best model (every model family shares it)
+SEARCH_BUDGET_SECONDS = int(os.getenv("ML_SEARCH_BUDGET_SECONDS", "300"))
+
+# --------------- PREDICTIONS ---------------
+PREDICTIONS_TABLE = os.getenv("ML_PREDICTIONS_TABLE", "ml_churn_predictions")
+
+# Columns of the predictions table, in order
+PREDICTIONS_SCHEMA = pa.schema([
+    (ID_COLUMN, pa.string()),
+    ("churn_probability", pa.float64()),
+    ("actual_churned", pa.bool_()),
+    ("first_purchase_date", pa.date32()),
+    ("last_purchase_date", pa.date32()),
+    ("total_orders", pa.int32()),
+    ("total_accounts", pa.int32()),
+    ("total_revenue", pa.float64()),
+    ("avg_revenue_per_order", pa.float64()),
+    ("days_since_last_order", pa.int32()),
+])
+
+# Rows per Parquet file staged for COPY INTO (Snowflake loads the files in parallel)
+PREDICTIONS_FILE_ROWS = int(os.getenv("ML_PREDICTIONS_FILE_ROWS", "1000000"))
+PREDICTIONS_COMPRESSION = os.getenv("ML_PREDICTIONS_COMPRESSION", "snappy")
+SNOWFLAKE_PUT_PARALLEL = int(os.getenv("SNOWFLAKE_PUT_PARALLEL", "8"))
+
+# --------------- SCORING ---------------
+# Churn score of every customer with the latest model (see ml_churn/scoring.py)
+SCORES_TABLE = os.getenv("ML_SCORES_TABLE", "ml_churn_scores")
+SCORES_SCHEMA = pa.schema([
+    (ID_COLUMN, pa.string()),
+    ("churn_probability", pa.float64()),
+    ("model_name", pa.string()),
+    ("scored_at", pa.timestamp("us")),
+])
+# Processes scoring batches in parallel, and rows per batch
+SCORING_WORKERS = int(os.getenv("ML_SCORING_WORKERS", str(os.cpu_count() or 1)))
+SCORING_BATCH_SIZE = int(os.getenv("ML_SCORING_BATCH_SIZE", str(FEATURE_BATCH_SIZE)))
+# Feature hash of each scored customer and the model used, read by the next incremental run
+SCORING_STATE_DIR = os.getenv("ML_SCORING_STATE_DIR", os.path.join(PROJECT_ROOT_DIR, "logs", "ml_scoring"))
@@ -0,0 +1,129 @@
+import os
+import time
+import shutil
+import tempfile
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+import pandas as pd
+from ml_churn.ml_config import (
+    ML_WAREHOUSE, PREDICTIONS_TABLE, PREDICTIONS_SCHEMA, PREDICTIONS_FILE_ROWS,
+    PREDICTIONS_COMPRESSION, SNOWFLAKE_PUT_PARALLEL, DUCKDB_MART_SCHEMA,
+)
+
+# Snowflake column type of each Arrow type of the written tables
+SNOWFLAKE_TYPES = {
+    pa.string(): "STRING",
+    pa.float64(): "FLOAT",
+    pa.bool_(): "BOOLEAN",
+    pa.date32(): "DATE",
+    pa.int32(): "INT",
+    pa.timestamp("us"): "TIMESTAMP_NTZ",
+}
+
+# Amounts fetched as float32 features, written back rounded to cents (13664.08, not 13664.080078125)
+AMOUNT_COLUMNS = ["total_revenue", "avg_revenue_per_order"]
+
+def to_arrow(df: pd.DataFrame) -> pa.Table:
+    """Prediction frame as an Arrow table with the columns and types of PREDICTIONS_SCHEMA (datetime64 dates become DATE)."""
+    table = pa.Table.from_pandas(df[PREDICTIONS_SCHEMA.names], preserve_index=False).cast(PREDICTIONS_SCHEMA)
+    for column in AMOUNT_COLUMNS:
+        table = table.set_column(table.schema.get_field_index(column), column, pc.round(table[column], 2))
+    return table
+
+def snowflake_columns(schema: pa.Schema) -> str:
+    """Snowflake column definitions of an Arrow schema."""
+    return ", ".join(f"{field.name.upper()} {SNOWFLAKE_TYPES[field.type]}" for field in schema)
+
+def snowflake_merge(target: str, source: str, schema: pa.Schema, merge_key: str) -> str:
+    """MERGE of the rows of `source` into `target` on `merge_key` (update existing keys, insert new ones)."""
+    columns = [field.name.upper() for field in schema]
+    key = merge_key.upper()
+    return (
+        f"MERGE INTO {target} t USING {source} s ON t.{key} = s.{key} "
+        f"WHEN MATCHED THEN UPDATE SET {', '.join(f't.{c} = s.{c}' for c in columns if c != key)} "
+        f"WHEN NOT MATCHED THEN INSERT ({', '.join(columns)}) VALUES ({', '.join(f's.{c}' for c in columns)})"
+    )
+
+def write_parquet_files(table: pa.Table, output_dir: str, file_rows: int = PREDICTIONS_FILE_ROWS) -> list:
+    """Write the table as compressed Parquet files of at most `file_rows` rows. Returns the file paths."""
+    os.makedirs(output_dir, exist_ok=True)
+    files = []
+    for i, offset in enumerate(range(0, table.num_rows, file_rows)):
+        path = os.path.join(output_dir, f"part-{i:05d}.parquet")
+        pq.write_table(table.slice(offset, file_rows), path, compression=PREDICTIONS_COMPRESSION)
+        files.append(path)
+    return files
+
+def write_table_snowflake(conn, table: pa.Table, table_name: str, merge_key: str = None):
+    """
+    Bulk load: compressed Parquet files PUT to the stage of a loading table, one COPY INTO,
+    then the loading table is swapped with the target table, so dashboards never see a half-empty table.
+    With `merge_key`, the loaded rows are merged into the target instead (rows of other keys are kept).
+    """
+    target = table_name.upper()
+    load_table = f"{target}__LOADING"
+
+    tmp_dir = tempfile.mkdtemp(prefix=f"stage_{table_name}_")
+    try:
+        files = write_parquet_files(table, os.path.join(tmp_dir, "data"))
+        cs = conn.cursor()
+        try:
+            cs.execute(f"CREATE OR REPLACE TABLE {load_table} ({snowflake_columns(table.schema)})")
+            if files:
+                data_dir = os.path.join(tmp_dir, "data").replace(os.sep, "/")
+                cs.execute(f"PUT 'file://{data_dir}/*.parquet' @%{load_table} PARALLEL={SNOWFLAKE_PUT_PARALLEL} AUTO_COMPRESS=FALSE OVERWRITE=TRUE")
+                cs.execute(
+                    f"COPY INTO {load_table} FROM @%{load_table} "
+                    f"FILE_FORMAT = (TYPE = PARQUET USE_LOGICAL_TYPE = TRUE) MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE PURGE = TRUE"
+                )
+            cs.execute(f"CREATE TABLE IF NOT EXISTS {target} LIKE {load_table}")
+            if merge_key:
+                cs.execute(snowflake_merge(target, load_table, table.schema, merge_key))
+            else:
+                cs.execute(f"ALTER TABLE {target} SWAP WITH {load_table}")
+            cs.execute(f"DROP TABLE IF EXISTS {load_table}")
+        finally:
+            cs.close()
+        print(f"📦 [{table_name}] Loaded {len(files)} staged Parquet file(s) into {target} via COPY INTO.")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+def write_table_duckdb(conn, table: pa.Table, table_name: str, merge_key: str = None):
+    """
+    Local stand-in: replace the table in the DuckDB mart schema (CREATE OR REPLACE is one atomic statement).
+    With `merge_key`, rows of the loaded keys are replaced in one transaction.
+    """
+    target = f"{DUCKDB_MART_SCHEMA}.{table_name}"
+    conn.execute(f"CREATE SCHEMA IF NOT EXISTS {DUCKDB_MART_SCHEMA}")
+    conn.register("loaded_frame", table)
+    try:
+        if merge_key:
+            conn.execute("BEGIN TRANSACTION")
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {target} AS SELECT * FROM loaded_frame LIMIT 0")
+            conn.execute(f"DELETE FROM {target} WHERE {merge_key} IN (SELECT {merge_key} FROM loaded_frame)")
+            conn.execute(f"INSERT INTO {target} BY NAME SELECT * FROM loaded_frame")
+            conn.execute("COMMIT")
+        else:
+            conn.execute(f"CREATE OR REPLACE TABLE {target} AS SELECT * FROM loaded_frame")
+    finally:
+        conn.unregister("loaded_frame")
+    print(f"🦆 [{table_name}] Loaded into DuckDB ({target}).")
+
+# --------------- SINK REGISTRY ---------------
+TABLE_SINKS = {
+    "snowflake": write_table_snowflake,
+    "duckdb": write_table_duckdb,
+}
+
+def write_table(conn, table: pa.Table, table_name: str, warehouse: str = ML_WAREHOUSE, merge_key: str = None):
+    """Bulk load an Arrow table: replace `table_name`, or merge into it on `merge_key`."""
+    if warehouse not in TABLE_SINKS:
+        raise ValueError(f"❌ Unknown warehouse '{warehouse}'. Valid warehouses: {', '.join(TABLE_SINKS)}")
+    start = time.perf_counter()
+    TABLE_SINKS[warehouse](conn, table, table_name, merge_key)
+    print(f"✅ {table.num_rows} rows {'merged into' if merge_key else 'written to'} {table_name} in {time.perf_counter() - start:.1f}s.")
+
+def write_predictions(conn, df: pd.DataFrame, warehouse: str = ML_WAREHOUSE, table_name: str = PREDICTIONS_TABLE):
+    """Replace the predictions table with the rows of `df` in one bulk load."""
+    write_table(conn, to_arrow(df), table_name, warehouse)
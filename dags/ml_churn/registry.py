@@ -0,0 +1,111 @@
+import os
+import glob
+import json
+import hashlib
+from datetime import datetime
+from ml_churn.ml_config import (
+    ML_WAREHOUSE, FEATURE_TABLE, FEATURE_SCHEMA, MODEL_DIR, REGISTRY_PATH, MODEL_RETENTION,
+)
+from ml_churn.warehouse import qualified_table
+
+def feature_fingerprint(conn, warehouse: str = ML_WAREHOUSE) -> dict:
+    """
+    Fingerprint of the feature table, computed in the warehouse (no rows are fetched):
+    row count, latest purchase dates and an order-independent hash of every row.
+
+    Returns:
+        dict: {'rows', 'max_first_purchase_date', 'max_last_purchase_date', 'content_hash'}
+    """
+    columns = ", ".join(FEATURE_SCHEMA.names)
+    # Snowflake hashes the whole table natively, DuckDB sums the row hashes (as HUGEINT, no overflow)
+    content_hash = f"SUM(HASH({columns}))" if warehouse == "duckdb" else "HASH_AGG(*)"
+    query = (
+        f"SELECT COUNT(*), MAX(first_purchase_date), MAX(last_purchase_date), {content_hash} "
+        f"FROM {qualified_table(FEATURE_TABLE, warehouse)}"
+    )
+    if warehouse == "duckdb":
+        row = conn.execute(query).fetchone()
+    else:
+        cs = conn.cursor()
+        try:
+            row = cs.execute(query).fetchone()
+        finally:
+            cs.close()
+    rows, max_first, max_last, content = row
+    return {
+        "rows": int(rows),
+        "max_first_purchase_date": max_first.isoformat() if max_first else None,
+        "max_last_purchase_date": max_last.isoformat() if max_last else None,
+        "content_hash": str(content),
+    }
+
+def config_hash(config: dict) -> str:
+    """Hash of the training config and the scikit-learn version (a library upgrade retrains too)."""
+    import sklearn
+
+    payload = json.dumps({"config": config, "sklearn": sklearn.__version__}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+def load_registry(path: str = REGISTRY_PATH) -> list:
+    """All registered models, oldest first."""
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def save_registry(entries: list, path: str = REGISTRY_PATH):
+    """Write the registry atomically (a crash never leaves a truncated file)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(entries, f, indent=2)
+    os.replace(f"{path}.tmp", path)
+
+def find_model(entries: list, fingerprint: dict, config_key: str):
+    """Latest model trained on the same data with the same config whose artifact still exists, or None."""
+    for entry in reversed(entries):
+        if (
+            entry["fingerprint"] == fingerprint
+            and entry["config_hash"] == config_key
+            and os.path.exists(entry["artifact_path"])
+        ):
+            return entry
+    return None
+
+def register_model(entries: list, artifact_path: str, fingerprint: dict, config: dict, metrics: dict, train_seconds: float, model: dict = None, path: str = REGISTRY_PATH) -> dict:
+    """Add a trained model to the registry and save it (`model`: the chosen model and its search results)."""
+    entry = {
+        "model_name": os.path.basename(artifact_path),
+        "artifact_path": artifact_path,
+        "registered_at": datetime.now().isoformat(timespec="seconds"),
+        "fingerprint": fingerprint,
+        "config": config,
+        "config_hash": config_hash(config),
+        "model": model,
+        "metrics": metrics,
+        "train_seconds": round(train_seconds, 1),
+    }
+    entries.append(entry)
+    save_registry(entries, path)
+    print(f"🗂️ Model {entry['model_name']} registered in {path}")
+    return entry
+
+def prune_models(entries: list, keep: int = MODEL_RETENTION, model_dir: str = MODEL_DIR, path: str = REGISTRY_PATH) -> list:
+    """
+    Retention: keep the `keep` newest churn_model_*.pkl (registered or not), delete the older ones
+    and mark their registry entries as evicted (the entries stay for the metrics history).
+
+    Returns:
+        list: Deleted artifact paths.
+    """
+    artifacts = sorted(glob.glob(os.path.join(model_dir, "churn_model_*.pkl")), reverse=True)
+    evicted = artifacts[max(keep, 1):] # The newest model is always kept, it is the one being scored with
+    for artifact in evicted:
+        os.remove(artifact)
+    if evicted:
+        evicted_at = datetime.now().isoformat(timespec="seconds")
+        for entry in entries:
+            if entry["artifact_path"] in evicted:
+                entry["evicted_at"] = evicted_at
+        save_registry(entries, path)
+        print(f"🧹 Deleted {len(evicted)} old model artifact(s), {min(len(artifacts), max(keep, 1))} kept in {model_dir}")
+    return evicted
@@ -0,0 +1,167 @@
+import os
+import glob
+import json
+import time
+from collections import deque
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+import joblib
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from threadpoolctl import threadpool_limits
+from ml_churn.ml_config import (
+    ML_WAREHOUSE, MODEL_DIR, FEATURE_TABLE, ID_COLUMN, MODEL_FEATURES,
+    SCORES_TABLE, SCORES_SCHEMA, SCORING_WORKERS, SCORING_BATCH_SIZE, SCORING_STATE_DIR,
+)
+from ml_churn.features import iter_feature_frames
+from ml_churn.predictions import write_table
+from ml_churn.warehouse import execute, qualified_table
+
+# Files of the scoring state (SCORING_STATE_DIR)
+STATE_FILE = "scoring_state.json"
+HASHES_FILE = "feature_hashes.parquet"
+
+def latest_model_path(model_dir: str = MODEL_DIR) -> str:
+    """Newest churn_model_<timestamp>.pkl (the timestamp in the name sorts chronologically)."""
+    paths = sorted(glob.glob(os.path.join(model_dir, "churn_model_*.pkl")))
+    if not paths:
+        raise FileNotFoundError(f"❌ No churn_model_*.pkl in {model_dir}, run ml_churn_training_dag first.")
+    return paths[-1]
+
+# --------------- WORKERS ---------------
+# Each pool process loads the model once, then only receives feature batches
+_worker_model = None
+
+def init_worker(model_path: str):
+    global _worker_model
+    _worker_model = joblib.load(model_path)
+    # One core per process: the pool already spreads the batches over every core
+    if "n_jobs" in _worker_model.get_params():
+        _worker_model.set_params(n_jobs=1)
+    # Models without n_jobs (HistGradientBoosting) use OpenMP threads instead
+    threadpool_limits(limits=1)
+
+def score_batch(features: pd.DataFrame) -> np.ndarray:
+    """Churn probability of each row of a feature batch."""
+    return _worker_model.predict_proba(features)[:, 1]
+
+# --------------- STATE ---------------
+def feature_hashes(frame: pd.DataFrame) -> np.ndarray:
+    """64-bit hash of each customer's model inputs: it changes when any input of the customer changes."""
+    return pd.util.hash_pandas_object(frame[MODEL_FEATURES], index=False).to_numpy().view(np.int64)
+
+def load_state(state_dir: str = SCORING_STATE_DIR):
+    """
+    State of the last scoring run.
+
+    Returns:
+        tuple: (state dict, pd.Series of feature hashes indexed by customer id), ({}, None) without a previous run.
+    """
+    state_path, hashes_path = os.path.join(state_dir, STATE_FILE), os.path.join(state_dir, HASHES_FILE)
+    if not (os.path.exists(state_path) and os.path.exists(hashes_path)):
+        return {}, None
+    with open(state_path, "r", encoding="utf-8") as f:
+        state = json.load(f)
+    hashes = pd.read_parquet(hashes_path)
+    return state, pd.Series(hashes["feature_hash"].to_numpy(), index=hashes[ID_COLUMN].to_numpy())
+
+def save_state(state: dict, hashes: pd.DataFrame, state_dir: str = SCORING_STATE_DIR):
+    """Keep the feature hashes of this run (written after the scores, a failed write rescores next time)."""
+    os.makedirs(state_dir, exist_ok=True)
+    hashes.to_parquet(os.path.join(state_dir, HASHES_FILE), index=False)
+    with open(os.path.join(state_dir, STATE_FILE), "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+
+# --------------- SCORING ---------------
+def score_customers(
+    conn,
+    warehouse: str = ML_WAREHOUSE,
+    incremental: bool = True,
+    model_path: str = None,
+    workers: int = SCORING_WORKERS,
+    batch_size: int = SCORING_BATCH_SIZE,
+    state_dir: str = SCORING_STATE_DIR,
+) -> dict:
+    """
+    Score every customer of the feature table with the latest model, in batches spread over a process pool.
+    Incremental runs only score customers whose features changed (or who are new) since the last run
+    with the same model, merge those scores, and drop the scores of customers no longer in the feature table.
+
+    Returns:
+        dict: {'model_name', 'incremental', 'customers', 'scored', 'seconds'}
+    """
+    model_path = model_path or latest_model_path()
+    model_name = os.path.basename(model_path)
+    state, previous = load_state(state_dir)
+    if incremental and previous is None:
+        print(f"🔁 No previous scoring state in {state_dir}, every customer is scored.")
+        incremental = False
+    elif incremental and state.get("model_name") != model_name:
+        print(f"🔁 New model {model_name} (last scores: {state.get('model_name')}), every customer is scored.")
+        incremental = False
+    print(f"🧮 Scoring {FEATURE_TABLE} with {model_name} on {workers} process(es), batches of {batch_size} rows")
+
+    start = time.perf_counter()
+    scored_ids, probabilities, hashes = [], [], []
+    customers = 0
+    in_flight = deque()
+
+    def collect():
+        batch_ids, future = in_flight.popleft()
+        scored_ids.append(batch_ids)
+        probabilities.append(future.result())
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(model_path,)) as pool:
+        for frame in iter_feature_frames(conn, [ID_COLUMN, *MODEL_FEATURES], batch_size, warehouse):
+            ids = frame[ID_COLUMN].to_numpy(dtype=object)
+            frame_hashes = feature_hashes(frame)
+            hashes.append(pd.DataFrame({ID_COLUMN: ids, "feature_hash": frame_hashes}))
+            customers += len(frame)
+            if incremental:
+                # Unknown customers get 0, which never equals a real hash
+                changed = previous.reindex(ids, fill_value=0).to_numpy() != frame_hashes
+                frame, ids = frame[changed], ids[changed]
+            if frame.empty:
+                continue
+            in_flight.append((ids, pool.submit(score_batch, frame[MODEL_FEATURES])))
+            # At most two batches per process wait in the pool: the fetch never runs far ahead of the scoring
+            while len(in_flight) >= workers * 2:
+                collect()
+        while in_flight:
+            collect()
+
+    scored = sum(len(ids) for ids in scored_ids)
+    scored_at = datetime.now()
+    scores = pa.table({
+        ID_COLUMN: pa.array(np.concatenate(scored_ids) if scored_ids else [], pa.string()),
+        "churn_probability": pa.array(np.concatenate(probabilities) if probabilities else [], pa.float64()),
+        "model_name": pa.array([model_name] * scored, pa.string()),
+        "scored_at": pa.array([scored_at] * scored, pa.timestamp("us")),
+    }, schema=SCORES_SCHEMA)
+
+    if incremental:
+        if scored:
+            write_table(conn, scores, SCORES_TABLE, warehouse, merge_key=ID_COLUMN)
+        # Customers that left the feature table (e.g., all their orders were canceled)
+        execute(conn, (
+            f"DELETE FROM {qualified_table(SCORES_TABLE, warehouse)} "
+            f"WHERE {ID_COLUMN} NOT IN (SELECT {ID_COLUMN} FROM {qualified_table(FEATURE_TABLE, warehouse)})"
+        ), warehouse)
+    else:
+        write_table(conn, scores, SCORES_TABLE, warehouse)
+
+    summary = {
+        "model_name": model_name,
+        "incremental": incremental,
+        "customers": customers,
+        "scored": scored,
+        "seconds": round(time.perf_counter() - start, 1),
+    }
+    save_state(
+        dict(summary, model_path=model_path, scored_at=scored_at.isoformat()),
+        pd.concat(hashes, ignore_index=True) if hashes else pd.DataFrame({ID_COLUMN: [], "feature_hash": np.array([], dtype=np.int64)}),
+        state_dir,
+    )
+    print(f"✅ {scored} of {customers} customers scored in {summary['seconds']}s ({'incremental' if incremental else 'full'} run).")
+    return summary
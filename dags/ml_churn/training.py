@@ -0,0 +1,265 @@
+import os
+import time
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.metrics import accuracy_score, check_scoring, f1_score, precision_score, recall_score, roc_auc_score
+from sklearn.model_selection import ParameterSampler, StratifiedKFold, train_test_split
+from threadpoolctl import threadpool_limits
+from ml_churn.ml_config import MODEL_FEATURES, LABEL_COLUMN, TRAINING_WORKERS, SEARCH_BUDGET_SECONDS
+
+# --------------- MODEL FAMILIES ---------------
+MODEL_FAMILIES = {
+    "RandomForestClassifier": RandomForestClassifier,
+    "HistGradientBoostingClassifier": HistGradientBoostingClassifier,
+}
+
+# Everything that decides what a training run produces from the same feature table.
+# A change here (or in the scikit-learn version) makes the next run retrain even if the data did not change.
+TRAINING_CONFIG = {
+    # Model trained when the search is off
+    "model": "RandomForestClassifier",
+    "params": {"n_estimators": 100, "random_state": 42},
+    # Successive halving in each family: many candidates on a sample of the rows, the best 1/factor on factor x more rows, ...
+    "search": {
+        "families": {
+            "RandomForestClassifier": {
+                "params": {"random_state": 42},
+                "costliest": {"n_estimators": 400, "max_depth": None, "min_samples_leaf": 1, "max_features": 1.0},
+                "space": {
+                    "n_estimators": [100, 200, 400],
+                    "max_depth": [None, 8, 16, 32],
+                    "min_samples_leaf": [1, 2, 5, 10],
+                    "max_features": ["sqrt", 0.5, 1.0],
+                    "class_weight": [None, "balanced"],
+                },
+            },
+            "HistGradientBoostingClassifier": {
+                # Early stopping on every fit, not only above 10000 rows ("auto"): the small probe and first halving fits behave like the last ones
+                "params": {"early_stopping": True, "random_state": 42},
+                "costliest": {"max_iter": 400, "max_leaf_nodes": 63, "min_samples_leaf": 20},
+                "space": {
+                    "learning_rate": [0.03, 0.05, 0.1, 0.2],
+                    "max_iter": [100, 200, 400],
+                    "max_leaf_nodes": [15, 31, 63],
+                    "min_samples_leaf": [20, 50, 100],
+                    "l2_regularization": [0.0, 0.1, 1.0],
+                },
+            },
+        },
+        "scoring": "roc_auc",
+        "cv": 3,
+        "factor": 3,
+        "max_candidates": 81,
+        "min_rows": 500, # The first halving iteration never fits on fewer rows
+        "probe_rows": 2000,
+        "safety_margin": 0.25, # Share of the budget kept aside for what the probe fits do not predict (start-up, scoring, skew)
+        "random_state": 42,
+    },
+    "features": MODEL_FEATURES,
+    "label": LABEL_COLUMN,
+    "test_size": 0.2,
+    "split_random_state": 42,
+}
+
+def training_config(search: bool = False, budget_seconds: int = SEARCH_BUDGET_SECONDS) -> dict:
+    """TRAINING_CONFIG of a run: without the search when it is off, with its wall-clock budget when it is on."""
+    if not search or budget_seconds <= 0:
+        return dict(TRAINING_CONFIG, search=None)
+    return dict(TRAINING_CONFIG, search=dict(TRAINING_CONFIG["search"], budget_seconds=budget_seconds))
+
+def build_model(name: str, params: dict, workers: int = TRAINING_WORKERS):
+    """Estimator of a model family on `workers` cores (HistGradientBoosting has no n_jobs, it uses every core)."""
+    if name not in MODEL_FAMILIES:
+        raise ValueError(f"❌ Unknown model '{name}'. Valid models: {', '.join(MODEL_FAMILIES)}")
+    model = MODEL_FAMILIES[name](**params)
+    if "n_jobs" in model.get_params():
+        model.set_params(n_jobs=workers)
+    return model
+
+# --------------- SEARCH ---------------
+def probe_fit_seconds(name: str, X: pd.DataFrame, y: pd.Series, search: dict) -> float:
+    """
+    Single-core seconds of one fit of a family's costliest candidate on the whole of `X`,
+    extrapolated from a timed fit on `probe_rows` rows (thread pools held to one core, like the search workers).
+
+    Returns:
+        float: Estimated seconds of the fit.
+    """
+    rows = min(len(X), search["probe_rows"])
+    probe = X.sample(rows, random_state=search["random_state"])
+    family = search["families"][name]
+    with threadpool_limits(limits=1):
+        start = time.perf_counter()
+        build_model(name, dict(family["params"], **family["costliest"]), workers=1).fit(probe, y.loc[probe.index])
+        return (time.perf_counter() - start) * len(X) / rows
+
+def search_candidates(rows: int, fit_seconds: float, budget_seconds: float, workers: int, search: dict) -> int:
+    """
+    Candidates of a family that fit in `budget_seconds`, from the single-core seconds of one fit of its costliest
+    candidate on all `rows` (see probe_fit_seconds). An estimate, not a bound: halving_search stops
+    between iterations that would overrun the budget.
+    With factor**k candidates, successive halving runs k + 1 iterations that each fit about the whole
+    training set once per fold; the last ones have few candidates and only spread over `cv` cores.
+
+    Returns:
+        int: A power of `factor`, 0 when not even one candidate fits in the budget.
+    """
+    fold_seconds = fit_seconds * (search["cv"] - 1) / search["cv"]
+    iteration_seconds = fold_seconds * search["cv"] / min(workers, os.cpu_count() or 1, search["cv"])
+
+    if iteration_seconds > budget_seconds:
+        return 0
+    factor, halvings = search["factor"], 0
+    while (
+        factor ** (halvings + 1) <= search["max_candidates"]
+        and rows / factor ** (halvings + 1) >= search["min_rows"]
+        and iteration_seconds * (halvings + 2) <= budget_seconds
+    ):
+        halvings += 1
+    return factor ** halvings
+
+def fit_and_score(estimator, params: dict, X: pd.DataFrame, y: pd.Series, train, test, scorer) -> float:
+    """Score of one candidate on one cross-validation fold."""
+    model = clone(estimator).set_params(**params).fit(X.iloc[train], y.iloc[train])
+    return scorer(model, X.iloc[test], y.iloc[test])
+
+def halving_search(name: str, X: pd.DataFrame, y: pd.Series, candidates: int, deadline: float, workers: int, search: dict) -> dict:
+    """
+    Successive halving over `candidates` random candidates of a family: every candidate is cross-validated on
+    a stratified sample of the rows, the best 1/factor go on with factor x more rows, up to the whole training set.
+    Candidates and folds fit on one core each, spread over the workers (at most one per core). Stops between iterations when the next one
+    (timed from the last one) would end after `deadline` (a time.perf_counter() value): the best candidate so far wins.
+
+    Returns:
+        dict: {'params', 'cv_score', 'iterations'}
+    """
+    family = search["families"][name]
+    factor = search["factor"]
+    estimator = build_model(name, family["params"], workers=1)
+    scorer = check_scoring(estimator, scoring=search["scoring"])
+    cv = StratifiedKFold(n_splits=search["cv"], shuffle=True, random_state=search["random_state"])
+    params = list(ParameterSampler(family["space"], n_iter=candidates, random_state=search["random_state"]))
+    iterations = 1
+    while factor ** (iterations - 1) < candidates:
+        iterations += 1
+
+    cores = min(workers, os.cpu_count() or 1)
+    best = None
+    with joblib.Parallel(n_jobs=cores) as parallel:
+        for iteration in range(iterations):
+            iteration_start = time.perf_counter()
+            rows = len(X) // factor ** (iterations - 1 - iteration)
+            if rows < len(X):
+                X_iter, _, y_iter, _ = train_test_split(X, y, train_size=rows, stratify=y, random_state=search["random_state"])
+            else:
+                X_iter, y_iter = X, y
+            splits = list(cv.split(X_iter, y_iter))
+            scores = parallel(
+                joblib.delayed(fit_and_score)(estimator, candidate, X_iter, y_iter, train, test, scorer)
+                for candidate in params for train, test in splits
+            )
+            mean_scores = np.asarray(scores).reshape(len(params), len(splits)).mean(axis=1)
+            order = np.argsort(mean_scores)[::-1]
+            best = {"params": params[order[0]], "cv_score": round(float(mean_scores[order[0]]), 4), "iterations": iteration + 1}
+            params = [params[i] for i in order[:max(1, len(params) // factor)]]
+
+            if iteration + 1 == iterations:
+                break
+            # Fits run in waves of `cores`: the next iteration has factor x more rows and 1/factor of the candidates
+            waves = -(-len(scores) // cores)
+            next_waves = -(-len(params) * len(splits) // cores)
+            next_seconds = (time.perf_counter() - iteration_start) / waves * next_waves * factor
+            if time.perf_counter() + next_seconds > deadline:
+                print(f"⏱️ {name}: search budget reached after {iteration + 1} of {iterations} halving iteration(s).")
+                break
+    return best
+
+def search_model(X: pd.DataFrame, y: pd.Series, search: dict, workers: int = TRAINING_WORKERS) -> dict:
+    """
+    Time-budgeted search over the model families: successive halving with stratified cross-validation in each family,
+    the families sharing what is left of `budget_seconds` once `safety_margin` of it is set aside. Each family's share
+    also keeps the refit of its costliest candidate on `workers` cores aside, and its search stops between halving
+    iterations when the next one would overrun the share. The best cross-validated candidate of every family wins.
+
+    Returns:
+        dict: {'model', 'params', 'cv_score', 'search_seconds', 'families': per-family results},
+        None when no family fits in the budget.
+    """
+    start = time.perf_counter()
+    deadline = start + search["budget_seconds"] * (1 - search["safety_margin"])
+    families = list(search["families"])
+    fit_seconds = {name: probe_fit_seconds(name, X, y, search) for name in families}
+    cores = min(workers, os.cpu_count() or 1)
+    results = []
+    for i, name in enumerate(families):
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            print(f"⏱️ Search budget of {search['budget_seconds']}s spent, {', '.join(families[i:])} not searched.")
+            break
+        family_start = time.perf_counter()
+        share = remaining / (len(families) - i) - fit_seconds[name] / cores
+        candidates = search_candidates(len(X), fit_seconds[name], share, workers, search) if share > 0 else 0
+        if not candidates:
+            print(f"⏱️ {name}: one fit takes longer than its share of the search budget, not searched.")
+            continue
+        best = halving_search(name, X, y, candidates, family_start + share, workers, search)
+        results.append({
+            "model": name,
+            "params": best["params"],
+            "cv_score": best["cv_score"],
+            "candidates": candidates,
+            "iterations": best["iterations"],
+            "seconds": round(time.perf_counter() - family_start, 1),
+        })
+        print(f"🔎 {name}: best CV {search['scoring']} {results[-1]['cv_score']} of {candidates} candidate(s) in {results[-1]['seconds']}s")
+
+    if not results:
+        return None
+    best = max(results, key=lambda result: result["cv_score"])
+    return {
+        "model": best["model"],
+        "params": best["params"],
+        "cv_score": best["cv_score"],
+        "search_seconds": round(time.perf_counter() - start, 1),
+        "families": results,
+    }
+
+# --------------- TRAINING ---------------
+def train_model(X: pd.DataFrame, y: pd.Series, config: dict = TRAINING_CONFIG, workers: int = TRAINING_WORKERS):
+    """
+    Fit the churn model on every core: the best model of the search when `config['search']` is set
+    (the search and this refit share its budget), else (or when no family fits in the search budget) `config['model']` with `config['params']`.
+
+    Returns:
+        tuple: (fitted model, dict of the chosen model: {'model', 'params', 'fit_seconds', ...search results})
+    """
+    search = config.get("search")
+    chosen = search_model(X, y, search, workers) if search else None
+    if chosen:
+        params = dict(search["families"][chosen["model"]]["params"], **chosen["params"])
+        print(f"🏆 Chosen model: {chosen['model']} {chosen['params']} (CV {search['scoring']} {chosen['cv_score']}), search took {chosen['search_seconds']}s")
+    else:
+        chosen = {"model": config["model"], "params": config["params"]}
+        params = config["params"]
+
+    start = time.perf_counter()
+    model = build_model(chosen["model"], params, workers)
+    model.fit(X, y)
+    chosen["fit_seconds"] = round(time.perf_counter() - start, 1)
+    print(f"🧠 {chosen['model']} fitted on {len(X)} rows and {workers} core(s) in {chosen['fit_seconds']}s")
+    return model, chosen
+
+def evaluate_model(y_true, y_proba, threshold: float = 0.5) -> dict:
+    """Test split metrics of the churn probabilities."""
+    y_pred = y_proba >= threshold
+    return {
+        "roc_auc": round(float(roc_auc_score(y_true, y_proba)), 4),
+        "accuracy": round(float(accuracy_score(y_true, y_pred)), 4),
+        "precision": round(float(precision_score(y_true, y_pred, zero_division=0)), 4),
+        "recall": round(float(recall_score(y_true, y_pred, zero_division=0)), 4),
+        "f1": round(float(f1_score(y_true, y_pred, zero_division=0)), 4),
+        "test_rows": int(len(y_true)),
+    }
@@ -0,0 +1,48 @@
+from ml_churn.ml_config import ML_WAREHOUSE, DUCKDB_PATH, DUCKDB_MART_SCHEMA
+
+WAREHOUSES = ["snowflake", "duckdb"]
+
+def snowflake_config_from_variables() -> dict:
+    """Snowflake connector arguments from the Airflow Variables (schema = MART)."""
+    from airflow.models import Variable
+
+    return {
+        'user': Variable.get('SNOWFLAKE_USER'),
+        'password': Variable.get('SNOWFLAKE_PASSWORD'),
+        'account': Variable.get('SNOWFLAKE_ACCOUNT'),
+        'warehouse': Variable.get('SNOWFLAKE_WAREHOUSE'),
+        'database': Variable.get('SNOWFLAKE_DATABASE'),
+        'schema': Variable.get('SNOWFLAKE_SCHEMA_MART'),
+        'role': Variable.get('SNOWFLAKE_ROLE'),
+    }
+
+def connect(warehouse: str = ML_WAREHOUSE, snowflake_config: dict = None):
+    """
+    Open a DB-API connection to the warehouse holding the MART tables.
+    Snowflake uses `snowflake_config` (connector arguments, schema = MART), DuckDB opens DUCKDB_PATH.
+    """
+    if warehouse == "snowflake":
+        import snowflake.connector
+        return snowflake.connector.connect(**snowflake_config)
+    if warehouse == "duckdb":
+        try:
+            import duckdb
+        except ImportError:
+            raise ImportError("duckdb not installed. Install with `pip install duckdb`.")
+        return duckdb.connect(DUCKDB_PATH)
+    raise ValueError(f"❌ Unknown warehouse '{warehouse}'. Valid warehouses: {', '.join(WAREHOUSES)}")
+
+def qualified_table(table: str, warehouse: str = ML_WAREHOUSE) -> str:
+    """Table name as seen from the connection (the Snowflake connection already uses the MART schema)."""
+    return f"{DUCKDB_MART_SCHEMA}.{table}" if warehouse == "duckdb" else table
+
+def execute(conn, sql: str, warehouse: str = ML_WAREHOUSE):
+    """Run one statement (DuckDB connections execute directly, Snowflake through a cursor)."""
+    if warehouse == "duckdb":
+        conn.execute(sql)
+        return
+    cs = conn.cursor()
+    try:
+        cs.execute(sql)
+    finally:
+        cs.close()
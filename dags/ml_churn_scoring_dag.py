@@ -0,0 +1,61 @@
+from airflow.decorators import dag
+from airflow.operators.python import PythonOperator
+from airflow.models import Variable
+from datetime import datetime, timedelta
+
+from ml_churn.ml_config import ML_WAREHOUSE, SCORING_WORKERS, SCORING_BATCH_SIZE
+from ml_churn.scoring import score_customers
+from ml_churn.warehouse import connect, snowflake_config_from_variables
+
+default_args={
+    'owner': 'airflow',
+    'depends_on_past': False,
+    'retries': 3,
+    'retry_delay': timedelta(minutes=5),
+}
+
+def score_all_customers():
+    # Snowflake, or the local DuckDB stand-in (ML_WAREHOUSE=duckdb, the dbt duckdb target's file)
+    warehouse = Variable.get('ML_WAREHOUSE', default_var=ML_WAREHOUSE)
+    # 'false' rescores every customer even if their features did not change
+    incremental = Variable.get('ML_SCORING_INCREMENTAL', default_var='true').lower() == 'true'
+
+    conn = connect(warehouse, snowflake_config_from_variables() if warehouse == 'snowflake' else None)
+    try:
+        score_customers(
+            conn,
+            warehouse=warehouse,
+            incremental=incremental,
+            workers=int(Variable.get('ML_SCORING_WORKERS', default_var=SCORING_WORKERS)),
+            batch_size=int(Variable.get('ML_SCORING_BATCH_SIZE', default_var=SCORING_BATCH_SIZE)),
+        )
+    finally:
+        conn.close()
+
+
+# Define DAG using decorator style (AIP-48)
+@dag(
+    dag_id='ml_churn_scoring_dag',
+    default_args=default_args,
+    description='Score every customer with the latest churn model',
+    schedule_interval='0 */6 * * *',  # every 6 hours, independent of the daily retrain
+    start_date=datetime(2025, 7, 1),
+    catchup=False,
+    max_active_runs=1, # Runs share the scoring state (logs/ml_scoring)
+    tags=['ml', 'churn', 'snowflake'],
+)
+
+def ml_churn_scoring_dag_pipeline():
+    """
+    Batch scoring, decoupled from training: loads the newest churn_model_*.pkl
+    and writes one churn probability per customer to ml_churn_scores.
+    """
+    score_task = PythonOperator(
+        task_id='score_all_customers',
+        python_callable=score_all_customers,
+    )
+
+    score_task
+
+# Initialize the DAG by calling the decorated pipeline function
+dag = ml_churn_scoring_dag_pipeline()
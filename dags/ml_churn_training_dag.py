@@ -1,15 +1,24 @@
 from airflow.decorators import dag
 from airflow.operators.python import PythonOperator
 from airflow.models import Variable
+from airflow.exceptions import AirflowSkipException
 from datetime import datetime, timedelta
 
-import pandas as pd
 import joblib
 import os
-import snowflake.connector
-from sklearn.ensemble import RandomForestClassifier
+import time
 from sklearn.model_selection import train_test_split
 
+from ml_churn.ml_config import (
+    ID_COLUMN, DATE_COLUMNS, LABEL_COLUMN, MODEL_FEATURES, FEATURE_BATCH_SIZE, ML_WAREHOUSE, MODEL_DIR, MODEL_RETENTION,
+    TRAINING_WORKERS, SEARCH_BUDGET_SECONDS,
+)
+from ml_churn.features import load_features
+from ml_churn.predictions import write_predictions
+from ml_churn.registry import feature_fingerprint, config_hash, load_registry, find_model, register_model, prune_models
+from ml_churn.training import training_config, train_model, evaluate_model
+from ml_churn.warehouse import connect, snowflake_config_from_variables
+
 default_args={
     'owner': 'airflow',
     'depends_on_past': False,
@@ -18,46 +27,43 @@ default_args={
 }
 
 def train_and_upload_model():
-    # Load Snowflake credentials from Airflow Variables
-    snowflake_config = {
-        'user': Variable.get('SNOWFLAKE_USER'),
-        'password': Variable.get('SNOWFLAKE_PASSWORD'),
-        'account': Variable.get('SNOWFLAKE_ACCOUNT'),
-        'warehouse': Variable.get('SNOWFLAKE_WAREHOUSE'),
-        'database': Variable.get('SNOWFLAKE_DATABASE'),
-        'schema': Variable.get('SNOWFLAKE_SCHEMA_MART'),
-        'role': Variable.get('SNOWFLAKE_ROLE'),
-    }
+    # Snowflake, or the local DuckDB stand-in (ML_WAREHOUSE=duckdb, the dbt duckdb target's file)
+    warehouse = Variable.get('ML_WAREHOUSE', default_var=ML_WAREHOUSE)
 
     # Generate a timestamp for the model file name
     fileTimestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    model_path = f"/opt/airflow/ml_models/churn_model_{fileTimestamp}.pkl"
-
-    # Connect to Snowflake
-    conn = snowflake.connector.connect(**snowflake_config)
-
-    # Query data
-    query = 'SELECT * FROM fct_customer_features_ml'
-    df = pd.read_sql(query, conn)
-
-    # Lowercase column name for consistency
-    df.columns = df.columns.str.lower()
+    model_path = os.path.join(MODEL_DIR, f"churn_model_{fileTimestamp}.pkl")
 
-    # Preprocessing
-    # Convert to Pandas datetime type
-    df['first_purchase_date'] = pd.to_datetime(df['first_purchase_date'])
-    df['last_purchase_date'] = pd.to_datetime(df['last_purchase_date'])
+    # Opt-in model search over the model families within a wall-clock budget (ML_MODEL_SEARCH=true; off, the fixed model is trained)
+    config = training_config(
+        search=Variable.get('ML_MODEL_SEARCH', default_var='false').lower() == 'true',
+        budget_seconds=int(Variable.get('ML_SEARCH_BUDGET_SECONDS', default_var=SEARCH_BUDGET_SECONDS)),
+    )
+    workers = int(Variable.get('ML_TRAINING_WORKERS', default_var=TRAINING_WORKERS))
+
+    # Connect to the warehouse
+    conn = connect(warehouse, snowflake_config_from_variables() if warehouse == 'snowflake' else None)
+
+    # Skip training when a kept model was already trained on the same data with the same config
+    # (fingerprint computed in the warehouse, no rows are fetched). ML_FORCE_TRAIN=true always retrains.
+    fingerprint = feature_fingerprint(conn, warehouse)
+    registry = load_registry()
+    existing = find_model(registry, fingerprint, config_hash(config))
+    if existing and Variable.get('ML_FORCE_TRAIN', default_var='false').lower() != 'true':
+        conn.close()
+        raise AirflowSkipException(
+            f"⏭️ {existing['model_name']} was trained on the same features ({fingerprint['rows']} rows, "
+            f"hash {fingerprint['content_hash']}) with the same config, training skipped."
+        )
 
-    # Convert date columns to date-only format
-    # to avoid the error "Binding data in type (timestamp) is not supported."
-    # Note: If 
-    df['first_purchase_date'] = df['first_purchase_date'].dt.date
-    df['last_purchase_date'] = df['last_purchase_date'].dt.date
+    # Query data: only the needed columns, streamed as Arrow batches with narrow numeric and native date types
+    batch_size = int(Variable.get('ML_FEATURE_BATCH_SIZE', default_var=FEATURE_BATCH_SIZE))
+    df = load_features(conn, columns=[ID_COLUMN, *DATE_COLUMNS, *MODEL_FEATURES, LABEL_COLUMN], batch_size=batch_size, warehouse=warehouse)
 
-    X = df.drop(columns=['customer_unique_id', 'first_purchase_date', 'last_purchase_date', 'is_churned'])
-    y = df['is_churned']
+    X = df[MODEL_FEATURES]
+    y = df[LABEL_COLUMN]
     extra_fields = df[[
-        'customer_unique_id', 'first_purchase_date', 'last_purchase_date',
+        ID_COLUMN, *DATE_COLUMNS,
         'total_orders', 'total_accounts', 'total_revenue',
         'avg_revenue_per_order', 'days_since_last_order'
     ]]
@@ -66,21 +72,25 @@ def train_and_upload_model():
     # The extra_fields_train and extra_fields_test variables will be created from extra_fields
     # based on the indices of X_train and X_test
     X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42, stratify=y # Add stratify to ensure balanced layer distribution
+        X, y, test_size=config['test_size'], random_state=config['split_random_state'],
+        stratify=y # Add stratify to ensure balanced layer distribution
     )
 
     # Create DataFrame df_result from extra_fields of test set
     # Make sure df_result is initialized BEFORE using
     df_result = extra_fields.loc[X_test.index].copy() # Filter extra_fields by index of X_test
 
-    # Train model
-    clf = RandomForestClassifier(n_estimators=100, random_state=42)
-    clf.fit(X_train, y_train)
+    # Train model on every core (search on the stratified training split only, the test split stays unseen)
+    train_start = time.perf_counter()
+    clf, chosen = train_model(X_train, y_train, config, workers)
+    train_seconds = time.perf_counter() - train_start
 
     # Save model
     # Make sure the /opt/airflow/ml_models directory exists in the container
     os.makedirs(os.path.dirname(model_path), exist_ok=True)
-    joblib.dump(clf, model_path)
+    # Written under a temporary name then renamed: the scoring DAG never loads a half-written model
+    joblib.dump(clf, f"{model_path}.tmp")
+    os.replace(f"{model_path}.tmp", model_path)
 
     if os.path.exists(model_path):
         print(f"✅ Model trained and saved at: {model_path}")
@@ -89,6 +99,8 @@ def train_and_upload_model():
 
     # Predict
     y_proba = clf.predict_proba(X_test)[:, 1]
+    metrics = evaluate_model(y_test.values, y_proba)
+    print(f"📊 Test metrics: {metrics}")
 
     # Merge predictions
     df_result['churn_probability'] = y_proba
@@ -102,38 +114,14 @@ def train_and_upload_model():
         'avg_revenue_per_order', 'days_since_last_order'
     ]]
 
-    # Create table in Snowflake
-    cs = conn.cursor()
-    cs.execute("""
-        CREATE OR REPLACE TABLE ml_churn_predictions (
-            customer_unique_id STRING,
-            churn_probability FLOAT,
-            actual_churned BOOLEAN,
-            first_purchase_date DATE,
-            last_purchase_date DATE,
-            total_orders INT,
-            total_accounts INT,
-            total_revenue FLOAT,
-            avg_revenue_per_order FLOAT,
-            days_since_last_order INT
-        )
-    """)
-
-    # Insert data
-    # Convert DataFrame to list of lists for insert
-    insert_query = """
-        INSERT INTO ml_churn_predictions (
-            customer_unique_id, churn_probability, actual_churned,
-            first_purchase_date, last_purchase_date,
-            total_orders, total_accounts, total_revenue,
-            avg_revenue_per_order, days_since_last_order
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-    """
-    cs.executemany(insert_query, df_result.values.tolist())
-    conn.commit()
+    # Bulk write-back: compressed Parquet loaded with one COPY INTO into a loading table,
+    # swapped with ml_churn_predictions so dashboards never see a half-empty table
+    write_predictions(conn, df_result, warehouse)
     conn.close()
 
-    print(f"✅ Predictions uploaded to Snowflake.")
+    # Registered once the predictions are written: a failed run is retrained next time, not skipped
+    register_model(registry, model_path, fingerprint, config, metrics, train_seconds, chosen)
+    prune_models(registry, keep=int(Variable.get('ML_MODEL_RETENTION', default_var=MODEL_RETENTION)))
 
 
 # Define DAG using decorator style (AIP-48)
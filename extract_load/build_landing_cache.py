@@ -0,0 +1,51 @@
+import os
+import sys
+import argparse
+from utils.spark_session import create_spark_session
+from utils.ingest_config import table_list, file_map
+from utils.ingest_manifest import file_sha256
+from utils.landing_cache import landing_path, build_landing, LANDING_METADATA_FILE
+
+def main(tables, schema_mode="permissive", force=False):
+    """
+    Convert raw CSVs into the Parquet landing cache without loading the warehouse.
+    Useful to prepare typed, columnar data for local tooling.
+
+    Returns:
+        int: 0 if all tables were converted (or already cached), 1 otherwise.
+    """
+    spark = create_spark_session("Build_landing_cache", include_snowflake_connector=False)
+    spark.sparkContext.setLogLevel("WARN") # Reduce Spark logs to WARN level
+
+    status = 0
+    try:
+        for table_name in tables:
+            csv_path = file_map[table_name]
+            if not os.path.exists(csv_path):
+                print(f"❌ [{table_name}] Missing file: {csv_path}")
+                status = 1
+                continue
+
+            content_hash = file_sha256(csv_path)
+            path = landing_path(table_name, content_hash)
+            if not force and os.path.exists(os.path.join(path, LANDING_METADATA_FILE)):
+                print(f"⏭️ [{table_name}] Landing Parquet already up to date: {path}")
+                continue
+            try:
+                build_landing(spark, table_name, csv_path, content_hash, schema_mode)
+            except Exception as e:
+                print(f"❌ [{table_name}] Failed to build landing Parquet: {e}")
+                status = 1
+    finally:
+        spark.stop() # Ensure Spark session is always stopped
+
+    return status
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert raw CSV files into the typed Parquet landing cache.")
+    parser.add_argument("tables", nargs="*", help="Tables to convert (default: all tables in ingest_config.table_list)")
+    parser.add_argument("--schema-mode", choices=["permissive", "strict"], default="permissive", help="How raw CSVs are typed on read")
+    parser.add_argument("--force", action="store_true", help="Rebuild the Parquet even if it exists for the current source hash")
+    args = parser.parse_args()
+
+    sys.exit(main(args.tables or list(table_list), args.schema_mode, args.force))
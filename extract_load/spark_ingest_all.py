@@ -0,0 +1,205 @@
+import os
+import sys
+import argparse
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from utils.spark_session import create_spark_session
+from utils.ingest_config import table_list, file_map, incremental_tables, MAX_INGEST_WORKERS, INGEST_SCHEMA_MODE
+from utils.ingest_manifest import load_manifest, save_manifest, file_fingerprint, same_target, is_unchanged, build_entry
+from utils.spark_tuning import plan_session, plan_table, table_session, format_plan
+from utils.ingest_metrics import measure_stage, write_metrics
+from spark_ingest_generic import load_env_vars_if_needed, selected_sink, load_snowflake_config, ingest_table
+
+# Protects the shared manifest dict / file between ingest threads
+manifest_lock = threading.Lock()
+
+def check_source(table_name, manifest, sink, schema_mode, force=False):
+    """
+    Compare a table's source file with the manifest BEFORE starting Spark.
+    A table last loaded into another sink or with another schema mode is always loaded.
+
+    Returns:
+        tuple: (fingerprint, skip_result) where skip_result is a finished result tuple
+               (see ingest_one) if the table does not need to be loaded, else None.
+    """
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    csv_path = file_map[table_name]
+    if not os.path.exists(csv_path):
+        print(f"{timestamp} ❌ Missing file: {csv_path}")
+        return None, (table_name, 1, timestamp, "missing file")
+
+    previous = manifest.get(table_name)
+    fingerprint = file_fingerprint(csv_path, previous)
+    if not force and is_unchanged(previous, fingerprint, sink, schema_mode):
+        print(f"{timestamp} ⏭️ [{table_name}] Source unchanged since {previous.get('loaded_at')} ({previous.get('total_rows')} row(s)), skipped.")
+        return fingerprint, (table_name, 0, timestamp, "skipped, unchanged")
+    return fingerprint, None
+
+def ingest_one(spark, config, table_name, schema_mode, manifest, fingerprint, force=False, cores=None):
+    """
+    Ingest a single table inside the shared Spark session.
+    Each table runs in its own FAIR scheduler pool so a large table cannot starve the small ones,
+    and in its own SQL session sized from its file (see utils/spark_tuning.py).
+
+    Load mode (see utils/ingest_manifest.py):
+        - Append-only table (ingest_config.incremental_tables) with a previous watermark in the same sink
+          and schema mode -> append newer rows.
+        - Otherwise (first load, non append-only table, sink / schema mode switch or force) -> full overwrite.
+
+    Returns:
+        tuple: (table_name, status, timestamp, note) where status is 0 on success and 1 on failure.
+    """
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    csv_path = file_map[table_name]
+    previous = manifest.get(table_name)
+    print(f"{timestamp} - 🔄 Ingesting table: {table_name}")
+
+    watermark_column = incremental_tables.get(table_name)
+    can_append = (
+        not force and watermark_column and previous and previous.get("watermark")
+        and same_target(previous, config["sink"], schema_mode)
+    )
+    load_mode = "append" if can_append else "overwrite"
+
+    table_plan = plan_table(table_name, fingerprint["size"], cores)
+    print(format_plan(table_name, table_plan))
+
+    # Local properties are thread-local, so this only affects jobs submitted from this thread
+    spark.sparkContext.setLocalProperty("spark.scheduler.pool", table_name)
+    try:
+        result = ingest_table(
+            table_session(spark, table_plan), config, table_name, csv_path, schema_mode,
+            load_mode=load_mode,
+            watermark_column=watermark_column,
+            watermark_value=previous.get("watermark") if can_append else None,
+            content_hash=fingerprint["sha256"],
+            write_partitions=table_plan["write_partitions"]
+        )
+    except Exception as e:
+        print(f"❌ [{table_name}] Unexpected error: {e}")
+        result = {"status": 1}
+    finally:
+        spark.sparkContext.setLocalProperty("spark.scheduler.pool", None)
+
+    if result["status"] != 0:
+        return table_name, 1, timestamp, load_mode
+
+    # Persist after each table so a crash later in the run does not lose finished loads
+    with manifest_lock:
+        manifest[table_name] = build_entry(fingerprint, result, load_mode, previous, config["sink"], schema_mode)
+        save_manifest(manifest)
+    return table_name, 0, timestamp, f"{load_mode}, {result['rows']} row(s)"
+
+def write_summary(results, log_dir):
+    """
+    Write the per-table result to success.log / failed.log (same format ingest_all.sh used to produce)
+    and print the final summary.
+    """
+    os.makedirs(log_dir, exist_ok=True)
+    success = [r for r in results if r[1] == 0]
+    failed = [r for r in results if r[1] != 0]
+
+    with open(os.path.join(log_dir, "success.log"), "a") as f:
+        for table_name, _, timestamp, note in success:
+            f.write(f"{timestamp} ✅ {table_name} ({note})\n")
+    with open(os.path.join(log_dir, "failed.log"), "a") as f:
+        for table_name, _, timestamp, note in failed:
+            f.write(f"{timestamp} ❌ {table_name} ({note})\n")
+
+    print("\n🎯 Ingest Summary:")
+    print("-------------------------")
+    print(f"✅ Success ({len(success)}): {', '.join(r[0] for r in success)}")
+    print(f"❌ Failed ({len(failed)}): {', '.join(r[0] for r in failed)}")
+
+def main(tables, max_workers, log_dir, schema_mode=INGEST_SCHEMA_MODE, force=False):
+    """
+    Ingest several tables with ONE Spark session (one JVM start, one connector resolution)
+    and load them concurrently on a bounded thread pool.
+
+    Args:
+        tables (list): Logical table names to ingest (must be keys of file_map).
+        max_workers (int): Maximum number of tables loaded at the same time.
+        log_dir (str): Folder where success.log / failed.log are written.
+        schema_mode (str): 'permissive', 'strict' or 'string' (see ingest_config.INGEST_SCHEMA_MODE).
+        force (bool): Reload every table with a full overwrite, ignoring the manifest.
+    Returns:
+        int: 0 if all tables succeeded, 1 otherwise.
+    """
+    unknown = [t for t in tables if t not in file_map]
+    if unknown:
+        print(f"❌ Unknown table(s): {', '.join(unknown)}. Valid tables: {', '.join(table_list)}")
+        return 1
+
+    # Change detection first: if nothing changed there is no need to start Spark at all
+    manifest = load_manifest()
+    results, pending, fingerprints = [], [], {}
+    for table_name in tables:
+        fingerprint, skip_result = check_source(table_name, manifest, selected_sink(), schema_mode, force)
+        if skip_result:
+            results.append(skip_result)
+        else:
+            pending.append(table_name)
+            fingerprints[table_name] = fingerprint
+
+    if not pending:
+        write_summary(results, log_dir)
+        status = 0 if all(r[1] == 0 for r in results) else 1
+        write_metrics(status)
+        return status
+
+    load_env_vars_if_needed() # This function has its own internal prints for warnings/errors
+
+    config = load_snowflake_config()
+    if not config:
+        return 1 # Exit if Snowflake config is missing
+
+    # Size the shared session from the total input of the tables to load
+    session_plan = plan_session(sum(fingerprints[t]["size"] for t in pending))
+    print(format_plan("session", session_plan))
+
+    workers = max(1, min(max_workers, len(pending)))
+    with measure_stage("_run", "total", bytes=sum(fingerprints[t]["size"] for t in pending), tables=len(pending), workers=workers):
+        with measure_stage("_session", "session_start"):
+            spark = create_spark_session(
+                "Ingest_all_tables",
+                executor_memory=session_plan["executor_memory"],
+                shuffle_partitions=session_plan["shuffle_partitions"],
+                extra_configs={
+                    "spark.driver.memory": session_plan["driver_memory"],
+                    "spark.scheduler.mode": "FAIR", # Share executors fairly between concurrent tables
+                },
+                include_snowflake_connector=config["sink"] == "snowflake_spark"
+            )
+            spark.sparkContext.setLogLevel("WARN") # Reduce Spark logs to WARN level
+
+        print(f"🚀 Ingesting {len(pending)} table(s) with {workers} worker(s) in one Spark session")
+        try:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest") as executor:
+                futures = [
+                    executor.submit(ingest_one, spark, config, t, schema_mode, manifest, fingerprints[t], force, session_plan["cores"])
+                    for t in pending
+                ]
+                for future in as_completed(futures):
+                    results.append(future.result())
+        finally:
+            spark.stop() # Ensure Spark session is always stopped
+
+    # Keep the summary in the same order as the table list
+    results.sort(key=lambda r: tables.index(r[0]))
+    write_summary(results, log_dir)
+
+    status = 0 if all(r[1] == 0 for r in results) else 1
+    write_metrics(status)
+    return status
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest raw CSV files into the configured load sink using one shared Spark session.")
+    parser.add_argument("tables", nargs="*", help="Tables to ingest (default: all tables in ingest_config.table_list)")
+    parser.add_argument("--max-workers", type=int, default=MAX_INGEST_WORKERS, help="Maximum number of tables loaded concurrently")
+    parser.add_argument("--log-dir", default="logs", help="Folder for success.log / failed.log")
+    parser.add_argument("--schema-mode", choices=["permissive", "strict", "string"], default=INGEST_SCHEMA_MODE, help="How raw CSVs are typed on read")
+    parser.add_argument("--force", action="store_true", help="Reload every table with a full overwrite even if its source file is unchanged")
+    args = parser.parse_args()
+
+    sys.exit(main(args.tables or list(table_list), args.max_workers, args.log_dir, args.schema_mode, args.force))
@@ -1,6 +1,16 @@
 import os
 import sys
 from utils.spark_session import create_spark_session
+from pyspark import StorageLevel
+from pyspark.sql import functions as F
+from utils.ingest_config import INGEST_SCHEMA_MODE, DEFAULT_INGEST_SINK, incremental_tables
+from utils.load_sinks import LOAD_SINKS, SNOWFLAKE_SINKS, get_sink
+from utils.spark_tuning import plan_session, plan_table, table_session, format_plan
+from utils.landing_cache import read_source
+from utils.ingest_manifest import load_manifest, save_manifest, file_fingerprint, build_entry
+from utils.ingest_stats import profile_aggregations, parse_profile, record_stats
+from utils.ingest_metrics import measure_stage, write_metrics
+from utils.schema_registry import get_read_schema
 
 def load_env_vars_if_needed():
     """Load .env file if running locally."""
@@ -22,9 +32,25 @@ def load_env_vars_if_needed():
     else:
         print("🚀 Running in Airflow/Docker: Env vars are expected to be pre-set.")
 
+def selected_sink() -> str:
+    """Load sink selected with INGEST_SINK (see ingest_config / utils/load_sinks.py)."""
+    return os.getenv("INGEST_SINK", DEFAULT_INGEST_SINK).lower()
+
 # Get snowflake env variables from Airflow Variables in ingest_raw_data_dag.py
 def load_snowflake_config():
-    """Get Snowflake connection info from env variables."""
+    """
+    Get the load sink and Snowflake connection info from env variables.
+    The sink is selected with INGEST_SINK (see ingest_config / utils/load_sinks.py) and returned under the 'sink' key.
+    Local sinks ('duckdb', 'parquet') do not need Snowflake credentials.
+    """
+    sink = selected_sink()
+    if sink not in LOAD_SINKS:
+        print(f"❌ Unknown INGEST_SINK '{sink}'. Valid sinks: {', '.join(LOAD_SINKS)}")
+        return None
+    if sink not in SNOWFLAKE_SINKS:
+        print(f"💡 Using local sink: {sink}")
+        return {"sink": sink}
+
     config = {
         "sfURL": f"{os.getenv('SNOWFLAKE_ACCOUNT')}.snowflakecomputing.com",  # Should include full domain (e.g. abc-xyz.snowflakecomputing.com)
         "sfUser": os.getenv('SNOWFLAKE_USER'), # e.g., "myuser"
@@ -45,8 +71,98 @@ def load_snowflake_config():
     # for k, v in config.items():
     #     print(f"  {k}: {'***' if 'Password' in k else v}")
     
+    config["sink"] = sink
     return config
 
+def ingest_table(spark, config, table_name, csv_path, schema_mode=INGEST_SCHEMA_MODE,
+                 load_mode="overwrite", watermark_column=None, watermark_value=None, content_hash=None,
+                 write_partitions=None):
+    """
+    Read one raw CSV file and write it to the configured load sink using an existing Spark session.
+    The session is NOT stopped here so it can be shared by several tables (see spark_ingest_all.py).
+    Each stage (schema resolution, read, profile, write) is measured (see utils/ingest_metrics.py).
+
+    Args:
+        spark (SparkSession): Active Spark session.
+        config (dict): Sink and Snowflake options returned by load_snowflake_config().
+        table_name (str): Logical table name (e.g., 'orders').
+        csv_path (str): Path to the raw CSV file.
+        schema_mode (str): 'permissive', 'strict' or 'string' (see ingest_config.INGEST_SCHEMA_MODE).
+        load_mode (str): 'overwrite' (full reload) or 'append' (only rows newer than watermark_value).
+        watermark_column (str): Optional column used to compute the new watermark / filter appended rows.
+        watermark_value (str): Last loaded watermark (ISO timestamp), required for 'append'.
+        content_hash (str): Source content hash, used as key of the Parquet landing cache (utils/landing_cache.py).
+        write_partitions (int): Maximum number of partitions written (see utils/spark_tuning.py), avoids tiny files.
+    Returns:
+        dict: {'status': 0 on success / 1 on failure, 'rows': rows written,
+               'rejected': rows rejected by the schema, 'watermark': max watermark_column written,
+               'profile': column statistics of the written rows (see utils/ingest_stats.py)}
+    """
+    result = {"status": 1, "rows": 0, "rejected": 0, "watermark": None, "profile": None}
+    source_bytes = os.path.getsize(csv_path)
+
+    # Read CSV (or its Parquet landing copy) with the declared schema
+    try:
+        with measure_stage(table_name, "schema_resolution"):
+            if schema_mode != "string":
+                get_read_schema(table_name) # Parsed once from the dbt macro, then cached
+        with measure_stage(table_name, "read", spark, bytes=source_bytes) as stage:
+            df, rejected, cached_df = read_source(spark, table_name, csv_path, schema_mode, content_hash)
+            stage["rejected"] = rejected
+        result["rejected"] = rejected
+        print(f"✅ [{table_name}] Schema ({schema_mode}, {rejected} rejected row(s)):")
+        df.printSchema() 
+    except Exception as e:
+        print(f"❌ [{table_name}] Failed to read CSV: {e}")
+        return result
+
+    # Write to Snowflake
+    try:
+        if load_mode == "append":
+            # Only keep rows newer than the last loaded watermark
+            df = df.filter(F.col(watermark_column).cast("timestamp") > F.lit(watermark_value).cast("timestamp"))
+            print(f"🔁 [{table_name}] Appending rows with {watermark_column} > {watermark_value}")
+
+        # The profile and the write are two Spark actions: keep the rows so the source is read / parsed once.
+        # Permissive CSV reads are already cached (for the rejected-row count), other reads are cached here.
+        if cached_df is None:
+            df = df.persist(StorageLevel.MEMORY_AND_DISK)
+            cached_df = df
+
+        # Row count, new watermark and column profile in a single aggregation
+        aggregations = [F.count(F.lit(1)).alias("rows")]
+        if watermark_column:
+            aggregations.append(F.max(F.col(watermark_column).cast("timestamp")).alias("watermark"))
+        with measure_stage(table_name, "profile", spark) as stage:
+            summary = df.agg(*aggregations, *profile_aggregations(df)).collect()[0]
+            stage["rows"] = summary["rows"]
+        result["rows"] = summary["rows"]
+        if watermark_column and summary["watermark"] is not None:
+            result["watermark"] = summary["watermark"].isoformat(sep=" ")
+        result["profile"] = parse_profile(summary, df, result["rows"])
+
+        if load_mode == "append" and result["rows"] == 0:
+            print(f"⏭️ [{table_name}] No new rows since {watermark_value}, nothing to append.")
+        else:
+            if write_partitions:
+                df = df.coalesce(write_partitions) # No shuffle, only merges partitions when there are more
+            write = get_sink(config["sink"])
+            with measure_stage(table_name, "write", spark, rows=result["rows"], bytes=source_bytes, sink=config["sink"], load_mode=load_mode):
+                write(df, table_name, config, load_mode, source_bytes=source_bytes)
+            print(f"✅ Success: Ingested '{table_name}' into {config['sink']} ({load_mode}, {result['rows']} row(s)).")
+            try:
+                record_stats(table_name, load_mode, result["rows"], result["rejected"], result["profile"])
+            except OSError as e:
+                print(f"⚠️ [{table_name}] Could not save ingest stats (the load itself succeeded): {e}")
+        result["status"] = 0
+    except Exception as e:
+        print(f"❌ [{table_name}] Failed to write to {config['sink']}: {e}")
+    finally:
+        if cached_df is not None:
+            cached_df.unpersist() # Release the rows cached for the profile and the write
+
+    return result
+
 def main(table_name, csv_path):
     print(f"\n🔄 [START] Ingesting: {table_name}")
     print(f"📄 CSV file: {csv_path}")
@@ -57,37 +173,44 @@ def main(table_name, csv_path):
     if not config:
         return 1 # Exit if Snowflake config is missing
 
-    spark = create_spark_session(f"Ingest_{table_name}")
-    spark.sparkContext.setLogLevel("WARN") # Reduce Spark logs to WARN level
+    manifest = load_manifest()
+    fingerprint = file_fingerprint(csv_path, manifest.get(table_name))
 
-    # Read CSV
-    try:
-        df = spark.read.csv(csv_path, header=True)
-        print("✅ Schema (inferred):")
-        df.printSchema() 
-    except Exception as e:
-        print(f"❌ Failed to read CSV: {e}")
-        spark.stop() # Ensure Spark session is stopped on error
-        return 1
-    # finally: # Optional clean up - can be removed if not strictly necessary
-    #     spark.catalog.clearCache() 
+    # Size the session and the table partitioning from the input file
+    session_plan = plan_session(fingerprint["size"])
+    table_plan = plan_table(table_name, fingerprint["size"], session_plan["cores"])
+    print(format_plan("session", session_plan))
+    print(format_plan(table_name, table_plan))
 
-    # # Write to Snowflake
-    try:
-        config["dbtable"] = table_name.upper() # Snowflake is case-sensitive and defaults to uppercase
-        df.write \
-            .format("snowflake") \
-            .options(**config) \
-            .mode("overwrite") \
-            .save()
-        print(f"✅ Success: Ingested '{table_name}' into Snowflake.")
-    except Exception as e:
-        print(f"❌ Failed to write to Snowflake: {e}")
-        return 1
-    finally:
-        spark.stop() # Ensure Spark session is always stopped
+    with measure_stage("_run", "total", bytes=fingerprint["size"]):
+        with measure_stage("_session", "session_start"):
+            spark = create_spark_session(
+                f"Ingest_{table_name}",
+                executor_memory=session_plan["executor_memory"],
+                shuffle_partitions=session_plan["shuffle_partitions"],
+                extra_configs={"spark.driver.memory": session_plan["driver_memory"]},
+                include_snowflake_connector=config["sink"] == "snowflake_spark"
+            )
+            spark.sparkContext.setLogLevel("WARN") # Reduce Spark logs to WARN level
+
+        try:
+            # A manual single-table run is always a full reload
+            result = ingest_table(
+                table_session(spark, table_plan), config, table_name, csv_path,
+                watermark_column=incremental_tables.get(table_name),
+                content_hash=fingerprint["sha256"],
+                write_partitions=table_plan["write_partitions"]
+            )
+        finally:
+            spark.stop() # Ensure Spark session is always stopped
+
+    # Record the load so the next incremental run starts from this watermark
+    if result["status"] == 0:
+        manifest[table_name] = build_entry(fingerprint, result, "overwrite", sink=config["sink"], schema_mode=INGEST_SCHEMA_MODE)
+        save_manifest(manifest)
 
-    return 0
+    write_metrics(result["status"])
+    return result["status"]
 
 if __name__ == "__main__":
     if len(sys.argv) != 3:
@@ -98,6 +221,5 @@ if __name__ == "__main__":
     table = sys.argv[1]
     # Get the second command line argument (the path to the CSV file)
     path = sys.argv[2]
-    # Call the main function with these arguments to run the ingestion process
-    main(table, path)
-    sys.exit(main(table, path))
\ No newline at end of file
+    # Call the main function with these arguments to run the ingestion process (only once)
+    sys.exit(main(table, path))
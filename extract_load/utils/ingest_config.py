@@ -18,9 +18,9 @@ table_list = [
 # Safe default if variable does not exist (e.g. run ingest_config.py directly)
 PROJECT_ROOT_DIR = os.getenv("PROJECT_ROOT_DIR", os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
-# Build the path to the 'data' directory
+# Build the path to the 'data' directory (INGEST_DATA_DIR can point ingest to another folder, e.g. synthetic data)
 # os.path.join will handle slashes properly for different OSs, then add os.sep making sure there is a / at the end
-BASE_DATA_PATH = os.path.join(PROJECT_ROOT_DIR, "data") + os.sep
+BASE_DATA_PATH = os.getenv("INGEST_DATA_DIR", os.path.join(PROJECT_ROOT_DIR, "data")).rstrip(os.sep) + os.sep
 
 # --------------- FILE MAP ---------------
 # Map each table name o its correcsponding raw CSV file path.
@@ -34,4 +34,99 @@ file_map = {
     "products": f"{BASE_DATA_PATH}olist_products_dataset.csv",
     "sellers": f"{BASE_DATA_PATH}olist_sellers_dataset.csv",
     "product_category_name_translation": f"{BASE_DATA_PATH}product_category_name_translation.csv"
-}
\ No newline at end of file
+}
+
+# --------------- CONCURRENCY ---------------
+# Maximum number of tables loaded at the same time inside one Spark session (see spark_ingest_all.py).
+# Bounded so that large tables do not compete for the same executor memory.
+MAX_INGEST_WORKERS = int(os.getenv("INGEST_MAX_WORKERS", "4"))
+
+# --------------- READ SCHEMA ---------------
+# How raw CSVs are typed on read (see utils/schema_registry.py):
+#   - "permissive": rows that do not match the declared types are counted, reported and dropped
+#   - "strict": any row that does not match the declared types fails the table
+#   - "string": legacy header-only load, every column lands in RAW as a string
+#               (set the dbt var `raw_typed: false` so staging keeps using try_cast)
+INGEST_SCHEMA_MODE = os.getenv("INGEST_SCHEMA_MODE", "permissive").lower()
+
+# Extra Spark CSV reader options per table
+csv_read_options = {
+    # Review comments contain quoted line breaks
+    "order_reviews": {"multiLine": True, "escape": '"'},
+}
+
+# --------------- CHANGE DETECTION ---------------
+# Manifest of the last successful load per table: file size, mtime, content hash, row count and watermark
+# (see utils/ingest_manifest.py). Unchanged source files are skipped unless --force is passed.
+INGEST_MANIFEST_PATH = os.getenv("INGEST_MANIFEST_PATH", os.path.join(PROJECT_ROOT_DIR, "logs", "ingest_manifest.json"))
+
+# Append-only tables and their watermark column.
+# When the source file changed, only rows newer than the last loaded watermark are appended
+# instead of overwriting the whole table.
+incremental_tables = {
+    "orders": "order_purchase_timestamp",
+    "order_items": "shipping_limit_date",
+}
+
+# --------------- PARQUET LANDING ---------------
+# Optional columnar landing stage between the CSV files and the warehouse load (see utils/landing_cache.py).
+# Each CSV is converted once into typed, compressed Parquet keyed by its content hash,
+# so re-runs (retries, --force, local tooling) never tokenize the CSV again.
+USE_LANDING_CACHE = os.getenv("INGEST_USE_LANDING", "false").lower() == "true"
+LANDING_DIR = os.getenv("INGEST_LANDING_DIR", os.path.join(PROJECT_ROOT_DIR, "data", "landing"))
+LANDING_COMPRESSION = os.getenv("INGEST_LANDING_COMPRESSION", "zstd")
+
+# Date column used to partition the landing dataset by month (tables without a date column are not partitioned)
+landing_partition_columns = {
+    "orders": "order_purchase_timestamp",
+    "order_items": "shipping_limit_date",
+    "order_reviews": "review_creation_date",
+}
+
+# --------------- LOAD SINK ---------------
+# Where ingested tables are written (see utils/load_sinks.py). Selected with INGEST_SINK in load_snowflake_config():
+#   - "snowflake": bulk load, Parquet files PUT to the table stage then COPY INTO (default)
+#   - "snowflake_spark": legacy Spark Snowflake connector write
+#   - "duckdb": local DuckDB database, no Snowflake account needed
+#   - "parquet": local Parquet folder per table, no Snowflake account needed
+DEFAULT_INGEST_SINK = "snowflake"
+
+# Bulk stage tuning: target size of each staged file and number of PUT upload threads
+SNOWFLAKE_STAGE_FILE_MB = int(os.getenv("SNOWFLAKE_STAGE_FILE_MB", "128"))
+SNOWFLAKE_PUT_PARALLEL = int(os.getenv("SNOWFLAKE_PUT_PARALLEL", "8"))
+
+# Local sinks output
+LOCAL_SINK_DIR = os.getenv("INGEST_LOCAL_SINK_DIR", os.path.join(PROJECT_ROOT_DIR, "data", "warehouse"))
+DUCKDB_PATH = os.getenv("INGEST_DUCKDB_PATH", os.path.join(LOCAL_SINK_DIR, "olist.duckdb"))
+DUCKDB_RAW_SCHEMA = os.getenv("INGEST_DUCKDB_SCHEMA", "raw")
+
+# --------------- SPARK TUNING ---------------
+# Spark resources and partitioning are chosen from the input file sizes and the available cores
+# (see utils/spark_tuning.py). Pin values here to override the automatic plan.
+# Session level keys: executor_memory, driver_memory, shuffle_partitions (e.g., {"driver_memory": "4g"})
+spark_session_overrides = {}
+
+# Table level keys: max_partition_bytes, shuffle_partitions, write_partitions
+# (e.g., {"geolocation": {"max_partition_bytes": "32m", "write_partitions": 8}})
+spark_table_overrides = {}
+
+# --------------- INGEST PROFILING ---------------
+# Column statistics computed in the same aggregation as the row count / watermark (see utils/ingest_stats.py):
+# row count, null count per column, min/max of numeric and date columns, approximate distinct count of key columns.
+# Latest stats per table are kept in INGEST_STATS_PATH, every load is appended to INGEST_STATS_HISTORY_PATH.
+INGEST_STATS_PATH = os.getenv("INGEST_STATS_PATH", os.path.join(PROJECT_ROOT_DIR, "logs", "ingest_stats.json"))
+INGEST_STATS_HISTORY_PATH = os.getenv("INGEST_STATS_HISTORY_PATH", os.path.join(PROJECT_ROOT_DIR, "logs", "ingest_stats_history.jsonl"))
+
+# Key columns profiled with a HyperLogLog distinct estimate (only when the table has the column)
+profile_key_columns = ["order_id", "customer_id", "customer_unique_id", "product_id", "seller_id", "review_id"]
+PROFILE_APPROX_RSD = 0.02 # Max relative standard deviation of the distinct estimates
+
+# Anomaly checks against the previous full load of the same table (warnings only, the load is not failed)
+PROFILE_ROW_DROP_THRESHOLD = float(os.getenv("INGEST_PROFILE_ROW_DROP", "0.2"))     # Row count dropped by more than 20%
+PROFILE_NULL_RATE_THRESHOLD = float(os.getenv("INGEST_PROFILE_NULL_RATE", "0.05"))  # Null rate of a column rose by more than 5 points
+
+# --------------- RUN METRICS ---------------
+# Duration, rows, bytes and Spark job/stage/task counts of each ingest stage (see utils/ingest_metrics.py).
+# Every stage is appended to ingest_metrics.jsonl, the last run is also written as a Prometheus textfile
+# (ingest_metrics.prom, for node_exporter's textfile collector) and as ingest_last_run.json (pushed to XCom by the DAG).
+INGEST_METRICS_DIR = os.getenv("INGEST_METRICS_DIR", os.path.join(PROJECT_ROOT_DIR, "logs", "metrics"))
@@ -0,0 +1,101 @@
+import os
+import json
+import hashlib
+from datetime import datetime
+from utils.ingest_config import INGEST_MANIFEST_PATH
+
+# Read files in 8 MB blocks when hashing so large CSVs are never loaded fully in memory
+HASH_BLOCK_SIZE = 8 * 1024 * 1024
+
+def load_manifest(manifest_path: str = INGEST_MANIFEST_PATH) -> dict:
+    """
+    Load the ingest manifest.
+
+    Returns:
+        dict: {table_name: entry} or an empty dict if the manifest does not exist / is unreadable.
+    """
+    if not os.path.exists(manifest_path):
+        return {}
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Could not read ingest manifest {manifest_path}, every table will be reloaded: {e}")
+        return {}
+
+def save_manifest(manifest: dict, manifest_path: str = INGEST_MANIFEST_PATH):
+    """Write the manifest atomically (write to a temp file then rename)."""
+    os.makedirs(os.path.dirname(os.path.abspath(manifest_path)), exist_ok=True)
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+def file_sha256(path: str) -> str:
+    """Compute the SHA-256 content hash of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def file_fingerprint(path: str, previous: dict = None) -> dict:
+    """
+    Return the size, mtime and content hash of a source file.
+    The hash is reused from the previous manifest entry when size and mtime did not change,
+    so unchanged files are never re-read.
+    """
+    stat = os.stat(path)
+    fingerprint = {"path": path, "size": stat.st_size, "mtime": stat.st_mtime}
+    if previous and previous.get("size") == stat.st_size and previous.get("mtime") == stat.st_mtime and previous.get("sha256"):
+        fingerprint["sha256"] = previous["sha256"]
+    else:
+        fingerprint["sha256"] = file_sha256(path)
+    return fingerprint
+
+def same_target(previous: dict, sink: str, schema_mode: str) -> bool:
+    """
+    The last successful load went to the same load sink with the same schema mode.
+    Entries written before these fields existed never match: the table is reloaded once.
+    """
+    return bool(previous) and previous.get("sink") == sink and previous.get("schema_mode") == schema_mode
+
+def is_unchanged(previous: dict, fingerprint: dict, sink: str, schema_mode: str) -> bool:
+    """
+    A source is unchanged if its content hash matches the last successful load into the same sink
+    with the same schema mode (after switching INGEST_SINK the new sink is still empty).
+    """
+    return same_target(previous, sink, schema_mode) and previous.get("sha256") == fingerprint["sha256"]
+
+def build_entry(fingerprint: dict, result: dict, load_mode: str, previous: dict = None, sink: str = None, schema_mode: str = None) -> dict:
+    """
+    Build the manifest entry of a successful load.
+
+    Args:
+        fingerprint (dict): Output of file_fingerprint().
+        result (dict): Output of ingest_table() (rows, watermark, ...).
+        load_mode (str): 'overwrite' or 'append'.
+        previous (dict): Previous manifest entry (used to keep the running total and watermark on append).
+        sink (str): Load sink the table was written to (see utils/load_sinks.py).
+        schema_mode (str): Schema mode the CSV was read with (see ingest_config.INGEST_SCHEMA_MODE).
+    """
+    previous = previous or {}
+    rows_loaded = result.get("rows", 0)
+    if load_mode == "append":
+        total_rows = previous.get("total_rows", 0) + rows_loaded
+        # Keep the previous watermark if nothing newer was appended
+        watermark = result.get("watermark") or previous.get("watermark")
+    else:
+        total_rows = rows_loaded
+        watermark = result.get("watermark")
+
+    return {
+        **fingerprint,
+        "sink": sink,
+        "schema_mode": schema_mode,
+        "load_mode": load_mode,
+        "rows_loaded": rows_loaded,
+        "total_rows": total_rows,
+        "watermark": watermark,
+        "loaded_at": datetime.now().isoformat(timespec="seconds"),
+    }
@@ -0,0 +1,152 @@
+import os
+import json
+import time
+import uuid
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from utils.ingest_config import INGEST_METRICS_DIR
+
+METRICS_JSONL_FILE = "ingest_metrics.jsonl"
+METRICS_PROM_FILE = "ingest_metrics.prom"
+LAST_RUN_FILE = "ingest_last_run.json"
+
+# Prometheus metric name -> (record key, help text)
+PROMETHEUS_METRICS = {
+    "olist_ingest_stage_duration_seconds": ("duration_seconds", "Wall time of an ingest stage"),
+    "olist_ingest_stage_rows": ("rows", "Rows processed by an ingest stage"),
+    "olist_ingest_stage_bytes": ("bytes", "Input bytes of an ingest stage"),
+    "olist_ingest_stage_spark_tasks": ("spark_tasks", "Spark tasks run by an ingest stage"),
+    "olist_ingest_stage_spark_failed_tasks": ("spark_failed_tasks", "Spark tasks failed in an ingest stage"),
+    "olist_ingest_stage_success": ("success", "1 if the ingest stage succeeded, 0 otherwise"),
+}
+
+# Metrics of the current process: every table thread adds its stages here
+records = []
+records_lock = threading.Lock()
+RUN_ID = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+
+def spark_job_metrics(spark, job_group: str) -> dict:
+    """
+    Count the Spark jobs, stages and tasks run under a job group (from the SparkContext status tracker).
+    The tracker only keeps recent jobs, so counts are best effort on very long runs.
+    """
+    tracker = spark.sparkContext.statusTracker()
+    job_ids = tracker.getJobIdsForGroup(job_group)
+    stage_ids = set()
+    for job_id in job_ids:
+        job = tracker.getJobInfo(job_id)
+        if job:
+            stage_ids.update(job.stageIds)
+    tasks, failed_tasks = 0, 0
+    for stage_id in stage_ids:
+        stage = tracker.getStageInfo(stage_id)
+        if stage:
+            tasks += stage.numCompletedTasks
+            failed_tasks += stage.numFailedTasks
+    return {"spark_jobs": len(job_ids), "spark_stages": len(stage_ids), "spark_tasks": tasks, "spark_failed_tasks": failed_tasks}
+
+@contextmanager
+def measure_stage(table_name: str, stage: str, spark=None, **fields):
+    """
+    Measure one ingest stage. The yielded dict can be filled with 'rows' / 'bytes' inside the block.
+    When a Spark session is given, the Spark jobs of the block are tagged with a job group
+    (thread-local, so concurrent tables are measured separately) and their stage/task counts are recorded.
+
+    Example:
+        with measure_stage("orders", "write", spark, bytes=size) as m:
+            write(df, ...)
+            m["rows"] = rows
+    """
+    record = {
+        "run_id": RUN_ID,
+        "table": table_name,
+        "stage": stage,
+        "started_at": datetime.now().isoformat(timespec="milliseconds"),
+        "rows": None,
+        "bytes": None,
+        **fields,
+    }
+    job_group = f"{RUN_ID}:{table_name}:{stage}"
+    if spark is not None:
+        spark.sparkContext.setJobGroup(job_group, f"{stage} {table_name}")
+    start = time.perf_counter()
+    try:
+        yield record
+        record["success"] = 1
+    except Exception:
+        record["success"] = 0
+        raise
+    finally:
+        record["duration_seconds"] = round(time.perf_counter() - start, 3)
+        if spark is not None:
+            try:
+                record.update(spark_job_metrics(spark, job_group))
+            except Exception as e:
+                print(f"⚠️ [{table_name}] Could not read Spark metrics of stage {stage}: {e}")
+            spark.sparkContext.setLocalProperty("spark.jobGroup.id", None)
+        with records_lock:
+            records.append(record)
+        print(f"⏱️ [{table_name}] {stage}: {record['duration_seconds']}s" + (f", {record['rows']} row(s)" if record["rows"] is not None else ""))
+
+def prometheus_label(value) -> str:
+    """Escape a Prometheus label value."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def to_prometheus(run_records: list) -> str:
+    """Render the records of a run in the Prometheus text exposition format."""
+    lines = []
+    for name, (key, help_text) in PROMETHEUS_METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        for r in run_records:
+            if r.get(key) is None:
+                continue
+            lines.append(f'{name}{{table="{prometheus_label(r["table"])}",stage="{prometheus_label(r["stage"])}"}} {r[key]}')
+    lines.append("# HELP olist_ingest_last_run_timestamp_seconds Unix time the last ingest run finished")
+    lines.append("# TYPE olist_ingest_last_run_timestamp_seconds gauge")
+    lines.append(f"olist_ingest_last_run_timestamp_seconds {int(time.time())}")
+    return "\n".join(lines) + "\n"
+
+def write_atomic(path: str, content: str):
+    """Write a file through a temp file + rename so readers never see a partial file."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+def write_metrics(status: int = None, metrics_dir: str = INGEST_METRICS_DIR) -> dict:
+    """
+    Flush the metrics of this run: append them to the JSON lines history,
+    and replace the Prometheus textfile and the last run summary.
+
+    Returns:
+        dict: Last run summary {'run_id', 'status', 'finished_at', 'total_seconds', 'stages': [...]}
+    """
+    with records_lock:
+        run_records = list(records)
+
+    os.makedirs(metrics_dir, exist_ok=True)
+    with open(os.path.join(metrics_dir, METRICS_JSONL_FILE), "a", encoding="utf-8") as f:
+        for r in run_records:
+            f.write(json.dumps(r, sort_keys=True) + "\n")
+    write_atomic(os.path.join(metrics_dir, METRICS_PROM_FILE), to_prometheus(run_records))
+
+    summary = {
+        "run_id": RUN_ID,
+        "status": status,
+        "finished_at": datetime.now().isoformat(timespec="seconds"),
+        "total_seconds": next((r["duration_seconds"] for r in run_records if r["table"] == "_run"), None),
+        "stages": run_records,
+    }
+    write_atomic(os.path.join(metrics_dir, LAST_RUN_FILE), json.dumps(summary, indent=2, sort_keys=True))
+    print(f"📊 Ingest metrics saved in: {metrics_dir}")
+    return summary
+
+def load_last_run(metrics_dir: str = INGEST_METRICS_DIR) -> dict:
+    """Read the last run summary written by write_metrics() (None if there is none)."""
+    path = os.path.join(metrics_dir, LAST_RUN_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
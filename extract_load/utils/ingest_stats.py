@@ -0,0 +1,146 @@
+import os
+import json
+import threading
+from datetime import datetime
+from pyspark.sql import functions as F
+from pyspark.sql.types import NumericType, DateType, TimestampType
+from utils.ingest_config import (
+    INGEST_STATS_PATH, INGEST_STATS_HISTORY_PATH, profile_key_columns, PROFILE_APPROX_RSD,
+    PROFILE_ROW_DROP_THRESHOLD, PROFILE_NULL_RATE_THRESHOLD
+)
+from utils.schema_registry import CORRUPT_RECORD_COLUMN
+
+# Concurrent ingest threads share the same stats files
+stats_lock = threading.Lock()
+
+# Aggregation aliases are "<column>__<metric>"
+SEPARATOR = "__"
+
+def profiled_columns(df) -> list:
+    """Data columns of the DataFrame (the corrupt record column is never profiled)."""
+    return [f for f in df.schema.fields if f.name != CORRUPT_RECORD_COLUMN]
+
+def profile_aggregations(df) -> list:
+    """
+    Column expressions profiling every column of df, meant to be added to an existing df.agg()
+    (the row count / watermark aggregation), so the profile adds no aggregation pass of its own.
+    That aggregation and the write are separate actions: ingest_table() persists df so the source is read once.
+
+    Returns:
+        list: Aggregations aliased '<column>__nulls', '<column>__min', '<column>__max', '<column>__distinct'.
+    """
+    aggregations = []
+    for field in profiled_columns(df):
+        col = F.col(field.name)
+        aggregations.append(F.count(F.when(col.isNull(), 1)).alias(f"{field.name}{SEPARATOR}nulls"))
+        if isinstance(field.dataType, (NumericType, DateType, TimestampType)):
+            aggregations.append(F.min(col).alias(f"{field.name}{SEPARATOR}min"))
+            aggregations.append(F.max(col).alias(f"{field.name}{SEPARATOR}max"))
+        if field.name in profile_key_columns:
+            aggregations.append(F.approx_count_distinct(col, PROFILE_APPROX_RSD).alias(f"{field.name}{SEPARATOR}distinct"))
+    return aggregations
+
+def to_json_value(value):
+    """Make an aggregated value JSON serializable (dates as ISO strings, decimals as float)."""
+    if value is None or isinstance(value, (int, float, str, bool)):
+        return value
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return float(value)
+
+def parse_profile(summary, df, rows: int) -> dict:
+    """
+    Turn the aggregated Row into per-column statistics.
+
+    Returns:
+        dict: {column: {'nulls', 'null_rate', 'min', 'max', 'approx_distinct'}} (only the metrics computed for the column)
+    """
+    values = summary.asDict()
+    columns = {}
+    for field in profiled_columns(df):
+        stats = {}
+        nulls = values.get(f"{field.name}{SEPARATOR}nulls")
+        stats["nulls"] = nulls
+        stats["null_rate"] = round(nulls / rows, 6) if rows else 0.0
+        for metric, key in (("min", "min"), ("max", "max"), ("distinct", "approx_distinct")):
+            alias = f"{field.name}{SEPARATOR}{metric}"
+            if alias in values:
+                stats[key] = to_json_value(values[alias])
+        columns[field.name] = stats
+    return columns
+
+def load_stats(stats_path: str = INGEST_STATS_PATH) -> dict:
+    """Latest stats per table ({} if the file does not exist / is unreadable)."""
+    if not os.path.exists(stats_path):
+        return {}
+    try:
+        with open(stats_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Could not read ingest stats {stats_path}: {e}")
+        return {}
+
+def last_full_load(entry: dict) -> dict:
+    """The last full load of a table: the entry itself, or the reference kept by an appended batch."""
+    if not entry:
+        return None
+    return entry if entry.get("load_mode") == "overwrite" else entry.get("reference")
+
+def check_anomalies(table_name: str, current: dict, previous: dict) -> list:
+    """
+    Compare a full load with the previous full load of the same table.
+    Appended batches are not compared, they only contain the new rows.
+
+    Returns:
+        list: Warning messages (empty if nothing looks wrong).
+    """
+    if not previous or current["load_mode"] != "overwrite":
+        return []
+
+    warnings = []
+    previous_rows = previous.get("rows") or 0
+    if previous_rows and current["rows"] < previous_rows * (1 - PROFILE_ROW_DROP_THRESHOLD):
+        warnings.append(f"row count dropped from {previous_rows} to {current['rows']}")
+    for column, stats in current["columns"].items():
+        previous_rate = previous.get("columns", {}).get(column, {}).get("null_rate")
+        if previous_rate is not None and stats["null_rate"] - previous_rate > PROFILE_NULL_RATE_THRESHOLD:
+            warnings.append(f"null rate of {column} rose from {previous_rate:.2%} to {stats['null_rate']:.2%}")
+    return [f"[{table_name}] {w}" for w in warnings]
+
+def record_stats(table_name: str, load_mode: str, rows: int, rejected: int, columns: dict,
+                 stats_path: str = INGEST_STATS_PATH, history_path: str = INGEST_STATS_HISTORY_PATH) -> dict:
+    """
+    Save the stats of one load: replace the table entry in the latest stats file (atomic write)
+    and append it to the history (one JSON object per line).
+
+    Returns:
+        dict: The recorded entry, including the anomaly warnings against the previous full load.
+    """
+    entry = {
+        "table": table_name,
+        "load_mode": load_mode,
+        "rows": rows,
+        "rejected": rejected,
+        "columns": columns,
+        "profiled_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    with stats_lock:
+        stats = load_stats(stats_path)
+        previous = last_full_load(stats.get(table_name))
+        # Appended batches keep the last full load as reference for the next full load
+        if load_mode == "append" and previous:
+            entry["reference"] = previous
+        entry["warnings"] = check_anomalies(table_name, entry, previous)
+        stats[table_name] = entry
+
+        os.makedirs(os.path.dirname(os.path.abspath(stats_path)), exist_ok=True)
+        tmp_path = f"{stats_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(stats, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, stats_path)
+        with open(history_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({k: v for k, v in entry.items() if k != "reference"}, sort_keys=True) + "\n")
+
+    for warning in entry["warnings"]:
+        print(f"⚠️ Profile anomaly {warning}")
+    return entry
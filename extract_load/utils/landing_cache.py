@@ -0,0 +1,105 @@
+import os
+import json
+import shutil
+from pyspark.sql import functions as F
+from utils.ingest_config import LANDING_DIR, LANDING_COMPRESSION, USE_LANDING_CACHE, landing_partition_columns
+from utils.schema_registry import read_raw_csv
+
+# Partition column added to the landing dataset (dropped again before the warehouse write)
+LANDING_PARTITION_COLUMN = "purchase_month"
+
+# Small metadata file written next to the Parquet files of each landing dataset
+LANDING_METADATA_FILE = "_landing.json"
+
+def landing_path(table_name: str, content_hash: str) -> str:
+    """Folder of the landing dataset built from a given source content hash."""
+    return os.path.join(LANDING_DIR, table_name, content_hash[:16])
+
+def get_latest_landing_path(table_name: str):
+    """
+    Return the most recent complete landing dataset of a table, or None.
+    Intended for local tooling (e.g., reading RAW data without a warehouse).
+    """
+    table_dir = os.path.join(LANDING_DIR, table_name)
+    if not os.path.isdir(table_dir):
+        return None
+    candidates = [
+        os.path.join(table_dir, d) for d in os.listdir(table_dir)
+        if os.path.exists(os.path.join(table_dir, d, LANDING_METADATA_FILE))
+    ]
+    return max(candidates, key=os.path.getmtime) if candidates else None
+
+def prune_landing(table_name: str, keep_path: str):
+    """Remove landing datasets of older source versions of a table."""
+    table_dir = os.path.join(LANDING_DIR, table_name)
+    for name in os.listdir(table_dir):
+        path = os.path.join(table_dir, name)
+        if path != keep_path and os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+
+def build_landing(spark, table_name: str, csv_path: str, content_hash: str, schema_mode: str) -> dict:
+    """
+    Convert a raw CSV into a typed, compressed Parquet dataset, partitioned by month when the
+    table has a date column (ingest_config.landing_partition_columns).
+
+    Returns:
+        dict: Landing metadata ({'path', 'rejected', 'partition_column', ...}).
+    """
+    path = landing_path(table_name, content_hash)
+    df, rejected, cached_df = read_raw_csv(spark, table_name, csv_path, schema_mode)
+    try:
+        writer_df = df
+        partition_source = landing_partition_columns.get(table_name)
+        if partition_source:
+            writer_df = df.withColumn(
+                LANDING_PARTITION_COLUMN,
+                F.date_format(F.col(partition_source).cast("timestamp"), "yyyy-MM")
+            )
+        writer = writer_df.write.mode("overwrite").option("compression", LANDING_COMPRESSION)
+        if partition_source:
+            writer = writer.partitionBy(LANDING_PARTITION_COLUMN)
+        writer.parquet(path)
+    finally:
+        if cached_df is not None:
+            cached_df.unpersist()
+
+    metadata = {
+        "table": table_name,
+        "source": csv_path,
+        "sha256": content_hash,
+        "schema_mode": schema_mode,
+        "rejected": rejected,
+        "partition_column": partition_source,
+        "path": path,
+    }
+    # The metadata file is written last and marks the dataset as complete
+    with open(os.path.join(path, LANDING_METADATA_FILE), "w", encoding="utf-8") as f:
+        json.dump(metadata, f, indent=2)
+    prune_landing(table_name, path)
+    print(f"🧱 [{table_name}] Landing Parquet built at {path}")
+    return metadata
+
+def read_source(spark, table_name: str, csv_path: str, schema_mode: str, content_hash: str = None, use_landing: bool = USE_LANDING_CACHE):
+    """
+    Read a table's source data, through the Parquet landing cache when enabled.
+    Same return contract as schema_registry.read_raw_csv: (DataFrame, rejected rows, DataFrame to unpersist or None).
+    """
+    # The legacy string mode keeps reading the CSV directly
+    if not use_landing or not content_hash or schema_mode == "string":
+        return read_raw_csv(spark, table_name, csv_path, schema_mode)
+
+    path = landing_path(table_name, content_hash)
+    metadata_path = os.path.join(path, LANDING_METADATA_FILE)
+    if os.path.exists(metadata_path):
+        with open(metadata_path, "r", encoding="utf-8") as f:
+            metadata = json.load(f)
+        print(f"♻️ [{table_name}] Reading landing Parquet {path}")
+        if schema_mode == "strict" and metadata.get("rejected"):
+            raise ValueError(f"{metadata['rejected']} row(s) rejected in strict schema mode (landing built as {metadata.get('schema_mode')})")
+    else:
+        metadata = build_landing(spark, table_name, csv_path, content_hash, schema_mode)
+
+    df = spark.read.parquet(path)
+    if LANDING_PARTITION_COLUMN in df.columns:
+        df = df.drop(LANDING_PARTITION_COLUMN)
+    return df, metadata.get("rejected", 0), None
@@ -0,0 +1,167 @@
+import os
+import glob
+import math
+import shutil
+import tempfile
+import threading
+from utils.ingest_config import (
+    SNOWFLAKE_STAGE_FILE_MB, SNOWFLAKE_PUT_PARALLEL,
+    LOCAL_SINK_DIR, DUCKDB_PATH, DUCKDB_RAW_SCHEMA, LANDING_COMPRESSION
+)
+
+# Every sink has the same signature:
+#   write_<sink>(df, table_name, config, mode, source_bytes=None)
+#       df (DataFrame): Data to load.
+#       table_name (str): Logical table name (e.g., 'orders').
+#       config (dict): Output of load_snowflake_config() ('sink' key + Snowflake options if needed).
+#       mode (str): 'overwrite' (replace the table) or 'append'.
+#       source_bytes (int): Size of the source file, used to size the staged files.
+
+# Map Spark simple type names to Snowflake column types
+SNOWFLAKE_TYPE_MAP = {
+    "string": "VARCHAR",
+    "int": "INTEGER",
+    "bigint": "BIGINT",
+    "double": "FLOAT",
+    "float": "FLOAT",
+    "boolean": "BOOLEAN",
+    "date": "DATE",
+    "timestamp": "TIMESTAMP_NTZ",
+}
+
+# DuckDB allows one writer per database file, serialize concurrent ingest threads
+duckdb_lock = threading.Lock()
+
+def snowflake_options(config: dict) -> dict:
+    """Snowflake connector options without the sink selector."""
+    return {k: v for k, v in config.items() if k != "sink"}
+
+def to_snowflake_type(data_type) -> str:
+    """Convert a Spark DataType to a Snowflake column type."""
+    type_name = data_type.simpleString()
+    if type_name.startswith("decimal"):
+        return type_name.replace("decimal", "NUMBER")
+    return SNOWFLAKE_TYPE_MAP.get(type_name, "VARCHAR")
+
+def write_staged_parquet(df, output_dir: str, num_files: int = None):
+    """
+    Write a DataFrame as Parquet files into output_dir (optionally in num_files files).
+
+    Returns:
+        list: Paths of the written Parquet files.
+    """
+    if num_files:
+        df = df.repartition(num_files)
+    df.write.mode("overwrite").option("compression", "snappy").parquet(output_dir)
+    return sorted(glob.glob(os.path.join(output_dir, "*.parquet")))
+
+def write_snowflake_spark(df, table_name, config, mode, source_bytes=None):
+    """Legacy path: write with the Spark Snowflake connector."""
+    # Copy the config so concurrent tables do not overwrite each other's target table
+    options = dict(snowflake_options(config), dbtable=table_name.upper()) # Snowflake is case-sensitive and defaults to uppercase
+    df.write \
+        .format("snowflake") \
+        .options(**options) \
+        .mode(mode) \
+        .save()
+
+def write_snowflake_stage(df, table_name, config, mode, source_bytes=None):
+    """
+    Bulk load: write Parquet files sized to SNOWFLAKE_STAGE_FILE_MB, PUT them to the table stage
+    with SNOWFLAKE_PUT_PARALLEL threads, then load with one COPY INTO.
+    An overwrite loads into a separate table and swaps it in, so readers never see a half-loaded table.
+    """
+    import snowflake.connector
+
+    target = table_name.upper()
+    load_table = target if mode == "append" else f"{target}__LOADING"
+    num_files = max(1, math.ceil((source_bytes or 0) / (SNOWFLAKE_STAGE_FILE_MB * 1024 * 1024)))
+    columns = ", ".join(f"{f.name.upper()} {to_snowflake_type(f.dataType)}" for f in df.schema.fields)
+
+    tmp_dir = tempfile.mkdtemp(prefix=f"stage_{table_name}_")
+    try:
+        files = write_staged_parquet(df, os.path.join(tmp_dir, "data"), num_files)
+        conn = snowflake.connector.connect(
+            account=config["sfURL"].replace(".snowflakecomputing.com", ""),
+            user=config["sfUser"],
+            password=config["sfPassword"],
+            database=config["sfDatabase"],
+            schema=config["sfSchema"],
+            warehouse=config["sfWarehouse"],
+            role=config["sfRole"],
+        )
+        try:
+            cs = conn.cursor()
+            if mode == "append":
+                cs.execute(f"CREATE TABLE IF NOT EXISTS {target} ({columns})")
+            else:
+                cs.execute(f"CREATE OR REPLACE TABLE {load_table} ({columns})")
+            if files:
+                data_dir = os.path.join(tmp_dir, "data").replace(os.sep, "/")
+                cs.execute(f"PUT 'file://{data_dir}/*.parquet' @%{load_table} PARALLEL={SNOWFLAKE_PUT_PARALLEL} AUTO_COMPRESS=FALSE OVERWRITE=TRUE")
+                cs.execute(
+                    f"COPY INTO {load_table} FROM @%{load_table} "
+                    f"FILE_FORMAT = (TYPE = PARQUET) MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE PURGE = TRUE"
+                )
+            if mode != "append":
+                cs.execute(f"CREATE TABLE IF NOT EXISTS {target} LIKE {load_table}")
+                cs.execute(f"ALTER TABLE {target} SWAP WITH {load_table}")
+                cs.execute(f"DROP TABLE IF EXISTS {load_table}")
+            print(f"📦 [{table_name}] Loaded {len(files)} staged file(s) into {target} via COPY INTO.")
+        finally:
+            conn.close()
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+def write_duckdb(df, table_name, config, mode, source_bytes=None):
+    """Local stand-in: load the table into a DuckDB database (DUCKDB_PATH, schema DUCKDB_RAW_SCHEMA)."""
+    try:
+        import duckdb
+    except ImportError:
+        raise ImportError("duckdb not installed. Install with `pip install duckdb`.")
+
+    os.makedirs(LOCAL_SINK_DIR, exist_ok=True)
+    staging_dir = tempfile.mkdtemp(prefix=f"duckdb_{table_name}_", dir=LOCAL_SINK_DIR)
+    try:
+        files = write_staged_parquet(df, os.path.join(staging_dir, "data"))
+        source = f"read_parquet('{os.path.join(staging_dir, 'data', '*.parquet')}')"
+        target = f"{DUCKDB_RAW_SCHEMA}.{table_name}"
+        with duckdb_lock:
+            conn = duckdb.connect(DUCKDB_PATH)
+            try:
+                conn.execute(f"CREATE SCHEMA IF NOT EXISTS {DUCKDB_RAW_SCHEMA}")
+                if not files:
+                    return
+                if mode == "append":
+                    conn.execute(f"CREATE TABLE IF NOT EXISTS {target} AS SELECT * FROM {source} LIMIT 0")
+                    conn.execute(f"INSERT INTO {target} BY NAME SELECT * FROM {source}")
+                else:
+                    conn.execute(f"CREATE OR REPLACE TABLE {target} AS SELECT * FROM {source}")
+            finally:
+                conn.close()
+        print(f"🦆 [{table_name}] Loaded into DuckDB {DUCKDB_PATH} ({target}).")
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+def write_parquet(df, table_name, config, mode, source_bytes=None):
+    """Local stand-in: write the table as a Parquet folder under LOCAL_SINK_DIR/raw/<table_name>."""
+    path = os.path.join(LOCAL_SINK_DIR, "raw", table_name)
+    df.write.mode(mode).option("compression", LANDING_COMPRESSION).parquet(path)
+    print(f"🗂️ [{table_name}] Written to {path}.")
+
+# --------------- SINK REGISTRY ---------------
+LOAD_SINKS = {
+    "snowflake": write_snowflake_stage,
+    "snowflake_spark": write_snowflake_spark,
+    "duckdb": write_duckdb,
+    "parquet": write_parquet,
+}
+
+# Sinks that need Snowflake credentials
+SNOWFLAKE_SINKS = {"snowflake", "snowflake_spark"}
+
+def get_sink(sink_name: str):
+    """Return the write function of a sink."""
+    if sink_name not in LOAD_SINKS:
+        raise ValueError(f"❌ Unknown sink '{sink_name}'. Valid sinks: {', '.join(LOAD_SINKS)}")
+    return LOAD_SINKS[sink_name]
@@ -0,0 +1,131 @@
+import os
+import re
+import ast
+from functools import lru_cache
+from pyspark import StorageLevel
+from pyspark.sql import functions as F
+from pyspark.sql.types import (
+    StructType, StructField, StringType, IntegerType, LongType,
+    DoubleType, DecimalType, DateType, TimestampType, BooleanType
+)
+from utils.ingest_config import PROJECT_ROOT_DIR, csv_read_options
+
+# --------------- SCHEMA SOURCE ---------------
+# The column/type definitions live in ONE place: the dbt macro get_staging_schema_map.
+# The dictionary inside the macro is a plain Python-compatible literal, so we read it here
+# instead of keeping a second copy of every column type for ingest.
+DBT_FOLDER_NAME = os.getenv("DBT_FOLDER_NAME", "olist_elt_pipeline")
+STAGING_SCHEMA_MAP_MACRO = os.path.join(
+    PROJECT_ROOT_DIR, DBT_FOLDER_NAME, "macros", "schema_config", "get_staging_schema_map.sql"
+)
+
+# Column added to the read schema to capture rows that do not match the declared types
+CORRUPT_RECORD_COLUMN = "_corrupt_record"
+
+# Olist CSV datetime layout (e.g., 2017-10-02 10:56:33). Date columns also carry a 00:00:00 time part.
+TIMESTAMP_FORMAT = "yyyy-MM-dd HH:mm:ss"
+DATE_FORMAT = "yyyy-MM-dd[ HH:mm:ss]"
+
+# Map SQL types used in the schema map to Spark types
+SPARK_TYPE_MAP = {
+    "varchar": StringType(),
+    "string": StringType(),
+    "text": StringType(),
+    "int": IntegerType(),
+    "integer": IntegerType(),
+    "bigint": LongType(),
+    "float": DoubleType(),
+    "double": DoubleType(),
+    "boolean": BooleanType(),
+    "date": DateType(),
+    "timestamp": TimestampType(),
+}
+
+@lru_cache(maxsize=1)
+def load_staging_schema_map(macro_path: str = STAGING_SCHEMA_MAP_MACRO) -> dict:
+    """
+    Read the schema dictionary from the get_staging_schema_map dbt macro.
+
+    Returns:
+        dict: {table_name: {source_column: type | {'type': ..., 'alias': ...}}}
+    """
+    with open(macro_path, "r", encoding="utf-8") as f:
+        content = f.read()
+
+    match = re.search(r"set\s+schema_dict\s*=\s*(\{.*\})\s*%\}", content, re.DOTALL)
+    if not match:
+        raise ValueError(f"❌ Could not find 'schema_dict' in {macro_path}")
+    return ast.literal_eval(match.group(1))
+
+def to_spark_type(sql_type: str):
+    """Convert a SQL type from the schema map (e.g., 'numeric(18,2)') to a Spark DataType."""
+    sql_type = sql_type.strip().lower()
+    decimal = re.fullmatch(r"(?:numeric|decimal|number)\((\d+)\s*,\s*(\d+)\)", sql_type)
+    if decimal:
+        return DecimalType(int(decimal.group(1)), int(decimal.group(2)))
+    if sql_type not in SPARK_TYPE_MAP:
+        raise ValueError(f"❌ Unsupported type '{sql_type}' in schema map")
+    return SPARK_TYPE_MAP[sql_type]
+
+def get_read_schema(table_name: str):
+    """
+    Build the Spark StructType used to read the raw CSV of a table.
+    Column names are the SOURCE names (aliases are applied later in dbt staging).
+
+    Returns:
+        StructType | None: None if the table has no entry in the schema map.
+    """
+    table_schema = load_staging_schema_map().get(table_name)
+    if table_schema is None:
+        return None
+
+    fields = []
+    for column_name, value in table_schema.items():
+        data_type = value if isinstance(value, str) else value["type"]
+        fields.append(StructField(column_name, to_spark_type(data_type), True))
+    return StructType(fields)
+
+def read_raw_csv(spark, table_name: str, csv_path: str, schema_mode: str = "permissive"):
+    """
+    Read a raw CSV with its declared schema.
+
+    Modes:
+        - 'permissive': rows that do not match the declared types are counted and dropped.
+        - 'strict': any row that does not match the declared types fails the table.
+        - 'string': legacy header-only load, every column is a string.
+
+    Returns:
+        tuple: (DataFrame to write, number of rejected rows, DataFrame to unpersist or None)
+    """
+    options = {"header": True, **csv_read_options.get(table_name, {})}
+    schema = get_read_schema(table_name) if schema_mode != "string" else None
+
+    if schema is None:
+        if schema_mode != "string":
+            print(f"⚠️ [{table_name}] No declared schema found, loading all columns as string.")
+        return spark.read.options(**options).csv(csv_path), 0, None
+
+    read_schema = StructType(schema.fields + [StructField(CORRUPT_RECORD_COLUMN, StringType(), True)])
+    raw_df = (
+        spark.read
+        .options(**options)
+        .option("mode", "PERMISSIVE")
+        .option("columnNameOfCorruptRecord", CORRUPT_RECORD_COLUMN)
+        .option("timestampFormat", TIMESTAMP_FORMAT)
+        .option("dateFormat", DATE_FORMAT)
+        .schema(read_schema)
+        .csv(csv_path)
+    )
+    # Spark does not allow querying only the corrupt record column of a raw CSV scan,
+    # so the parsed rows are cached once and reused for both the count and the write.
+    raw_df = raw_df.persist(StorageLevel.MEMORY_AND_DISK)
+
+    rejected = raw_df.filter(F.col(CORRUPT_RECORD_COLUMN).isNotNull()).count()
+    if rejected:
+        print(f"⚠️ [{table_name}] {rejected} row(s) do not match the declared schema.")
+        if schema_mode == "strict":
+            raw_df.unpersist()
+            raise ValueError(f"{rejected} row(s) rejected in strict schema mode")
+
+    df = raw_df.filter(F.col(CORRUPT_RECORD_COLUMN).isNull()).drop(CORRUPT_RECORD_COLUMN)
+    return df, rejected, raw_df
@@ -3,16 +3,21 @@ from pyspark.sql import SparkSession
 def create_spark_session(
     app_name: str = None,
     executor_memory: str = "2g",
-    shuffle_partitions: str = "8"
+    shuffle_partitions: str = "8",
+    extra_configs: dict = None,
+    include_snowflake_connector: bool = True
 ) -> SparkSession:
     """
     Create and return a SparkSession configured for Snowflake integration.
-    This version ensures the Snowflake Spark Connector is loaded.
+    The Snowflake Spark Connector is loaded unless include_snowflake_connector is False.
     
     Args:
         app_name (str): Optional name of the Spark app.
         executor_memory (str): Executor memory allocation (e.g., '2g').
         shuffle_partitions (str): Number of shuffle partitions for Spark.
+        extra_configs (dict): Optional additional Spark configs (e.g., {'spark.scheduler.mode': 'FAIR'}).
+        include_snowflake_connector (bool): Resolve the Snowflake Spark Connector package.
+            Only the 'snowflake_spark' load sink needs it, skipping it avoids the package resolution.
     Returns:
         SparkSession: Configured Spark session.
     """
@@ -20,12 +25,19 @@ def create_spark_session(
     if app_name:
         builder = builder.appName(app_name)
 
-    spark = (
+    if include_snowflake_connector:
+        builder = builder.config("spark.jars.packages", "net.snowflake:spark-snowflake_2.12:2.16.0-spark_3.4")
+
+    builder = (
         builder
-        .config("spark.jars.packages", "net.snowflake:spark-snowflake_2.12:2.16.0-spark_3.4")
         .config("spark.executor.memory", executor_memory)
         .config("spark.sql.shuffle.partitions", shuffle_partitions)
-        .getOrCreate()
+        # Standard Parquet timestamps (instead of legacy INT96) for the landing cache and staged loads
+        .config("spark.sql.parquet.outputTimestampType", "TIMESTAMP_MICROS")
     )
+    for key, value in (extra_configs or {}).items():
+        builder = builder.config(key, value)
+
+    spark = builder.getOrCreate()
     
-    return spark
\ No newline at end of file
+    return spark
@@ -0,0 +1,84 @@
+import os
+import math
+from utils.ingest_config import spark_session_overrides, spark_table_overrides, csv_read_options
+
+MB = 1024 * 1024
+
+# Bounds of the automatic plan
+MIN_PARTITION_BYTES = 4 * MB       # Tiny files: one task, no scheduling overhead
+MAX_PARTITION_BYTES = 128 * MB     # Spark default, large files are split into 128 MB tasks at most
+TARGET_WRITE_PARTITION_BYTES = 64 * MB
+MIN_MEMORY_MB = 1024
+MAX_MEMORY_FRACTION = 0.75         # Never plan more than 75% of the machine memory
+MEMORY_PER_INPUT_BYTE = 3          # Parsed rows take roughly 3x the CSV size in memory
+
+def available_cores() -> int:
+    """Number of cores usable by this process."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def system_memory_mb() -> int:
+    """Physical memory of the machine in MB (8 GB if it cannot be read)."""
+    try:
+        return int(os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / MB)
+    except (ValueError, OSError, AttributeError):
+        return 8 * 1024
+
+def plan_session(total_input_bytes: int, cores: int = None) -> dict:
+    """
+    Choose session wide settings from the total input size of the run.
+
+    Returns:
+        dict: {'cores', 'executor_memory', 'driver_memory', 'shuffle_partitions'}
+    """
+    cores = cores or available_cores()
+    max_memory_mb = max(MIN_MEMORY_MB, int(system_memory_mb() * MAX_MEMORY_FRACTION))
+    memory_mb = min(max_memory_mb, max(MIN_MEMORY_MB, int(total_input_bytes * MEMORY_PER_INPUT_BYTE / MB)))
+    plan = {
+        "cores": cores,
+        "executor_memory": f"{memory_mb}m",
+        # In local mode the driver runs the tasks, so it gets the same memory
+        "driver_memory": f"{memory_mb}m",
+        "shuffle_partitions": str(max(cores, min(cores * 4, math.ceil(total_input_bytes / MAX_PARTITION_BYTES)))),
+    }
+    plan.update(spark_session_overrides)
+    return plan
+
+def plan_table(table_name: str, input_bytes: int, cores: int = None) -> dict:
+    """
+    Choose read / write partitioning for one table from its file size.
+    Large files get ~2 tasks per core, tiny files a single task.
+
+    Returns:
+        dict: {'input_mb', 'max_partition_bytes', 'shuffle_partitions', 'write_partitions', 'splittable'}
+    """
+    cores = cores or available_cores()
+    partition_bytes = min(MAX_PARTITION_BYTES, max(MIN_PARTITION_BYTES, math.ceil(input_bytes / (cores * 2))))
+    read_partitions = max(1, math.ceil(input_bytes / partition_bytes))
+    plan = {
+        "input_mb": round(input_bytes / MB, 2),
+        "max_partition_bytes": str(partition_bytes),
+        "shuffle_partitions": str(max(1, min(cores * 2, read_partitions))),
+        "write_partitions": max(1, min(cores * 2, math.ceil(input_bytes / TARGET_WRITE_PARTITION_BYTES))),
+        # multiLine CSVs cannot be split, they are always read by one task
+        "splittable": not csv_read_options.get(table_name, {}).get("multiLine", False),
+    }
+    plan.update(spark_table_overrides.get(table_name, {}))
+    return plan
+
+def table_session(spark, table_plan: dict):
+    """
+    Return a session with the table's SQL settings.
+    newSession() shares the SparkContext (and cache) but has its own SQL conf,
+    so concurrent tables do not overwrite each other's settings.
+    """
+    session = spark.newSession()
+    session.conf.set("spark.sql.files.maxPartitionBytes", table_plan["max_partition_bytes"])
+    session.conf.set("spark.sql.shuffle.partitions", table_plan["shuffle_partitions"])
+    return session
+
+def format_plan(name: str, plan: dict) -> str:
+    """One line description of a plan for the logs."""
+    return f"⚙️ [{name}] Spark plan: " + ", ".join(f"{k}={v}" for k, v in plan.items())
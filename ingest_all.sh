@@ -26,29 +26,17 @@ RUN_LOG="$LOG_DIR/run.log"
 > $FAILED_LOG
 > $RUN_LOG
 
-# Load table list from ingest_config.py
-TABLES=$(python3 -c "from extract_load.utils.ingest_config import table_list; print(' '.join(table_list))")
-# Run ingest for each table
-for table in $TABLES; do
-   TIMESTAMP=$(date '+%Y-%m-%d %H:%M:%S')
-   echo "$TIMESTAMP - 🔄 Ingesting table: $table" | tee -a $RUN_LOG
-
-   # Load CSV file path from ingest_config.py
-   CSV_FILE=$(python3 -c "from extract_load.utils.ingest_config import file_map; print(file_map['$table'])")
-   if [ ! -f "$CSV_FILE" ]; then
-       echo "$TIMESTAMP ❌ Missing file: $CSV_FILE" | tee -a $FAILED_LOG >> $RUN_LOG
-       continue
-   fi
-   # Run PySpark script
-   python3 "$PROJECT_ROOT_DIR/extract_load/spark_ingest_generic.py" "$table" "$CSV_FILE" >> $RUN_LOG 2>&1
-   # Log result
-   if [ $? -eq 0 ]; then
-       echo "$TIMESTAMP ✅ $table" | tee -a $SUCCESS_LOG >> $RUN_LOG
-   else
-       echo "$TIMESTAMP ❌ $table" | tee -a $FAILED_LOG >> $RUN_LOG
-   fi
-   echo "-------------------------------------------" >> $RUN_LOG
-done
+# Run ingest for all tables in ONE Python process / Spark session.
+# Tables are loaded concurrently (see INGEST_MAX_WORKERS) and the per-table result
+# is written to $SUCCESS_LOG / $FAILED_LOG by the Python entry point.
+TIMESTAMP=$(date '+%Y-%m-%d %H:%M:%S')
+echo "$TIMESTAMP - 🔄 Ingesting all tables in a single Spark session" | tee -a $RUN_LOG
+# Do not exit before printing the summary, keep the exit code for the end
+set +e
+python3 "$PROJECT_ROOT_DIR/extract_load/spark_ingest_all.py" --log-dir "$LOG_DIR" "$@" >> $RUN_LOG 2>&1
+INGEST_STATUS=$?
+set -e
+echo "-------------------------------------------" >> $RUN_LOG
 # Final summary
 echo ""
 echo "🎯 Ingest Summary:"
@@ -61,4 +49,6 @@ cat $FAILED_LOG
 echo ""
 echo "📁 Full log saved in: $RUN_LOG"
 
-echo "🚀 Ingest completed. Check logs for details."
\ No newline at end of file
+echo "🚀 Ingest completed. Check logs for details."
+
+exit $INGEST_STATUS
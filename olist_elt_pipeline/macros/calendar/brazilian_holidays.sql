@@ -0,0 +1,102 @@
+{% macro brazilian_holidays(years_relation, year_column='year') -%}
+    {#
+        🧠 Macro: brazilian_holidays
+        📌 Purpose:
+            Return a SELECT of the Brazilian national holidays of every year in `years_relation`:
+            one row per date (holiday_date, holiday_name, is_national_holiday).
+            - Fixed dates: national holidays (Lei 662/1949, 6.802/1980, 14.759/2023 for 20 November since 2024).
+            - Easter based: Paixão de Cristo (national), Carnaval and Corpus Christi
+              (ponto facultativo, commerce and banks close, so they are holidays but not national ones).
+            Easter Sunday is computed per year with the Gregorian computus (integer arithmetic only).
+
+        🧰 Usage in model:
+            years AS (SELECT DISTINCT year FROM spine),
+            holidays AS (
+                {{ brazilian_holidays('years') }}
+            )
+    #}
+    WITH easter_terms AS (
+        SELECT
+            {{ year_column }} AS year,
+            MOD({{ year_column }}, 19) AS a,
+            CAST(FLOOR({{ year_column }} / 100) AS INTEGER) AS b,
+            MOD({{ year_column }}, 100) AS c
+        FROM {{ years_relation }}
+    ),
+
+    easter_epact AS (
+        SELECT
+            year, a, c,
+            MOD(b, 4) AS e,
+            MOD(19 * a + b - CAST(FLOOR(b / 4) AS INTEGER) - CAST(FLOOR((b - CAST(FLOOR((b + 8) / 25) AS INTEGER) + 1) / 3) AS INTEGER) + 15, 30) AS h
+        FROM easter_terms
+    ),
+
+    easter_weekday AS (
+        SELECT
+            year, a, h,
+            MOD(32 + 2 * e + 2 * CAST(FLOOR(c / 4) AS INTEGER) - h - MOD(c, 4), 7) AS l
+        FROM easter_epact
+    ),
+
+    easter_sundays AS (
+        SELECT
+            year,
+            {{ date_from_parts(
+                'year',
+                'CAST(FLOOR((h + l - 7 * CAST(FLOOR((a + 11 * h + 22 * l) / 451) AS INTEGER) + 114) / 31) AS INTEGER)',
+                'MOD(h + l - 7 * CAST(FLOOR((a + 11 * h + 22 * l) / 451) AS INTEGER) + 114, 31) + 1'
+            ) }} AS easter_sunday
+        FROM easter_weekday
+    ),
+
+    fixed_holidays AS (
+        SELECT
+            {{ date_from_parts('y.' ~ year_column, 'f.holiday_month', 'f.holiday_day') }} AS holiday_date,
+            f.holiday_name,
+            TRUE AS is_national_holiday
+        FROM {{ years_relation }} y
+        CROSS JOIN (
+            VALUES
+                (1, 1, 'Confraternização Universal', 1900),
+                (4, 21, 'Tiradentes', 1900),
+                (5, 1, 'Dia do Trabalho', 1900),
+                (9, 7, 'Independência do Brasil', 1900),
+                (10, 12, 'Nossa Senhora Aparecida', 1980),
+                (11, 2, 'Finados', 1900),
+                (11, 15, 'Proclamação da República', 1900),
+                (11, 20, 'Dia Nacional de Zumbi e da Consciência Negra', 2024),
+                (12, 25, 'Natal', 1900)
+        ) AS f (holiday_month, holiday_day, holiday_name, first_year)
+        WHERE y.{{ year_column }} >= f.first_year
+    ),
+
+    easter_holidays AS (
+        SELECT
+            CAST({{ dbt.dateadd('day', 'm.days_from_easter', 'e.easter_sunday') }} AS DATE) AS holiday_date,
+            m.holiday_name,
+            m.is_national_holiday
+        FROM easter_sundays e
+        CROSS JOIN (
+            VALUES
+                (-48, 'Carnaval (segunda-feira)', FALSE),
+                (-47, 'Carnaval (terça-feira)', FALSE),
+                (-2, 'Paixão de Cristo', TRUE),
+                (60, 'Corpus Christi', FALSE)
+        ) AS m (days_from_easter, holiday_name, is_national_holiday)
+    ),
+
+    all_holidays AS (
+        SELECT holiday_date, holiday_name, is_national_holiday FROM fixed_holidays
+        UNION ALL
+        SELECT holiday_date, holiday_name, is_national_holiday FROM easter_holidays
+    )
+
+    -- Two holidays can fall on the same day (Paixão de Cristo was on Tiradentes in 2000)
+    SELECT
+        holiday_date,
+        MIN(holiday_name) AS holiday_name,
+        MAX(CASE WHEN is_national_holiday THEN 1 ELSE 0 END) = 1 AS is_national_holiday
+    FROM all_holidays
+    GROUP BY holiday_date
+{%- endmacro %}
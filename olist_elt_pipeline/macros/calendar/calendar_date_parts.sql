@@ -0,0 +1,71 @@
+{% macro date_from_parts(year, month, day) -%}
+    {#
+        🧠 Macro: date_from_parts
+        📌 Purpose:
+            Build a DATE from integer year / month / day expressions.
+
+        🧰 Usage in model:
+            {{ date_from_parts('e.year', 'e.easter_month', 'e.easter_day') }} AS easter_sunday
+    #}
+    {{ return(adapter.dispatch('date_from_parts')(year, month, day)) }}
+{%- endmacro %}
+
+{% macro default__date_from_parts(year, month, day) -%}
+    {# Snowflake #}
+    DATE_FROM_PARTS({{ year }}, {{ month }}, {{ day }})
+{%- endmacro %}
+
+{% macro duckdb__date_from_parts(year, month, day) -%}
+    MAKE_DATE(CAST({{ year }} AS BIGINT), CAST({{ month }} AS BIGINT), CAST({{ day }} AS BIGINT))
+{%- endmacro %}
+
+{% macro iso_day_of_week(date_column) -%}
+    {#
+        🧠 Macro: iso_day_of_week
+        📌 Purpose:
+            ISO day of the week of a date: Monday = 1 ... Sunday = 7.
+    #}
+    {{ return(adapter.dispatch('iso_day_of_week')(date_column)) }}
+{%- endmacro %}
+
+{% macro default__iso_day_of_week(date_column) -%}
+    DAYOFWEEKISO({{ date_column }})
+{%- endmacro %}
+
+{% macro duckdb__iso_day_of_week(date_column) -%}
+    ISODOW({{ date_column }})
+{%- endmacro %}
+
+{% macro iso_week(date_column) -%}
+    {#
+        🧠 Macro: iso_week
+        📌 Purpose:
+            ISO week number of a date (1-53), weeks start on Monday and week 1 holds the first Thursday of the year.
+    #}
+    {{ return(adapter.dispatch('iso_week')(date_column)) }}
+{%- endmacro %}
+
+{% macro default__iso_week(date_column) -%}
+    WEEKISO({{ date_column }})
+{%- endmacro %}
+
+{% macro duckdb__iso_week(date_column) -%}
+    WEEK({{ date_column }})
+{%- endmacro %}
+
+{% macro iso_year(date_column) -%}
+    {#
+        🧠 Macro: iso_year
+        📌 Purpose:
+            Year of the ISO week of a date (2016-01-01 belongs to week 53 of ISO year 2015).
+    #}
+    {{ return(adapter.dispatch('iso_year')(date_column)) }}
+{%- endmacro %}
+
+{% macro default__iso_year(date_column) -%}
+    YEAROFWEEKISO({{ date_column }})
+{%- endmacro %}
+
+{% macro duckdb__iso_year(date_column) -%}
+    ISOYEAR({{ date_column }})
+{%- endmacro %}
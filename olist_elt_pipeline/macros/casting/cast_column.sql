@@ -1,12 +1,34 @@
-{% macro cast_column(column_name, target_type,alias_column_name=None) %}
+{% macro cast_column(column_name, target_type, alias_column_name=None) %}
     {#
         This macro casts a column to a specified target type and set alias column name if provided.
         Note: Use column aliases only in SELECT. Avoid them in GROUP BY/ORDER BY/WHERE within the same query to prevent syntax errors.
         For GROUP BY/ORDER BY/WHERE, either repeat the full expression or use a macro that doesn not generate an alias.
+        Dispatched per adapter: default__cast_column (Snowflake), duckdb__cast_column (local target).
     #}
+    {{ return(adapter.dispatch('cast_column')(column_name, target_type, alias_column_name)) }}
+{% endmacro %}
+
+{% macro default__cast_column(column_name, target_type, alias_column_name=None) %}
+    {#
+        When var('raw_typed') is true, RAW columns were already typed by the ingest schema registry,
+        so a plain cast is used (try_cast only accepts string input in Snowflake).
+    #}
+    {%- set cast_function = "cast" if var('raw_typed', false) else "try_cast" -%}
+    {{ return(cast_expression(cast_function, column_name, target_type, alias_column_name)) }}
+{% endmacro %}
+
+{% macro duckdb__cast_column(column_name, target_type, alias_column_name=None) %}
+    {#
+        DuckDB's try_cast accepts any input type, and RAW read from CSV files is typed by auto-detection
+        (e.g., zip code prefixes come as integers), so try_cast is always used.
+    #}
+    {{ return(cast_expression("try_cast", column_name, target_type, alias_column_name)) }}
+{% endmacro %}
+
+{% macro cast_expression(cast_function, column_name, target_type, alias_column_name=None) %}
     {%- if alias_column_name is none -%}
-        {{ return("try_cast(" ~ column_name ~ " as " ~ target_type ~ ")") }}
+        {{ return(cast_function ~ "(" ~ column_name ~ " as " ~ target_type ~ ")") }}
     {%- else -%}
-        {{ return("try_cast(" ~ column_name ~ " as " ~ target_type ~ ") as " ~ alias_column_name) }}
+        {{ return(cast_function ~ "(" ~ column_name ~ " as " ~ target_type ~ ") as " ~ alias_column_name) }}
     {%- endif -%}
-{% endmacro %}
\ No newline at end of file
+{% endmacro %}
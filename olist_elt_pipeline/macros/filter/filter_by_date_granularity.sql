@@ -86,7 +86,7 @@
     {%- elif month is not none -%}
         {%- do conditions.append(date_dim_alias ~ ".month = " ~ month) -%}
         {%- if day is not none -%}
-            {%- do conditions.append(date_dim_alias ~ ".day_of_month = " ~ day) -%}
+            {%- do conditions.append(date_dim_alias ~ ".day = " ~ day) -%}
         {%- endif -%}
     {%- endif -%}
 
@@ -12,6 +12,11 @@
             SQL expression: CASE WHEN COUNT(*) OVER (PARTITION BY <column_name>) > 1 
                              THEN TRUE ELSE FALSE END AS <alias_name>
     #}
+    {{ return(adapter.dispatch('flag_duplicate_column')(column_name, alias_name)) }}
+{%- endmacro %}
+
+{% macro default__flag_duplicate_column(column_name, alias_name=None) -%}
+    {# Standard SQL, used by Snowflake and DuckDB. Add <adapter>__flag_duplicate_column to override. #}
 
     {%- set alias = (alias_name if alias_name is not none else 'is_duplicate_' ~ column_name) -%}
 
@@ -21,4 +26,4 @@
         ELSE FALSE
     END AS {{ alias }}
 
-{%- endmacro %}
\ No newline at end of file
+{%- endmacro %}
@@ -10,6 +10,11 @@
         Returns:
             SQL expression: CASE WHEN <column_name> IS NULL THEN TRUE ELSE FALSE END AS <alias_name>
     #}
+    {{ return(adapter.dispatch('flag_missing_column')(column_name, alias_name)) }}
+{%- endmacro %}
+
+{% macro default__flag_missing_column(column_name, alias_name=None) -%}
+    {# Standard SQL, used by Snowflake and DuckDB. Add <adapter>__flag_missing_column to override. #}
 
     {%- set alias = (alias_name if alias_name is not none else 'is_missing_' ~ column_name) -%}
 
@@ -19,4 +24,4 @@
         ELSE FALSE
     END AS {{ alias }}
 
-{%- endmacro %}
\ No newline at end of file
+{%- endmacro %}
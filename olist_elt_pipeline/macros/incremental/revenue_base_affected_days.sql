@@ -0,0 +1,37 @@
+{% macro revenue_base_affected_days(date_dim_alias='d') -%}
+    {#
+        🧠 Macro: revenue_base_affected_days
+        📌 Purpose:
+            Return a SELECT of the `date_day` values an incremental model has to (re)build.
+
+        🧪 Rules:
+        - ✅ Full build (first run / --full-refresh) → days of `dim_dates` matching the date vars (all days if none).
+        - ✅ Incremental run with date vars (year / quarter / month / day) → same days: a backfill window,
+             validated by `filter_by_date_granularity`. Days outside the window are kept.
+        - ✅ Incremental run without date vars → days of `int_revenue_base` rows inserted or changed
+             since the fact's `revenue_base_updated_at` watermark.
+
+        🧰 Usage in model:
+            affected_days AS (
+                {{ revenue_base_affected_days() }}
+            )
+    #}
+
+    {%- set has_date_vars = var('year', none) is not none
+        or var('quarter', none) is not none
+        or var('month', none) is not none
+        or var('day', none) is not none -%}
+
+    {%- if is_incremental() and not has_date_vars -%}
+        SELECT DISTINCT order_purchase_date AS date_day
+        FROM {{ ref('int_revenue_base') }}
+        WHERE revenue_base_updated_at > (
+            SELECT COALESCE(MAX(revenue_base_updated_at), CAST('1900-01-01' AS TIMESTAMP))
+            FROM {{ this }}
+        )
+    {%- else -%}
+        SELECT {{ date_dim_alias }}.date_day
+        FROM {{ ref('dim_dates') }} {{ date_dim_alias }}
+        {{ filter_by_date_granularity(date_dim_alias) }}
+    {%- endif -%}
+{%- endmacro %}
@@ -0,0 +1,209 @@
+{% macro revenue_base_rows(window_relation=none) -%}
+    {#
+        🧠 Macro: revenue_base_rows
+        📌 Purpose:
+            Return the item-level revenue rows of `int_revenue_base` (orders × items × payments) with their `row_hash`,
+            before the incremental anti-join. Shared by the model and the `revenue_base_matches_full_refresh` test.
+
+        🧪 Rules:
+        - ✅ window_relation = none → every order (full refresh).
+        - ✅ window_relation = a relation (the model's {{ this }}) → only orders purchased, approved, shipped or delivered
+             in the last `revenue_base_lookback_days` days, counted back from the latest purchase in that relation,
+             plus the orders of that relation whose status or payments (total, first type, installments) changed in staging.
+        - ⚠️ Orders, items or payments deleted from staging are not removed: run with --full-refresh.
+
+        🧰 Usage in model:
+            WITH hashed AS (
+                {{ revenue_base_rows(this if is_incremental() else none) }}
+            )
+    #}
+
+    {%- if window_relation is not none -%}
+        {%- set window_start -%}
+            SELECT {{ dbt.dateadd('day', -1 * var('revenue_base_lookback_days'), 'MAX(order_purchase_ts)') }}
+            FROM {{ window_relation }}
+        {%- endset -%}
+    {%- endif %}
+
+    -- Base CTEs from cleaned staging
+    WITH
+    {% if window_relation is not none %}
+    -- Order level fields of the loaded orders (the same on every item row of an order)
+    loaded_orders AS (
+        SELECT DISTINCT order_id, order_status, payment_type, payment_installments, payment_value
+        FROM {{ window_relation }}
+    ),
+
+    -- Payment fields of every staged order, as computed in base_order_payments below
+    staged_payments AS (
+        SELECT
+            order_id,
+            payment_type,
+            payment_installments,
+            SUM(payment_value) OVER(PARTITION BY order_id) AS payment_value,
+            ROW_NUMBER() OVER(PARTITION BY order_id ORDER BY payment_sequential) AS rn
+        FROM {{ ref('stg_order_payments') }}
+    ),
+
+    -- Loaded orders whose status or payments changed without a new timestamp (e.g., a cancellation or a payment
+    -- correction), whatever their age: a cheap order level comparison instead of hashing every item row
+    changed_orders AS (
+        SELECT l.order_id
+        FROM loaded_orders l
+        INNER JOIN {{ ref('stg_orders') }} o ON o.order_id = l.order_id
+        LEFT JOIN staged_payments p ON p.order_id = l.order_id AND p.rn = 1
+        WHERE o.order_status IS DISTINCT FROM l.order_status
+            OR p.payment_type IS DISTINCT FROM l.payment_type
+            OR p.payment_installments IS DISTINCT FROM l.payment_installments
+            OR p.payment_value IS DISTINCT FROM l.payment_value
+    ),
+    {% endif %}
+
+    base_orders AS (
+        SELECT
+            order_id,
+            customer_id,
+            order_status,
+            order_purchase_ts,
+            order_approved_ts,
+            order_delivered_carrier_ts,
+            order_delivered_customer_ts,
+            order_estimated_delivery_date,
+            is_missing_order_approved_ts,
+            is_missing_order_delivered_carrier_ts,
+            is_missing_order_delivered_customer_ts,
+            is_missing_order_estimated_delivery_date
+        FROM {{ ref('stg_orders') }}
+        {% if window_relation is not none %}
+        -- Orders purchased, approved, shipped or delivered inside the lookback window:
+        -- status and delivery changes land days to weeks after the purchase
+        WHERE order_purchase_ts >= ({{ window_start }})
+            OR order_approved_ts >= ({{ window_start }})
+            OR order_delivered_carrier_ts >= ({{ window_start }})
+            OR order_delivered_customer_ts >= ({{ window_start }})
+            -- ...and older orders whose status or payments changed
+            OR order_id IN (SELECT order_id FROM changed_orders)
+        {% endif %}
+    ),
+
+    base_order_items AS (
+        SELECT
+            order_id,
+            order_item_id,
+            product_id,
+            seller_id,
+            price,
+            freight_value,
+            is_duplicate_order_item_sk -- kept to trace if necessary
+        FROM {{ ref('stg_order_items') }}
+        {% if window_relation is not none %}
+        WHERE order_id IN (SELECT order_id FROM base_orders)
+        {% endif %}
+    ),
+
+    -- Payments of the orders being processed only
+    base_payments AS (
+        SELECT
+            order_id,
+            payment_sequential,
+            payment_type,
+            payment_installments,
+            payment_value
+        FROM {{ ref('stg_order_payments') }}
+        {% if window_relation is not none %}
+        WHERE order_id IN (SELECT order_id FROM base_orders)
+        {% endif %}
+    ),
+
+    -- Aggregate total payment value per order to avoid duplication when joining 
+    base_payment_agg AS (
+        SELECT
+            order_id,
+            SUM(payment_value) AS payment_value
+        FROM base_payments
+        GROUP BY order_id
+    ),
+
+    -- Select the first payment row per order to get payment_type and installments
+    base_payment_first AS (
+        SELECT
+            order_id,
+            payment_type,
+            payment_installments,
+            ROW_NUMBER() OVER(PARTITION BY order_id ORDER BY payment_sequential) AS rn
+        FROM base_payments
+    ),
+
+    -- Final payment CTE combining total value and descriptive fields
+    base_order_payments AS (
+        SELECT
+            pf.order_id,
+            pf.payment_type,
+            pf.payment_installments,
+            pa.payment_value
+        FROM base_payment_first pf
+        INNER JOIN base_payment_agg pa ON pf.order_id = pa.order_id
+        WHERE pf.rn = 1
+    ),
+
+    revenue_rows AS (
+        SELECT
+            o.order_id,
+            o.customer_id,
+            oi.order_item_id,
+            oi.product_id,
+            oi.seller_id,
+
+            -- Order information
+            o.order_status,
+            o.order_purchase_ts,
+            o.order_approved_ts,
+            o.order_delivered_carrier_ts,
+            o.order_delivered_customer_ts,
+            o.order_estimated_delivery_date,
+            CAST(o.order_purchase_ts AS DATE) AS order_purchase_date,
+
+            -- Payment information
+            p.payment_type,
+            p.payment_installments,
+            p.payment_value,
+
+            -- Price information
+            oi.price,
+            oi.freight_value,
+            -- Total revenue logic:
+            -- If order has payment_value (actual paid), use it.
+            -- Else, fallback to listed price + freight_value (approx revenue).
+            -- Helps preserve orders paid via 100% voucher or missing payment record.
+            COALESCE(p.payment_value, oi.price + oi.freight_value) AS total_revenue,
+
+            -- Flag information (reused from staging)
+            o.is_missing_order_approved_ts,
+            o.is_missing_order_delivered_carrier_ts,
+            o.is_missing_order_delivered_customer_ts,
+            o.is_missing_order_estimated_delivery_date,
+
+            -- Trace
+            oi.is_duplicate_order_item_sk
+        FROM base_orders o
+        -- We ensure only orders with value items are included in the mart
+        INNER JOIN base_order_items oi ON o.order_id = oi.order_id
+        -- Some orders may have missing payment records.
+        -- We fallback to price + freight_value in total_revenue, so we preserve such rows for completeness.
+        INNER JOIN base_order_payments p ON o.order_id = p.order_id
+    ),
+
+    -- Fingerprint of the fields that can change after purchase, used to skip unchanged rows
+    hashed_rows AS (
+        SELECT
+            *,
+            {{ dbt_utils.generate_surrogate_key([
+                'order_status', 'order_purchase_ts', 'order_approved_ts', 'order_delivered_carrier_ts', 'order_delivered_customer_ts',
+                'order_estimated_delivery_date', 'payment_type', 'payment_installments', 'payment_value',
+                'price', 'freight_value', 'product_id', 'seller_id'
+            ]) }} AS row_hash
+        FROM revenue_rows
+    )
+
+    SELECT * FROM hashed_rows
+{%- endmacro %}
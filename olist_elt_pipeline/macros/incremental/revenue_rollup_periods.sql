@@ -0,0 +1,73 @@
+{% macro revenue_rollup_time_grains() -%}
+    {#
+        Time grains precomputed by `fct_revenue_rollup`, finest first.
+    #}
+    {{ return(['day', 'week', 'month', 'quarter', 'year']) }}
+{%- endmacro %}
+
+{% macro rollup_period_start(time_grain, date_column) -%}
+    {#
+        🧠 Macro: rollup_period_start
+        📌 Purpose:
+            First day of the `time_grain` period containing `date_column`, as a DATE.
+            Weeks start on Monday (ISO weeks, same as `dim_dates.week`).
+
+        🧰 Usage in model:
+            {{ rollup_period_start('month', 'd.date_day') }} AS month_start
+    #}
+    {%- if time_grain == 'day' -%}
+        {{ date_column }}
+    {%- else -%}
+        CAST({{ dbt.date_trunc(time_grain, date_column) }} AS DATE)
+    {%- endif -%}
+{%- endmacro %}
+
+{% macro revenue_rollup_affected_periods() -%}
+    {#
+        🧠 Macro: revenue_rollup_affected_periods
+        📌 Purpose:
+            Return a SELECT of the (time_grain, period_start) pairs `fct_revenue_rollup` has to (re)build:
+            every period, at every time grain, containing a day of `revenue_base_affected_days()`.
+
+        🧰 Usage in model:
+            affected_periods AS (
+                {{ revenue_rollup_affected_periods() }}
+            )
+    #}
+    WITH affected_days AS (
+        {{ revenue_base_affected_days() }}
+    )
+    {% for time_grain in revenue_rollup_time_grains() %}
+    SELECT DISTINCT
+        '{{ time_grain }}' AS time_grain,
+        {{ rollup_period_start(time_grain, 'date_day') }} AS period_start
+    FROM affected_days
+    {% if not loop.last %}UNION ALL{% endif %}
+    {% endfor %}
+{%- endmacro %}
+
+{% macro delete_affected_periods(relation) -%}
+    {#
+        DELETE of the affected periods from `relation` (the built `fct_revenue_rollup`).
+        delete+insert alone only replaces periods that still have rows, so a period whose orders were all
+        canceled since the last run would otherwise keep its old figures.
+    #}
+    DELETE FROM {{ relation }}
+    WHERE
+    {%- for time_grain in revenue_rollup_time_grains() %}
+        {% if not loop.first %}OR {% endif %}(time_grain = '{{ time_grain }}' AND period_start IN (
+            SELECT {{ rollup_period_start(time_grain, 'a.date_day') }} FROM ({{ revenue_base_affected_days() }}) a
+        ))
+    {%- endfor %}
+{%- endmacro %}
+
+{% macro get_incremental_rollup_periods_sql(arg_dict) -%}
+    {#
+        🧠 Incremental strategy 'rollup_periods' of `fct_revenue_rollup`: delete the affected periods, then delete+insert.
+        📌 Runs once the new rows are built, in the same step as the delete+insert: the affected periods are read from
+            the untouched model (same `revenue_base_updated_at` watermark as the model body), and a failed build
+            deletes nothing.
+    #}
+    {{ delete_affected_periods(arg_dict['target_relation']) }};
+    {{ get_incremental_delete_insert_sql(arg_dict) }}
+{%- endmacro %}
@@ -0,0 +1,38 @@
+{% test revenue_base_matches_full_refresh(model) -%}
+    {#
+        🧠 Test: revenue_base_matches_full_refresh
+        📌 Purpose:
+            Compare the incremental `int_revenue_base` with the rows a full refresh would build from staging.
+
+        🧪 Rules (one failing row per difference):
+        - ❌ missing_in_model → row of the full refresh not loaded (new item never picked up).
+        - ❌ stale_in_model   → row loaded with another fingerprint (status / timestamps / payment update missed).
+        - ❌ extra_in_model   → row loaded whose order / item / payment is gone from staging.
+    #}
+
+    WITH full_refresh AS (
+        SELECT order_id, order_item_id, row_hash
+        FROM ({{ revenue_base_rows() }}) rows_full
+    ),
+
+    incremental AS (
+        SELECT order_id, order_item_id, row_hash
+        FROM {{ model }}
+    )
+
+    SELECT
+        COALESCE(f.order_id, i.order_id) AS order_id,
+        COALESCE(f.order_item_id, i.order_item_id) AS order_item_id,
+        CASE
+            WHEN i.order_id IS NULL THEN 'missing_in_model'
+            WHEN f.order_id IS NULL THEN 'extra_in_model'
+            ELSE 'stale_in_model'
+        END AS difference
+    FROM full_refresh f
+    FULL OUTER JOIN incremental i
+        ON f.order_id = i.order_id
+        AND f.order_item_id = i.order_item_id
+    WHERE i.order_id IS NULL
+        OR f.order_id IS NULL
+        OR f.row_hash <> i.row_hash
+{%- endtest %}
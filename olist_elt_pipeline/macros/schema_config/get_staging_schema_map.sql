@@ -2,6 +2,8 @@
    {# This macro returns a dictionary mapping table names to their respective schemas.
       Each key is a table name, and the value is a dictionary of column names and their types.
       The types can be simple strings or dictionaries with 'type' and 'alias' keys for more complex types.
+      Note: This dictionary is also read by extract_load/utils/schema_registry.py to build the typed Spark read schemas,
+            so keep it a plain literal (no Jinja expressions) and keep the columns in the same order as the CSV header.
     #}
    {% set schema_dict = {
        'customers': {
@@ -12,6 +14,14 @@
            "customer_state": "varchar"
        },
 
+       'geolocation': {
+           "geolocation_zip_code_prefix": "varchar",
+           "geolocation_lat": "float",
+           "geolocation_lng": "float",
+           "geolocation_city": "varchar",
+           "geolocation_state": "varchar"
+       },
+
        'order_items': {
            "order_id": "varchar",
            "order_item_id": "int",
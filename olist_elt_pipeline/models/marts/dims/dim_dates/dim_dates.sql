@@ -0,0 +1,115 @@
+{{
+    config(
+        materialized='incremental',
+        incremental_strategy='delete+insert',
+        unique_key='date_day',
+        on_schema_change='append_new_columns',
+        alias='dim_dates',
+    )
+}}
+
+{#-
+    Calendar range to build:
+    - ✅ Full build (first run / --full-refresh) → calendar_start_date up to the latest order date + calendar_horizon_days.
+    - 🔁 Incremental → only the days after the latest date already in the table,
+      so the calendar grows with the orders and is never rebuilt.
+    The bounds are read before the model's SQL is rendered: the spine has a fixed number of rows.
+-#}
+{%- set calendar_start = var('calendar_start_date') -%}
+{%- set bounds_query -%}
+    SELECT
+        start_date,
+        {{ dbt.datediff('start_date', 'end_date', 'day') }} + 1 AS days
+    FROM (
+        SELECT
+            {% if is_incremental() -%}
+            COALESCE(
+                (SELECT CAST({{ dbt.dateadd('day', 1, 'MAX(date_day)') }} AS DATE) FROM {{ this }}),
+                CAST('{{ calendar_start }}' AS DATE)
+            )
+            {%- else -%}
+            CAST('{{ calendar_start }}' AS DATE)
+            {%- endif %} AS start_date,
+            CAST({{ dbt.dateadd('day', var('calendar_horizon_days'), 'MAX(CAST(order_purchase_ts AS DATE))') }} AS DATE) AS end_date
+        FROM {{ ref('stg_orders') }}
+    ) bounds
+{%- endset -%}
+
+{%- set start_date, days = calendar_start, 0 -%}
+{%- if execute -%}
+    {%- set bounds = run_query(bounds_query).rows[0] -%}
+    {%- set start_date = bounds[0] | string -%}
+    {%- set days = bounds[1] | int -%}
+{%- endif -%}
+{%- set fiscal_start = var('fiscal_year_start_month') | int -%}
+
+WITH spine AS (
+    SELECT
+        CAST({{ dbt.dateadd('day', 'generated_number - 1', "CAST('" ~ start_date ~ "' AS DATE)") }} AS DATE) AS date_day
+    FROM ({{ dbt_utils.generate_series([days, 1] | max) }}) series
+    WHERE generated_number <= {{ days }} -- Nothing to add when the calendar is already ahead of the orders
+),
+
+years AS (
+    SELECT DISTINCT CAST(EXTRACT(year FROM date_day) AS INTEGER) AS year
+    FROM spine
+),
+
+holidays AS (
+    {{ brazilian_holidays('years') }}
+),
+
+-- Every attribute is derived from date_day in this one pass
+date_parts AS (
+    SELECT
+        s.date_day,
+        CAST(EXTRACT(year FROM s.date_day) AS INTEGER) AS year,
+        CAST(EXTRACT(month FROM s.date_day) AS INTEGER) AS month,
+        CAST(EXTRACT(day FROM s.date_day) AS INTEGER) AS day,
+        CAST({{ iso_day_of_week('s.date_day') }} AS INTEGER) - 1 AS day_of_week,
+        CAST({{ iso_week('s.date_day') }} AS INTEGER) AS week,
+        CAST({{ iso_year('s.date_day') }} AS INTEGER) AS iso_year,
+        CAST(EXTRACT(quarter FROM s.date_day) AS INTEGER) AS quarter,
+        CAST({{ dbt.date_trunc('quarter', 's.date_day') }} AS DATE) AS quarter_start_date,
+        CAST(EXTRACT(day FROM {{ dbt.dateadd('day', 1, 's.date_day') }}) AS INTEGER) = 1 AS is_month_end,
+        h.holiday_name,
+        COALESCE(h.is_national_holiday, FALSE) AS is_national_holiday,
+        h.holiday_date IS NOT NULL AS is_holiday
+    FROM spine s
+    LEFT JOIN holidays h ON s.date_day = h.holiday_date
+)
+
+SELECT
+    date_day,
+    year,
+    month,
+    day,
+    day_of_week,
+    CASE day_of_week
+        WHEN 0 THEN 'Monday'
+        WHEN 1 THEN 'Tuesday'
+        WHEN 2 THEN 'Wednesday'
+        WHEN 3 THEN 'Thursday'
+        WHEN 4 THEN 'Friday'
+        WHEN 5 THEN 'Saturday'
+        ELSE 'Sunday'
+    END AS day_name,
+    week,
+    quarter,
+    day_of_week >= 5 AS is_weekend,
+    day = 1 AS is_month_start,
+    is_month_end,
+    day = 1 AND month IN (1, 4, 7, 10) AS is_quarter_start,
+    is_month_end AND month IN (3, 6, 9, 12) AS is_quarter_end,
+    iso_year,
+    quarter_start_date,
+    CAST({{ dbt.dateadd('day', -1, dbt.dateadd('month', 3, 'quarter_start_date')) }} AS DATE) AS quarter_end_date,
+    holiday_name,
+    is_holiday,
+    is_national_holiday,
+    day_of_week < 5 AND NOT is_holiday AS is_business_day,
+    -- Fiscal year named after the calendar year it ends in (fiscal_year_start_month = 1: fiscal = calendar year)
+    year + CASE WHEN {{ fiscal_start }} > 1 AND month >= {{ fiscal_start }} THEN 1 ELSE 0 END AS fiscal_year,
+    CAST(FLOOR(MOD(month - {{ fiscal_start }} + 12, 12) / 3) AS INTEGER) + 1 AS fiscal_quarter,
+    MOD(month - {{ fiscal_start }} + 12, 12) + 1 AS fiscal_month
+FROM date_parts
@@ -1,40 +1,21 @@
 {{ 
     config(
-        materialized='table',
+        materialized='view',
         alias='fct_daily_revenue'
     )
 }}
 
-WITH revenue_base AS (
-    SELECT
-        order_id,
-        order_purchase_date,
-        total_revenue
-    FROM {{ ref('int_revenue_base') }}
-    WHERE order_status IN ('delivered', 'shipped')
-),
-
--- Join with dim_dates to support flexible time filtering (day, month, quarter, year)
-joined_with_dates AS (
-    SELECT
-        d.date_day,
-        d.year,
-        d.month,
-        d.quarter,
-        r.order_id,
-        r.total_revenue
-    FROM revenue_base r
-    INNER JOIN {{ ref('dim_dates') }} d ON r.order_purchase_date = d.date_day
-    {{ filter_by_date_granularity('d') }}
-)
-
+-- Thin view over the revenue rollup: day grain, no dimension, delivered / shipped orders
 SELECT
-    date_day,
+    period_start AS date_day,
     year,
     month,
     quarter,
-    COUNT(DISTINCT order_id) AS total_orders,
-    SUM(total_revenue) AS total_revenue
-FROM joined_with_dates
-GROUP BY date_day, year, month, quarter
-ORDER BY date_day
\ No newline at end of file
+    total_orders,
+    total_revenue,
+    revenue_base_updated_at
+FROM {{ ref('fct_revenue_rollup') }}
+WHERE time_grain = 'day'
+    AND rollup_dimension = 'total'
+    AND is_revenue_order
+ORDER BY date_day
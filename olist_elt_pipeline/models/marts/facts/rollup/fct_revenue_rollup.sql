@@ -0,0 +1,215 @@
+{{
+    config(
+        materialized='incremental',
+        incremental_strategy='rollup_periods',
+        unique_key=['time_grain', 'period_start'],
+        on_schema_change='append_new_columns',
+        alias='fct_revenue_rollup'
+    )
+}}
+
+{#
+    One GROUP BY GROUPING SETS pass over the revenue base builds the aggregates the dashboards read:
+    each time grain (day, week, month, quarter) x each dimension (none, customer state, payment type,
+    product category, order status), plus product level rows at day grain.
+    Distinct customers are not additive, so day to quarter grains are computed from the rows, never summed from the days.
+    Only the rows of the affected weeks and quarters are read (they contain every affected day and month).
+    Incremental strategy 'rollup_periods' (macros/incremental/revenue_rollup_periods.sql): the affected periods are
+    deleted, with the delete+insert, only once these rows are built.
+    The year grain is rolled up from the month rows (the rebuilt ones and the stored ones of the other months):
+    orders, items and revenue add up across months (an order has one purchase date), distinct customers do not
+    and are left NULL at year grain.
+    `is_revenue_order` (delivered / shipped) is part of every grouping set so the revenue facts get exact
+    distinct counts over both statuses.
+#}
+
+{%- set time_grain_columns = {
+    'day': ['date_day', 'year', 'quarter', 'month'],
+    'week': ['week_start', 'week'],
+    'month': ['month_start', 'year', 'quarter', 'month'],
+    'quarter': ['quarter_start', 'year', 'quarter']
+} -%}
+
+{%- set dimension_columns = {
+    'total': [],
+    'customer_state': ['customer_state'],
+    'payment_type': ['payment_type'],
+    'product_category': ['product_category_name_english'],
+    'order_status': ['order_status']
+} -%}
+
+{#- Columns of the rollup rows, in order -#}
+{%- set rollup_columns = [
+    'time_grain', 'period_start', 'rollup_dimension', 'year', 'quarter', 'month', 'week', 'is_revenue_order',
+    'customer_state', 'payment_type', 'order_status', 'product_id', 'product_category_name', 'product_category_name_english',
+    'total_orders', 'total_customers', 'total_items', 'total_revenue', 'revenue_base_updated_at'
+] -%}
+
+{%- set grouping_sets = [] -%}
+{%- for time_grain in revenue_rollup_time_grains() if time_grain != 'year' -%}
+    {%- for dimension, columns in dimension_columns.items() -%}
+        {%- do grouping_sets.append(time_grain_columns[time_grain] + columns) -%}
+    {%- endfor -%}
+{%- endfor -%}
+{#- Product level rows are only kept at day grain, coarser product figures can be summed from them -#}
+{%- do grouping_sets.append(time_grain_columns['day'] + ['product_id', 'product_category_name', 'product_category_name_english']) %}
+
+-- Periods to (re)build: every period containing a day with new / changed revenue base rows
+WITH affected_periods AS (
+    {{ revenue_rollup_affected_periods() }}
+),
+
+-- Rows of the affected weeks and quarters only: they hold every day of the affected days, weeks, months and quarters
+revenue_base AS (
+    SELECT
+        order_id,
+        customer_id,
+        product_id,
+        order_status,
+        payment_type,
+        order_purchase_date,
+        total_revenue,
+        revenue_base_updated_at
+    FROM {{ ref('int_revenue_base') }}
+    WHERE {{ rollup_period_start('quarter', 'order_purchase_date') }} IN (
+            SELECT period_start FROM affected_periods WHERE time_grain = 'quarter'
+        )
+        OR {{ rollup_period_start('week', 'order_purchase_date') }} IN (
+            SELECT period_start FROM affected_periods WHERE time_grain = 'week'
+        )
+),
+
+enriched AS (
+    SELECT
+        r.order_id,
+        r.total_revenue,
+        r.revenue_base_updated_at,
+        r.order_status IN ('delivered', 'shipped') AS is_revenue_order,
+
+        -- Dimensions
+        l.customer_unique_id,
+        l.customer_state,
+        r.payment_type,
+        r.order_status,
+        r.product_id,
+        p.product_category_name,
+        p.product_category_name_english,
+
+        -- Time grains, keyed through dim_dates
+        d.date_day,
+        d.year,
+        d.quarter,
+        d.month,
+        d.week,
+        {{ rollup_period_start('week', 'd.date_day') }} AS week_start,
+        {{ rollup_period_start('month', 'd.date_day') }} AS month_start,
+        {{ rollup_period_start('quarter', 'd.date_day') }} AS quarter_start
+    FROM revenue_base r
+    INNER JOIN {{ ref('dim_dates') }} d ON r.order_purchase_date = d.date_day
+    -- Left join: every other grouping keeps the orders of customers without a location (by-state rows drop them below)
+    LEFT JOIN {{ ref('dim_customer_location') }} l ON r.customer_id = l.customer_id
+    LEFT JOIN {{ ref('dim_product_details') }} p ON r.product_id = p.product_id
+),
+
+rolled_up AS (
+    SELECT
+        CASE
+            WHEN GROUPING(date_day) = 0 THEN 'day'
+            WHEN GROUPING(week_start) = 0 THEN 'week'
+            WHEN GROUPING(month_start) = 0 THEN 'month'
+            ELSE 'quarter'
+        END AS time_grain,
+        COALESCE(date_day, week_start, month_start, quarter_start) AS period_start,
+        CASE
+            WHEN GROUPING(product_id) = 0 THEN 'product'
+            WHEN GROUPING(customer_state) = 0 THEN 'customer_state'
+            WHEN GROUPING(payment_type) = 0 THEN 'payment_type'
+            WHEN GROUPING(product_category_name_english) = 0 THEN 'product_category'
+            WHEN GROUPING(order_status) = 0 THEN 'order_status'
+            ELSE 'total'
+        END AS rollup_dimension,
+        year,
+        quarter,
+        month,
+        week,
+        is_revenue_order,
+        customer_state,
+        payment_type,
+        order_status,
+        product_id,
+        product_category_name,
+        product_category_name_english,
+        COUNT(DISTINCT order_id) AS total_orders,
+        COUNT(DISTINCT customer_unique_id) AS total_customers,
+        COUNT(*) AS total_items,
+        SUM(total_revenue) AS total_revenue,
+        MAX(revenue_base_updated_at) AS revenue_base_updated_at -- Watermark of the next incremental run
+    FROM enriched
+    GROUP BY GROUPING SETS (
+        {%- for grouping_set in grouping_sets %}
+        (is_revenue_order, {{ grouping_set | join(', ') }}){% if not loop.last %},{% endif %}
+        {%- endfor %}
+    )
+    -- By-state rows keep the inner join semantics of the state facts: customers without a location are not a state
+    HAVING NOT (GROUPING(customer_state) = 0 AND customer_state IS NULL)
+),
+
+-- Keep the affected periods only, the other periods of the affected weeks and quarters are already up to date
+rebuilt AS (
+    SELECT r.*
+    FROM rolled_up r
+    INNER JOIN affected_periods a
+        ON r.time_grain = a.time_grain
+        AND r.period_start = a.period_start
+),
+
+-- Every month of the affected years: the rebuilt months, plus the stored ones of the other months
+year_months AS (
+    SELECT * FROM rebuilt WHERE time_grain = 'month'
+    {% if is_incremental() %}
+    UNION ALL
+    SELECT
+        {%- for column in rollup_columns %}
+        {{ column }}{% if not loop.last %},{% endif %}
+        {%- endfor %}
+    FROM {{ this }}
+    WHERE time_grain = 'month'
+        AND {{ rollup_period_start('year', 'period_start') }} IN (
+            SELECT period_start FROM affected_periods WHERE time_grain = 'year'
+        )
+        AND period_start NOT IN (
+            SELECT period_start FROM affected_periods WHERE time_grain = 'month'
+        )
+    {% endif %}
+),
+
+rolled_up_years AS (
+    SELECT
+        'year' AS time_grain,
+        {{ rollup_period_start('year', 'period_start') }} AS period_start,
+        rollup_dimension,
+        year,
+        CAST(NULL AS {{ dbt.type_int() }}) AS quarter,
+        CAST(NULL AS {{ dbt.type_int() }}) AS month,
+        CAST(NULL AS {{ dbt.type_int() }}) AS week,
+        is_revenue_order,
+        customer_state,
+        payment_type,
+        order_status,
+        product_id,
+        product_category_name,
+        product_category_name_english,
+        SUM(total_orders) AS total_orders,
+        CAST(NULL AS {{ dbt.type_bigint() }}) AS total_customers, -- Not additive across months
+        SUM(total_items) AS total_items,
+        SUM(total_revenue) AS total_revenue,
+        MAX(revenue_base_updated_at) AS revenue_base_updated_at
+    FROM year_months
+    GROUP BY
+        {{ rollup_period_start('year', 'period_start') }}, rollup_dimension, year, is_revenue_order,
+        customer_state, payment_type, order_status, product_id, product_category_name, product_category_name_english
+)
+
+SELECT * FROM rebuilt
+UNION ALL
+SELECT * FROM rolled_up_years
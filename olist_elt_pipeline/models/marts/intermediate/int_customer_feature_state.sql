@@ -0,0 +1,70 @@
+{{
+    config(
+        materialized='incremental',
+        -- merge on Snowflake, delete+insert on DuckDB (local target) which has no MERGE support in dbt-duckdb
+        incremental_strategy=('delete+insert' if target.type == 'duckdb' else 'merge'),
+        unique_key='customer_unique_id',
+        on_schema_change='append_new_columns',
+        alias='int_customer_feature_state'
+    )
+}}
+
+{#
+    Running purchase state per real customer (customer_unique_id), the input of fct_customer_features_ml.
+    Incremental run: only customers with int_revenue_base rows inserted or changed since the last run
+    (revenue_base_updated_at watermark) are re-aggregated and merged, the others are kept as is.
+    Re-aggregating the affected customers (instead of adding deltas) keeps distinct counts exact
+    and handles orders whose status changed.
+#}
+
+WITH customers AS (
+    SELECT
+        customer_id,
+        customer_unique_id
+    FROM {{ ref('dim_customer_location') }}
+),
+
+{% if is_incremental() %}
+-- Customers touched by new or changed orders (any status, a cancellation must also update the state)
+affected_customers AS (
+    SELECT DISTINCT c.customer_unique_id
+    FROM {{ ref('int_revenue_base') }} r
+    INNER JOIN customers c ON r.customer_id = c.customer_id
+    WHERE r.revenue_base_updated_at > (
+        SELECT COALESCE(MAX(revenue_base_updated_at), CAST('1900-01-01' AS TIMESTAMP))
+        FROM {{ this }}
+    )
+),
+{% endif %}
+
+revenue_base AS (
+    SELECT
+        r.customer_id,
+        c.customer_unique_id,
+        r.order_id,
+        r.order_status,
+        r.order_purchase_date,
+        r.total_revenue,
+        r.revenue_base_updated_at
+    FROM {{ ref('int_revenue_base') }} r
+    INNER JOIN customers c ON r.customer_id = c.customer_id
+    {% if is_incremental() %}
+    WHERE c.customer_unique_id IN (SELECT customer_unique_id FROM affected_customers)
+    {% endif %}
+)
+
+-- Customers whose orders are no longer delivered / shipped keep a row with total_orders = 0
+-- (filtered out by fct_customer_features_ml), so the merge overwrites their previous state
+SELECT
+    customer_unique_id,
+    MIN(CASE WHEN order_status IN ('delivered', 'shipped') THEN order_purchase_date END) AS first_purchase_date,
+    MAX(CASE WHEN order_status IN ('delivered', 'shipped') THEN order_purchase_date END) AS last_purchase_date,
+    COUNT(DISTINCT CASE WHEN order_status IN ('delivered', 'shipped') THEN order_id END) AS total_orders,
+    COUNT(DISTINCT CASE WHEN order_status IN ('delivered', 'shipped') THEN customer_id END) AS total_accounts,
+    COALESCE(SUM(CASE WHEN order_status IN ('delivered', 'shipped') THEN total_revenue END), 0) AS total_revenue,
+    -- Item rows behind total_revenue, keeps avg_revenue_per_order = total_revenue / revenue_rows
+    COUNT(CASE WHEN order_status IN ('delivered', 'shipped') THEN total_revenue END) AS revenue_rows,
+    -- Watermark of the next incremental run
+    MAX(revenue_base_updated_at) AS revenue_base_updated_at
+FROM revenue_base
+GROUP BY customer_unique_id
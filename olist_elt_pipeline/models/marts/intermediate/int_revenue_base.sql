@@ -1,112 +1,38 @@
 {{
     config(
-        materialized='table',
+        materialized='incremental',
+        -- merge on Snowflake, delete+insert on DuckDB (local target) which has no MERGE support in dbt-duckdb
+        incremental_strategy=('delete+insert' if target.type == 'duckdb' else 'merge'),
+        unique_key=['order_id', 'order_item_id'],
+        on_schema_change='append_new_columns',
         alias='int_revenue_base'
     )
 }}
 
--- Base CTEs from cleaned staging
-WITH base_orders AS (
-    SELECT
-        order_id,
-        customer_id,
-        order_status,
-        order_purchase_ts,
-        order_approved_ts,
-        order_delivered_carrier_ts,
-        order_delivered_customer_ts,
-        order_estimated_delivery_date,
-        is_missing_order_approved_ts,
-        is_missing_order_delivered_carrier_ts,
-        is_missing_order_delivered_customer_ts,
-        is_missing_order_estimated_delivery_date
-    FROM {{ ref('stg_orders') }}
-),
-
-base_order_items AS (
-    SELECT
-        order_id,
-        order_item_id,
-        product_id,
-        seller_id,
-        price,
-        freight_value,
-        is_duplicate_order_item_sk -- kept to trace if necessary
-    FROM {{ ref('stg_order_items') }}
-),
-
--- Aggregate total payment value per order to avoid duplication when joining 
-base_payment_agg AS (
-    SELECT
-        order_id,
-        SUM(payment_value) AS payment_value
-    FROM {{ ref('stg_order_payments') }}
-    GROUP BY order_id
-),
-
--- Select the first payment row per order to get payment_type and installments
-base_payment_first AS (
-    SELECT
-        order_id,
-        payment_type,
-        payment_installments,
-        ROW_NUMBER() OVER(PARTITION BY order_id ORDER BY payment_sequential) AS rn
-    FROM {{ ref('stg_order_payments') }}
-),
-
--- Final payment CTE combining total value and descriptive fields
-base_order_payments AS (
-    SELECT
-        pf.order_id,
-        pf.payment_type,
-        pf.payment_installments,
-        pa.payment_value
-    FROM base_payment_first pf
-    INNER JOIN base_payment_agg pa ON pf.order_id = pa.order_id
-    WHERE pf.rn = 1
+{#
+    Incremental run: only orders purchased, approved, shipped or delivered inside the lookback window are reprocessed
+    (var `revenue_base_lookback_days`, counted back from the latest order already loaded), plus older loaded orders
+    whose status or payments changed in staging, and only rows that are new or whose status / timestamps / payments
+    changed are merged.
+    Rows deleted from staging (orders, items, payments) are never removed incrementally: run with --full-refresh.
+    Backfill or logic change: dbt run --select int_revenue_base --full-refresh
+#}
+
+-- Item-level rows with the fingerprint of the fields that can change after purchase (macros/incremental/revenue_base_rows.sql)
+WITH hashed AS (
+    {{ revenue_base_rows(this if is_incremental() else none) }}
 )
 
 SELECT
-    o.order_id,
-    o.customer_id,
-    oi.order_item_id,
-    oi.product_id,
-    oi.seller_id,
-
-    -- Order information
-    o.order_status,
-    o.order_purchase_ts,
-    o.order_approved_ts,
-    o.order_delivered_carrier_ts,
-    o.order_delivered_customer_ts,
-    o.order_estimated_delivery_date,
-    DATE(o.order_purchase_ts) AS order_purchase_date,
-
-    -- Payment information
-    p.payment_type,
-    p.payment_installments,
-    p.payment_value,
-
-    -- Price information
-    oi.price,
-    oi.freight_value,
-    -- Total revenue logic:
-    -- If order has payment_value (actual paid), use it.
-    -- Else, fallback to listed price + freight_value (approx revenue).
-    -- Helps preserve orders paid via 100% voucher or missing payment record.
-    COALESCE(p.payment_value, oi.price + oi.freight_value) AS total_revenue,
-
-    -- Flag information (reused from staging)
-    o.is_missing_order_approved_ts,
-    o.is_missing_order_delivered_carrier_ts,
-    o.is_missing_order_delivered_customer_ts,
-    o.is_missing_order_estimated_delivery_date,
-
-    -- Trace
-    oi.is_duplicate_order_item_sk
-FROM base_orders o
--- We ensure only orders with value items are included in the mart
-INNER JOIN base_order_items oi ON o.order_id = oi.order_id
--- Some orders may have missing payment records.
--- We fallback to price + freight_value in total_revenue, so we preserve such rows for completeness.
-INNER JOIN base_order_payments p ON o.order_id = p.order_id
+    h.*,
+    -- When the row was last inserted / changed, used by downstream incremental facts
+    {{ dbt.current_timestamp() }} AS revenue_base_updated_at
+FROM hashed h
+{% if is_incremental() %}
+-- Anti-join: drop rows already loaded with the same fingerprint
+LEFT JOIN {{ this }} t
+    ON t.order_id = h.order_id
+    AND t.order_item_id = h.order_item_id
+    AND t.row_hash = h.row_hash
+WHERE t.order_id IS NULL
+{% endif %}
@@ -0,0 +1,14 @@
+{{
+    config(
+        materialized='table',
+        alias='base_customer_keys'
+    )
+}}
+
+-- Deduplicated customer_id values of the raw `customers` table, built once per run.
+-- Staging models check their foreign keys with a semi-join against this table
+-- instead of probing the raw table with a correlated EXISTS per row.
+SELECT DISTINCT
+    customer_id
+FROM {{ source('raw', 'customers') }}
+WHERE customer_id IS NOT NULL
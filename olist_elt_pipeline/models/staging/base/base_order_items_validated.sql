@@ -0,0 +1,41 @@
+{{
+    config(
+        materialized='table',
+        alias='base_order_items_validated'
+    )
+}}
+
+-- Normalize columns
+WITH casted AS (
+    SELECT
+        {{ cast_columns_from_schema(get_staging_schema_map('order_items')) }}
+    FROM {{ source('raw', 'order_items') }}
+)
+
+-- Every raw row with the first failed check (NULL = valid).
+-- stg_order_items keeps the valid rows, stg_rejected_rows reports the others.
+SELECT
+    casted.*,
+    CASE
+        WHEN casted.order_id IS NULL THEN 'missing_order_id'
+        /* Trash order_id not exist in the parent table */
+        WHEN o.order_id IS NULL THEN 'unknown_order_id'
+        WHEN casted.order_item_id IS NULL THEN 'missing_order_item_id'
+        WHEN casted.order_item_id < 1 THEN 'invalid_order_item_id' -- Ensure order_item_id at least 1
+        WHEN casted.product_id IS NULL THEN 'missing_product_id'
+        /* Trash product_id not exist in the parent table */
+        WHEN p.product_id IS NULL THEN 'unknown_product_id'
+        WHEN casted.seller_id IS NULL THEN 'missing_seller_id'
+        /* Trash seller_id not exist in the parent table */
+        WHEN s.seller_id IS NULL THEN 'unknown_seller_id'
+        WHEN casted.shipping_limit_ts IS NULL THEN 'missing_shipping_limit_ts'
+        WHEN casted.price IS NULL THEN 'missing_price'
+        WHEN casted.price <= 0.00 THEN 'invalid_price' -- Ensure price is greater than 0
+        WHEN casted.freight_value IS NULL THEN 'missing_freight_value'
+        WHEN casted.freight_value < 0.00 THEN 'invalid_freight_value' -- Ensure freight_value is non-negative
+    END AS rejection_reason
+FROM casted
+-- Semi-joins: the key tables are deduplicated, so the LEFT JOINs never multiply rows
+LEFT JOIN {{ ref('base_order_keys') }} o ON o.order_id = casted.order_id
+LEFT JOIN {{ ref('base_product_keys') }} p ON p.product_id = casted.product_id
+LEFT JOIN {{ ref('base_seller_keys') }} s ON s.seller_id = casted.seller_id
@@ -0,0 +1,14 @@
+{{
+    config(
+        materialized='table',
+        alias='base_order_keys'
+    )
+}}
+
+-- Deduplicated order_id values of the raw `orders` table, built once per run.
+-- Staging models check their foreign keys with a semi-join against this table
+-- instead of probing the raw table with a correlated EXISTS per row.
+SELECT DISTINCT
+    order_id
+FROM {{ source('raw', 'orders') }}
+WHERE order_id IS NOT NULL
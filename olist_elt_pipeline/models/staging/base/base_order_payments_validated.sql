@@ -0,0 +1,33 @@
+{{
+    config(
+        materialized='table',
+        alias='base_order_payments_validated'
+    )
+}}
+
+-- Normalize columns
+WITH casted AS (
+    SELECT
+        {{ cast_columns_from_schema(get_staging_schema_map('order_payments')) }}
+    FROM {{ source('raw', 'order_payments') }}
+)
+
+-- Every raw row with the first failed check (NULL = valid).
+-- stg_order_payments keeps the valid rows, stg_rejected_rows reports the others.
+SELECT
+    casted.*,
+    CASE
+        WHEN casted.order_id IS NULL THEN 'missing_order_id'
+        /* Trash order_id not exist in the parent table */
+        WHEN o.order_id IS NULL THEN 'unknown_order_id'
+        WHEN casted.payment_sequential IS NULL THEN 'missing_payment_sequential'
+        WHEN casted.payment_sequential < 1 THEN 'invalid_payment_sequential' -- Ensure payment_sequential is at least 1
+        WHEN casted.payment_type IS NULL THEN 'missing_payment_type'
+        WHEN casted.payment_installments IS NULL THEN 'missing_payment_installments'
+        WHEN casted.payment_installments < 0 THEN 'invalid_payment_installments' -- Ensure payment_installments is non-negative
+        WHEN casted.payment_value IS NULL THEN 'missing_payment_value'
+        WHEN casted.payment_value < 0.00 THEN 'invalid_payment_value'
+    END AS rejection_reason
+FROM casted
+-- Semi-join: the key table is deduplicated, so the LEFT JOIN never multiplies rows
+LEFT JOIN {{ ref('base_order_keys') }} o ON o.order_id = casted.order_id
@@ -0,0 +1,28 @@
+{{
+    config(
+        materialized='table',
+        alias='base_order_reviews_validated'
+    )
+}}
+
+-- Normalize columns
+WITH casted AS (
+    SELECT
+        {{ cast_columns_from_schema(get_staging_schema_map('order_reviews')) }}
+    FROM {{ source('raw', 'order_reviews') }}
+)
+
+-- Every raw row with the first failed check (NULL = valid).
+-- stg_order_reviews keeps the valid rows, stg_rejected_rows reports the others.
+SELECT
+    casted.*,
+    CASE
+        WHEN casted.review_id IS NULL THEN 'missing_review_id'
+        WHEN casted.order_id IS NULL THEN 'missing_order_id'
+        /* Trash order_id not exist in the parent table */
+        WHEN o.order_id IS NULL THEN 'unknown_order_id'
+        WHEN casted.review_creation_date IS NULL THEN 'missing_review_creation_date'
+    END AS rejection_reason
+FROM casted
+-- Semi-join: the key table is deduplicated, so the LEFT JOIN never multiplies rows
+LEFT JOIN {{ ref('base_order_keys') }} o ON o.order_id = casted.order_id
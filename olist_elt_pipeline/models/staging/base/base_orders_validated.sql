@@ -0,0 +1,29 @@
+{{
+    config(
+        materialized='table',
+        alias='base_orders_validated'
+    )
+}}
+
+-- Normalize columns
+WITH casted AS (
+    SELECT
+        {{ cast_columns_from_schema(get_staging_schema_map('orders')) }}
+    FROM {{ source('raw', 'orders') }}
+)
+
+-- Every raw row with the first failed check (NULL = valid).
+-- stg_orders keeps the valid rows, stg_rejected_rows reports the others.
+SELECT
+    casted.*,
+    CASE
+        WHEN casted.order_id IS NULL THEN 'missing_order_id'
+        WHEN casted.customer_id IS NULL THEN 'missing_customer_id'
+        /* Trash customer_id not exist in the parent table */
+        WHEN c.customer_id IS NULL THEN 'unknown_customer_id'
+        WHEN casted.order_status IS NULL THEN 'missing_order_status'
+        WHEN casted.order_purchase_ts IS NULL THEN 'missing_order_purchase_ts'
+    END AS rejection_reason
+FROM casted
+-- Semi-join: the key table is deduplicated, so the LEFT JOIN never multiplies rows
+LEFT JOIN {{ ref('base_customer_keys') }} c ON c.customer_id = casted.customer_id
@@ -0,0 +1,14 @@
+{{
+    config(
+        materialized='table',
+        alias='base_product_keys'
+    )
+}}
+
+-- Deduplicated product_id values of the raw `products` table, built once per run.
+-- Staging models check their foreign keys with a semi-join against this table
+-- instead of probing the raw table with a correlated EXISTS per row.
+SELECT DISTINCT
+    product_id
+FROM {{ source('raw', 'products') }}
+WHERE product_id IS NOT NULL
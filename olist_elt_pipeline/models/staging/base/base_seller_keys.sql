@@ -0,0 +1,14 @@
+{{
+    config(
+        materialized='table',
+        alias='base_seller_keys'
+    )
+}}
+
+-- Deduplicated seller_id values of the raw `sellers` table, built once per run.
+-- Staging models check their foreign keys with a semi-join against this table
+-- instead of probing the raw table with a correlated EXISTS per row.
+SELECT DISTINCT
+    seller_id
+FROM {{ source('raw', 'sellers') }}
+WHERE seller_id IS NOT NULL
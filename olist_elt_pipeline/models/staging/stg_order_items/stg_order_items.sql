@@ -1,19 +1,13 @@
 {{ 
     config(
-        materialized='view',
-        alias='stg_order_items'
+        materialized='table',
+        alias='stg_order_items',
+        cluster_by=['order_id']
     )
 }}
 
--- Normalize columns
-WITH casted AS (
-    SELECT
-        {{ cast_columns_from_schema(get_staging_schema_map('order_items')) }}
-    FROM {{ source('raw', 'order_items') }}
-),
-
--- Filter invalid core fields for join or logic
-filtered AS (
+-- Keep valid rows only (casting and checks in base_order_items_validated, rejected rows in stg_rejected_rows)
+WITH filtered AS (
     SELECT
         order_id,
         order_item_id,
@@ -22,33 +16,8 @@ filtered AS (
         shipping_limit_ts,
         price,
         freight_value
-    FROM casted
-    WHERE
-        order_id IS NOT NULL
-        /* Remove trash order_id not exist in the parent table */
-        AND EXISTS (
-            SELECT 1 FROM {{ source('raw', 'orders') }} o
-            WHERE o.order_id = casted.order_id
-        )
-        AND order_item_id IS NOT NULL
-        AND order_item_id >= 1 -- Ensoure order_item_id at least 1
-        AND product_id IS NOT NULL
-        /* Remove trash product_id not exist in the parent table */
-        AND EXISTS (
-            SELECT 1 FROM {{ source('raw', 'products') }} p
-            WHERE p.product_id = casted.product_id
-        )
-        AND seller_id IS NOT NULL
-        /* Remove trash seller_id not exist in the parent table */
-        AND EXISTS (
-            SELECT 1 FROM {{ source('raw', 'sellers') }} s
-            WHERE s.seller_id = casted.seller_id
-        )
-        AND shipping_limit_ts IS NOT NULL
-        AND price IS NOT NULL
-        AND price > 0.00 -- Ensure price is greater than 0
-        AND freight_value IS NOT NULL
-        AND freight_value >= 0.00 -- Ensure freight_value is non-negative
+    FROM {{ ref('base_order_items_validated') }}
+    WHERE rejection_reason IS NULL
 ),
 
 -- Create surrogate key
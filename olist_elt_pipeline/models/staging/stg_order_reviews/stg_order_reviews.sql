@@ -1,19 +1,12 @@
 {{ 
     config(
-        materialized='view',
+        materialized='table',
         alias='stg_order_reviews'
     )
 }}
 
--- Normalize columns
-WITH casted AS(
-    SELECT
-        {{ cast_columns_from_schema(get_staging_schema_map('order_reviews')) }}
-    FROM {{ source('raw', 'order_reviews') }}
-),
-
--- Filter invalid core fields for join or logic
-filtered AS(
+-- Keep valid rows only (casting and checks in base_order_reviews_validated, rejected rows in stg_rejected_rows)
+WITH filtered AS(
     SELECT
         review_id,
         order_id,
@@ -22,16 +15,8 @@ filtered AS(
         review_comment_message,
         review_creation_date,
         review_answer_ts
-    FROM casted
-    WHERE
-        review_id IS NOT NULL
-        AND order_id IS NOT NULL
-        /* Remove trash order_id not exist in the parent table */
-        AND EXISTS (
-            SELECT 1 FROM {{ source('raw', 'orders') }} o
-            WHERE o.order_id = casted.order_id
-        )
-        AND review_creation_date IS NOT NULL
+    FROM {{ ref('base_order_reviews_validated') }}
+    WHERE rejection_reason IS NULL
 ),
 
 -- Rank record duplicate review_id order by review_creation_date
@@ -0,0 +1,30 @@
+{{
+    config(
+        materialized='table',
+        alias='stg_rejected_rows'
+    )
+}}
+
+{#
+    Raw rows dropped by the staging checks, with the reason they were rejected.
+    The checks live in the base_*_validated models, so this report and the staging
+    models can never disagree.
+#}
+
+{%- set validated_models = {
+    'orders': 'base_orders_validated',
+    'order_items': 'base_order_items_validated',
+    'order_payments': 'base_order_payments_validated',
+    'order_reviews': 'base_order_reviews_validated',
+} %}
+
+{% for source_table, model_name in validated_models.items() %}
+SELECT
+    '{{ source_table }}' AS source_table,
+    order_id,
+    rejection_reason,
+    {{ dbt.current_timestamp() }} AS checked_at
+FROM {{ ref(model_name) }}
+WHERE rejection_reason IS NOT NULL
+{% if not loop.last %}UNION ALL{% endif %}
+{% endfor %}
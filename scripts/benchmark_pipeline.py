@@ -0,0 +1,197 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+from datetime import datetime
+
+# --- Determine the project root directory (this script lives in 'scripts') ---
+PROJECT_ROOT_DIR = os.getenv("PROJECT_ROOT_DIR", os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT_DIR, "extract_load"))
+
+from utils.ingest_config import table_list, file_map  # noqa: E402
+
+DBT_FOLDER_NAME = os.getenv("DBT_FOLDER_NAME", "olist_elt_pipeline")
+DBT_PROJECT_DIR = os.path.join(PROJECT_ROOT_DIR, DBT_FOLDER_NAME)
+BENCHMARK_DIR = os.path.join(PROJECT_ROOT_DIR, "logs", "benchmarks")
+
+def run_measured(command: list, env: dict = None, cwd: str = None) -> dict:
+    """
+    Run a command and measure its wall time and peak memory.
+    Peak memory is the max RSS of the largest process in the tree (e.g., the Spark JVM), from wait4().
+
+    Returns:
+        dict: {'returncode', 'wall_seconds', 'peak_memory_mb'}
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen(command, env=env, cwd=cwd)
+    _, status, rusage = os.wait4(process.pid, 0)
+    wall = time.perf_counter() - start
+    return {
+        "returncode": os.waitstatus_to_exitcode(status),
+        "wall_seconds": round(wall, 3),
+        "peak_memory_mb": round(rusage.ru_maxrss / 1024, 1), # ru_maxrss is in KB on Linux
+    }
+
+def read_manifest_rows(manifest_path: str) -> dict:
+    """Rows loaded per table, as recorded by the ingest manifest."""
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        return {table: entry.get("rows_loaded", 0) for table, entry in json.load(f).items()}
+
+def benchmark_env(workdir: str, sink: str) -> dict:
+    """
+    Environment of the benchmark runs: the warehouse, manifest, metrics and stats all live in `workdir`,
+    so a benchmark never touches the production ones under data/ and logs/.
+    """
+    warehouse_dir = os.path.join(workdir, "warehouse")
+    return dict(
+        os.environ,
+        PROJECT_ROOT_DIR=PROJECT_ROOT_DIR,
+        INGEST_SINK=sink,
+        INGEST_MANIFEST_PATH=os.path.join(workdir, "ingest_manifest.json"),
+        INGEST_LOCAL_SINK_DIR=warehouse_dir,
+        INGEST_DUCKDB_PATH=os.path.join(warehouse_dir, "olist.duckdb"),
+        INGEST_LANDING_DIR=os.path.join(workdir, "landing"),
+        INGEST_METRICS_DIR=os.path.join(workdir, "metrics"),
+        INGEST_STATS_PATH=os.path.join(workdir, "ingest_stats.json"),
+        INGEST_STATS_HISTORY_PATH=os.path.join(workdir, "ingest_stats_history.jsonl"),
+    )
+
+def benchmark_ingest(workdir: str, data_dir: str, tables: list, sink: str, mode: str) -> list:
+    """
+    Benchmark ingest of each table into a (local) sink under `workdir`.
+
+    Modes:
+        - 'per-table': one process per table, gives isolated wall time / peak memory per table
+          (includes Spark start-up, like the old ingest_all.sh loop).
+        - 'shared': one spark_ingest_all.py run for all tables (the production path), measured as a whole.
+    """
+    env = dict(benchmark_env(workdir, sink), INGEST_DATA_DIR=os.path.abspath(data_dir))
+    manifest_path = env["INGEST_MANIFEST_PATH"]
+    script_dir = os.path.join(PROJECT_ROOT_DIR, "extract_load")
+    results = []
+
+    if mode == "shared":
+        measured = run_measured(
+            [sys.executable, os.path.join(script_dir, "spark_ingest_all.py"), "--force", "--log-dir", workdir, *tables],
+            env=env
+        )
+        rows = read_manifest_rows(manifest_path)
+        total_rows = sum(rows.get(t, 0) for t in tables)
+        results.append({
+            "stage": "ingest", "name": "all_tables (shared session)", "rows": total_rows,
+            "rows_per_second": round(total_rows / measured["wall_seconds"], 1) if measured["wall_seconds"] else None,
+            **measured
+        })
+        return results
+
+    for table_name in tables:
+        csv_path = os.path.join(os.path.abspath(data_dir), os.path.basename(file_map[table_name]))
+        measured = run_measured(
+            [sys.executable, os.path.join(script_dir, "spark_ingest_generic.py"), table_name, csv_path],
+            env=env
+        )
+        rows = read_manifest_rows(manifest_path).get(table_name, 0)
+        results.append({
+            "stage": "ingest", "name": table_name, "rows": rows,
+            "source_mb": round(os.path.getsize(csv_path) / (1024 * 1024), 2) if os.path.exists(csv_path) else None,
+            "rows_per_second": round(rows / measured["wall_seconds"], 1) if measured["wall_seconds"] else None,
+            **measured
+        })
+    return results
+
+def benchmark_dbt(workdir: str = None, sink: str = None, target: str = None, select: str = None) -> list:
+    """
+    Run the dbt project once and report execution time and rows affected per model
+    from run_results.json. Peak memory is reported for the whole dbt process.
+    With a `workdir`, dbt runs on the warehouse the ingest benchmark loaded there: a DuckDB profile written
+    in `workdir`/profiles (on the DuckDB file of the 'duckdb' sink, reading the Parquet files of the 'parquet' sink).
+    Without one (--skip-ingest), it runs on the project's profiles.yml and `target`.
+    """
+    profiles_dir, env = DBT_PROJECT_DIR, None
+    target_path = os.path.join(DBT_PROJECT_DIR, "target")
+    if workdir:
+        profiles_dir = os.path.join(workdir, "profiles")
+        target_path = os.path.join(workdir, "target")
+        env = dict(benchmark_env(workdir, sink), DBT_TARGET_TYPE="duckdb", DBT_PROFILES_DIR=profiles_dir)
+        if sink == "parquet":
+            raw_dir = os.path.join(env["INGEST_LOCAL_SINK_DIR"], "raw")
+            env["DBT_DUCKDB_RAW_LOCATION"] = f"read_parquet('{raw_dir}/{{name}}/*.parquet')"
+        generated = run_measured([sys.executable, os.path.join(PROJECT_ROOT_DIR, "scripts", "generate_profiles.py")], env=env)
+        if generated["returncode"]:
+            return [{"stage": "dbt", "name": "generate_profiles.py", **generated}]
+        target = None # The generated profile has a single (DuckDB) target
+
+    command = ["dbt", "run", "--project-dir", DBT_PROJECT_DIR, "--profiles-dir", profiles_dir, "--target-path", target_path]
+    if target:
+        command += ["--target", target]
+    if select:
+        command += ["--select", select]
+    run_results_path = os.path.join(target_path, "run_results.json")
+    if os.path.exists(run_results_path):
+        os.remove(run_results_path) # Never report the results of a previous run
+    measured = run_measured(command, env=env, cwd=DBT_PROJECT_DIR)
+
+    results = [{"stage": "dbt", "name": "dbt run (total)", **measured}]
+    if not os.path.exists(run_results_path):
+        return results
+
+    with open(run_results_path, "r", encoding="utf-8") as f:
+        run_results = json.load(f)
+    for r in run_results.get("results", []):
+        rows = (r.get("adapter_response") or {}).get("rows_affected")
+        execution_time = r.get("execution_time") or 0
+        results.append({
+            "stage": "dbt",
+            "name": r["unique_id"].split(".")[-1],
+            "status": r.get("status"),
+            "rows": rows,
+            "wall_seconds": round(execution_time, 3),
+            "rows_per_second": round(rows / execution_time, 1) if rows and execution_time else None,
+        })
+    return results
+
+def print_report(results: list):
+    """Print the benchmark results as a table."""
+    print(f"\n{'stage':<8} {'name':<40} {'rows':>12} {'wall (s)':>10} {'rows/s':>12} {'peak MB':>10}")
+    print("-" * 96)
+    for r in results:
+        print(
+            f"{r['stage']:<8} {r['name'][:40]:<40} {str(r.get('rows', '')):>12} "
+            f"{str(r.get('wall_seconds', '')):>10} {str(r.get('rows_per_second', '')):>12} {str(r.get('peak_memory_mb', '')):>10}"
+        )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark ingest (per table) and dbt (per model) on local data.")
+    parser.add_argument("--data-dir", default=os.path.join(PROJECT_ROOT_DIR, "data", "synthetic"), help="Folder with the nine Olist CSV files (see generate_synthetic_data.py)")
+    parser.add_argument("--tables", nargs="*", default=list(table_list), help="Tables to ingest")
+    parser.add_argument("--sink", default="duckdb", help="Load sink used for ingest (duckdb / parquet run offline)")
+    parser.add_argument("--ingest-mode", choices=["per-table", "shared"], default="per-table", help="One process per table or one shared session")
+    parser.add_argument("--skip-ingest", action="store_true", help="Only benchmark dbt")
+    parser.add_argument("--dbt", action="store_true", help="Also benchmark a dbt run")
+    parser.add_argument("--dbt-target", default=None, help="dbt target to run against with --skip-ingest (else dbt runs on the benchmark warehouse)")
+    parser.add_argument("--dbt-select", default=None, help="dbt --select expression")
+    parser.add_argument("--label", default="", help="Free text label stored with the results (e.g., 'scale=10')")
+    args = parser.parse_args()
+
+    results = []
+    workdir = None
+    if not args.skip_ingest:
+        workdir = tempfile.mkdtemp(prefix="olist_bench_")
+        print(f"📂 Benchmark warehouse, manifest, metrics and stats in: {workdir}")
+        results += benchmark_ingest(workdir, args.data_dir, args.tables, args.sink, args.ingest_mode)
+    if args.dbt:
+        results += benchmark_dbt(workdir, args.sink, args.dbt_target, args.dbt_select)
+    print_report(results)
+
+    os.makedirs(BENCHMARK_DIR, exist_ok=True)
+    report_path = os.path.join(BENCHMARK_DIR, f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump({"label": args.label, "data_dir": args.data_dir, "sink": args.sink, "ingest_mode": args.ingest_mode, "results": results}, f, indent=2)
+    print(f"\n📁 Benchmark report saved in: {report_path}")
+
+    sys.exit(1 if any(r.get("returncode") for r in results) else 0)
@@ -0,0 +1,257 @@
+import os
+import sys
+import json
+import glob
+import argparse
+import statistics
+
+# --- Determine the project root directory (this script lives in 'scripts') ---
+PROJECT_ROOT_DIR = os.getenv("PROJECT_ROOT_DIR", os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DBT_FOLDER_NAME = os.getenv("DBT_FOLDER_NAME", "olist_elt_pipeline")
+DBT_TARGET_DIR = os.path.join(PROJECT_ROOT_DIR, DBT_FOLDER_NAME, "target")
+
+# --------------- GATE CONFIGURATION ---------------
+# Per-model history of every dbt run (one JSON line per model and run)
+PERF_HISTORY_PATH = os.getenv("DBT_PERF_HISTORY_PATH", os.path.join(PROJECT_ROOT_DIR, "logs", "dbt_perf", "model_history.jsonl"))
+# Baseline = median of the last N comparable runs of a model
+BASELINE_RUNS = int(os.getenv("DBT_PERF_BASELINE_RUNS", "7"))
+# Runs needed before a model is gated at all
+MIN_BASELINE_RUNS = int(os.getenv("DBT_PERF_MIN_BASELINE_RUNS", "3"))
+# Current / baseline ratio that warns or fails the gate
+WARN_RATIO = float(os.getenv("DBT_PERF_WARN_RATIO", "2.0"))
+FAIL_RATIO = float(os.getenv("DBT_PERF_FAIL_RATIO", "5.0"))
+# Models faster than this (now and in the baseline) are noise, not regressions
+MIN_SECONDS = float(os.getenv("DBT_PERF_MIN_SECONDS", "5"))
+
+# Metrics compared with the baseline
+GATED_METRICS = ["execution_time", "bytes_scanned"]
+
+def load_json(path: str) -> dict:
+    """Read a dbt artifact, fail with a clear message if it is missing."""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"❌ dbt artifact not found: {path} (run dbt first)")
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def fetch_snowflake_bytes_scanned(query_ids: list) -> dict:
+    """
+    Bytes scanned per query id from Snowflake's query history (SNOWFLAKE_* env vars, as for generate_profiles.py).
+    dbt only reports the query id of a model's last statement, so this is the main statement (CTAS / MERGE) of the model.
+
+    Returns:
+        dict: {query_id: bytes_scanned}, empty if Snowflake cannot be reached.
+    """
+    if not query_ids:
+        return {}
+    try:
+        import snowflake.connector
+        conn = snowflake.connector.connect(
+            account=os.environ["SNOWFLAKE_ACCOUNT"],
+            user=os.environ["SNOWFLAKE_USER"],
+            password=os.environ["SNOWFLAKE_PASSWORD"],
+            role=os.getenv("SNOWFLAKE_ROLE"),
+            warehouse=os.getenv("SNOWFLAKE_WAREHOUSE"),
+            database=os.getenv("SNOWFLAKE_DATABASE"),
+        )
+    except (ImportError, KeyError) as e:
+        print(f"⚠️ Bytes scanned not collected (no Snowflake connection settings): {e}")
+        return {}
+    except Exception as e:
+        print(f"⚠️ Bytes scanned not collected (cannot connect to Snowflake): {e}")
+        return {}
+
+    try:
+        cs = conn.cursor()
+        placeholders = ", ".join(["%s"] * len(query_ids))
+        cs.execute(
+            "SELECT query_id, bytes_scanned "
+            "FROM TABLE(INFORMATION_SCHEMA.QUERY_HISTORY_BY_USER(RESULT_LIMIT => 10000)) "
+            f"WHERE query_id IN ({placeholders})",
+            query_ids
+        )
+        return {query_id: bytes_scanned for query_id, bytes_scanned in cs.fetchall()}
+    except Exception as e:
+        print(f"⚠️ Bytes scanned not collected (query history not readable): {e}")
+        return {}
+    finally:
+        conn.close()
+
+def collect_model_stats(run_results: dict, manifest: dict) -> list:
+    """
+    One record per model of the run: execution time, rows affected and bytes scanned (if the adapter reports it),
+    with the model's materialization from the manifest.
+
+    Returns:
+        list: [{'invocation_id', 'generated_at', 'unique_id', 'model', 'materialized', 'full_refresh',
+                'status', 'execution_time', 'rows_affected', 'bytes_scanned', 'query_id'}]
+    """
+    metadata = run_results.get("metadata", {})
+    nodes = manifest.get("nodes", {})
+    full_refresh = bool((run_results.get("args") or {}).get("full_refresh"))
+
+    records = []
+    for r in run_results.get("results", []):
+        unique_id = r["unique_id"]
+        if not unique_id.startswith("model."):
+            continue # Tests / seeds / snapshots are not gated
+        node = nodes.get(unique_id, {})
+        adapter_response = r.get("adapter_response") or {}
+        records.append({
+            "invocation_id": metadata.get("invocation_id"),
+            "generated_at": metadata.get("generated_at"),
+            "unique_id": unique_id,
+            "model": node.get("name", unique_id.split(".")[-1]),
+            "materialized": (node.get("config") or {}).get("materialized"),
+            "full_refresh": full_refresh,
+            "status": r.get("status"),
+            "execution_time": round(r.get("execution_time") or 0, 3),
+            "rows_affected": adapter_response.get("rows_affected"),
+            # BigQuery style adapters report it directly, Snowflake is looked up from the query history
+            "bytes_scanned": adapter_response.get("bytes_processed"),
+            "query_id": adapter_response.get("query_id"),
+        })
+    return records
+
+def add_bytes_scanned(records: list, manifest: dict):
+    """Fill in bytes scanned from the Snowflake query history (one connection for all the records)."""
+    if manifest.get("metadata", {}).get("adapter_type") != "snowflake":
+        return
+    scanned = fetch_snowflake_bytes_scanned([r["query_id"] for r in records if r["query_id"] and r["bytes_scanned"] is None])
+    for record in records:
+        if record["bytes_scanned"] is None:
+            record["bytes_scanned"] = scanned.get(record["query_id"])
+
+def load_history(path: str) -> list:
+    """All records of previous runs (oldest first)."""
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def append_history(path: str, records: list, history: list):
+    """Append the run's records, unless the run was already recorded (e.g., task retry)."""
+    recorded = {(h.get("invocation_id"), h.get("unique_id")) for h in history}
+    new_records = [r for r in records if (r["invocation_id"], r["unique_id"]) not in recorded]
+    if not new_records:
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        for record in new_records:
+            f.write(json.dumps(record) + "\n")
+
+def is_comparable(previous: dict, record: dict) -> bool:
+    """
+    Only successful runs with the same materialization and refresh mode are compared:
+    a --full-refresh of an incremental model is expected to be much slower than its daily run.
+    """
+    return (
+        previous.get("unique_id") == record["unique_id"]
+        and previous.get("invocation_id") != record["invocation_id"]
+        and previous.get("status") == "success"
+        and previous.get("materialized") == record["materialized"]
+        and previous.get("full_refresh") == record["full_refresh"]
+    )
+
+def compute_baseline(history: list, record: dict, runs: int = BASELINE_RUNS) -> dict:
+    """
+    Rolling baseline of a model: median of each gated metric over its last `runs` comparable runs.
+
+    Returns:
+        dict: {'runs': int, 'execution_time': float | None, 'bytes_scanned': float | None}
+    """
+    previous = [h for h in history if is_comparable(h, record)][-runs:]
+    baseline = {"runs": len(previous)}
+    for metric in GATED_METRICS:
+        values = [h[metric] for h in previous if h.get(metric) is not None]
+        baseline[metric] = statistics.median(values) if values else None
+    return baseline
+
+def check_regressions(records: list, history: list, warn_ratio: float = WARN_RATIO, fail_ratio: float = FAIL_RATIO) -> list:
+    """
+    Compare each model of the run with its rolling baseline.
+
+    Returns:
+        list: [{'model', 'metric', 'current', 'baseline', 'ratio', 'level'}] with level 'warn' or 'fail'.
+    """
+    findings = []
+    for record in records:
+        if record["status"] != "success":
+            continue # Failed models are reported by dbt itself
+        baseline = compute_baseline(history, record)
+        if baseline["runs"] < MIN_BASELINE_RUNS:
+            continue
+        # Tiny models: a few seconds of queueing would look like a 5x regression
+        if record["execution_time"] < MIN_SECONDS and (baseline["execution_time"] or 0) < MIN_SECONDS:
+            continue
+        for metric in GATED_METRICS:
+            current, reference = record.get(metric), baseline[metric]
+            if current is None or not reference:
+                continue
+            ratio = current / reference
+            level = "fail" if ratio >= fail_ratio else "warn" if ratio >= warn_ratio else None
+            if level:
+                findings.append({
+                    "model": record["model"], "metric": metric, "current": current,
+                    "baseline": reference, "ratio": round(ratio, 2), "level": level,
+                })
+    return findings
+
+def print_report(records: list, findings: list):
+    """Print the run's models (slowest first) and the regressions found."""
+    print(f"\n{'model':<40} {'materialized':<12} {'time (s)':>10} {'rows':>12} {'bytes scanned':>15}")
+    print("-" * 93)
+    for r in sorted(records, key=lambda r: r["execution_time"], reverse=True):
+        print(
+            f"{r['model'][:40]:<40} {str(r['materialized']):<12} {r['execution_time']:>10} "
+            f"{str(r['rows_affected'] if r['rows_affected'] is not None else ''):>12} "
+            f"{str(r['bytes_scanned'] if r['bytes_scanned'] is not None else ''):>15}"
+        )
+    print()
+    for f in findings:
+        icon = "❌" if f["level"] == "fail" else "⚠️"
+        print(f"{icon} [{f['model']}] {f['metric']} regressed {f['ratio']}x: {f['current']} vs baseline {f['baseline']}")
+    if not findings:
+        print("✅ No model regressed against its baseline.")
+
+def main(target_dir: str, history_path: str, warn_ratio: float, fail_ratio: float, warn_only: bool = False, run_results_glob: str = None) -> int:
+    """
+    Record the last dbt run's per-model stats and gate it against the rolling baselines.
+    With run_results_glob, the run is made of several dbt invocations (e.g., one Airflow task per model)
+    and every matching run_results.json is read.
+
+    Returns:
+        int: 1 if a model regressed beyond fail_ratio (and warn_only is off), 0 otherwise.
+    """
+    manifest = load_json(os.path.join(target_dir, "manifest.json"))
+    run_results_paths = sorted(glob.glob(run_results_glob)) if run_results_glob else [os.path.join(target_dir, "run_results.json")]
+    if not run_results_paths:
+        print(f"⚠️ No run_results.json matches {run_results_glob}, nothing to check.")
+        return 0
+
+    records = []
+    for path in run_results_paths:
+        records += collect_model_stats(load_json(path), manifest)
+    add_bytes_scanned(records, manifest)
+    history = load_history(history_path)
+    findings = check_regressions(records, history, warn_ratio, fail_ratio)
+    append_history(history_path, records, history)
+
+    print_report(records, findings)
+    print(f"\n📁 Model history saved in: {history_path}")
+    if warn_only or not any(f["level"] == "fail" for f in findings):
+        return 0
+    return 1
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-model performance gate for the last dbt run (target/run_results.json).")
+    parser.add_argument("--target-dir", default=DBT_TARGET_DIR, help="dbt target folder with run_results.json and manifest.json")
+    parser.add_argument("--history-path", default=PERF_HISTORY_PATH, help="JSON lines file with the per-model history")
+    parser.add_argument("--warn-ratio", type=float, default=WARN_RATIO, help="Warn when a metric is this many times its baseline")
+    parser.add_argument("--fail-ratio", type=float, default=FAIL_RATIO, help="Fail when a metric is this many times its baseline")
+    parser.add_argument("--run-results-glob", default=None, help="Read every matching run_results.json instead of <target-dir>/run_results.json")
+    parser.add_argument("--warn-only", action="store_true", help="Never fail, only report regressions")
+    args = parser.parse_args()
+
+    print(f"⏱️ Checking per-model performance of the last dbt run in {args.target_dir}")
+    sys.exit(main(args.target_dir, args.history_path, args.warn_ratio, args.fail_ratio, args.warn_only, args.run_results_glob))
@@ -0,0 +1,150 @@
+import os
+import sys
+import json
+import shutil
+import hashlib
+import argparse
+
+# --- Determine the project root directory (this script lives in 'scripts') ---
+PROJECT_ROOT_DIR = os.getenv("PROJECT_ROOT_DIR", os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DBT_FOLDER_NAME = os.getenv("DBT_FOLDER_NAME", "olist_elt_pipeline")
+DBT_PROJECT_DIR = os.path.join(PROJECT_ROOT_DIR, DBT_FOLDER_NAME)
+# Folder of profiles.yml, resolved like scripts/generate_profiles.py writes it (and like dbt itself reads it)
+DBT_PROFILES_DIR = os.getenv("DBT_PROFILES_DIR", DBT_PROJECT_DIR)
+DBT_TARGET_DIR = os.path.join(DBT_PROJECT_DIR, "target")
+DBT_PACKAGES_DIR = os.path.join(DBT_PROJECT_DIR, "dbt_packages")
+
+# --------------- CACHE ---------------
+# Installed packages and partial parse state kept between runs, keyed on the hash of the files they depend on
+DBT_CACHE_DIR = os.getenv("DBT_CACHE_DIR", os.path.join(PROJECT_ROOT_DIR, "logs", "dbt_cache"))
+STAMPS_PATH = os.path.join(DBT_CACHE_DIR, "stamps.json")
+PARTIAL_PARSE_FILE = "partial_parse.msgpack"
+
+# Files deciding whether deps / debug have to run again
+# (package-lock.yml is written by deps itself, so it is not part of the key)
+PACKAGES_FILES = ["packages.yml", "dependencies.yml"]
+PROJECT_FILES = ["dbt_project.yml", "profiles.yml", *PACKAGES_FILES]
+
+def files_hash(file_names: list) -> str:
+    """SHA-256 of the project files (missing files count as empty) and the dbt version."""
+    from dbt.version import __version__ as dbt_version
+
+    digest = hashlib.sha256(dbt_version.encode())
+    for name in file_names:
+        digest.update(name.encode())
+        path = os.path.join(DBT_PROFILES_DIR if name == "profiles.yml" else DBT_PROJECT_DIR, name)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+def load_stamps() -> dict:
+    """Hash of the project files at the last successful deps / debug."""
+    if not os.path.exists(STAMPS_PATH):
+        return {}
+    with open(STAMPS_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def save_stamps(stamps: dict):
+    os.makedirs(DBT_CACHE_DIR, exist_ok=True)
+    with open(STAMPS_PATH, "w", encoding="utf-8") as f:
+        json.dump(stamps, f, indent=2)
+
+def invoke(runner, args: list):
+    """Run one dbt command in this process, fail like the CLI would."""
+    print(f"▶️ dbt {' '.join(args)}")
+    options = ["--project-dir", DBT_PROJECT_DIR]
+    if args[0] != "deps": # deps does not connect, it has no profile options
+        options += ["--profiles-dir", DBT_PROFILES_DIR]
+    result = runner.invoke([*args, *options])
+    if not result.success:
+        raise RuntimeError(f"❌ dbt {args[0]} failed: {result.exception or 'see the dbt logs above'}")
+    return result
+
+def restore_packages(key: str) -> bool:
+    """Copy the cached dbt_packages of this packages.yml back into the project. Returns True if restored."""
+    cached = os.path.join(DBT_CACHE_DIR, "dbt_packages", key)
+    if not os.path.isdir(cached):
+        return False
+    shutil.rmtree(DBT_PACKAGES_DIR, ignore_errors=True)
+    shutil.copytree(cached, DBT_PACKAGES_DIR)
+    return True
+
+def cache_packages(key: str):
+    """Keep the installed dbt_packages of this packages.yml (older entries are removed)."""
+    root = os.path.join(DBT_CACHE_DIR, "dbt_packages")
+    shutil.rmtree(root, ignore_errors=True)
+    shutil.copytree(DBT_PACKAGES_DIR, os.path.join(root, key))
+
+def restore_partial_parse(key: str):
+    """Put the cached partial parse state back in target/ if a clean (or a new container) removed it."""
+    cached = os.path.join(DBT_CACHE_DIR, "partial_parse", f"{key}.msgpack")
+    target = os.path.join(DBT_TARGET_DIR, PARTIAL_PARSE_FILE)
+    if not os.path.exists(target) and os.path.exists(cached):
+        os.makedirs(DBT_TARGET_DIR, exist_ok=True)
+        shutil.copy2(cached, target)
+        print(f"♻️ Partial parse state restored from cache ({key})")
+
+def cache_partial_parse(key: str):
+    """Keep the partial parse state of this project configuration (older entries are removed)."""
+    source = os.path.join(DBT_TARGET_DIR, PARTIAL_PARSE_FILE)
+    if not os.path.exists(source):
+        return
+    root = os.path.join(DBT_CACHE_DIR, "partial_parse")
+    shutil.rmtree(root, ignore_errors=True)
+    os.makedirs(root)
+    shutil.copy2(source, os.path.join(root, f"{key}.msgpack"))
+
+def prepare(vars_str: str = "{}", seed: bool = True, force: bool = False):
+    """
+    Get the project ready for the model tasks in one process:
+    debug and deps only when their files changed, one parse (partial parse state restored / cached),
+    then seed with the parsed manifest (no second parse).
+    """
+    from dbt.cli.main import dbtRunner
+
+    runner = dbtRunner()
+    stamps = load_stamps()
+    project_key = files_hash(PROJECT_FILES)
+    packages_key = files_hash(PACKAGES_FILES)
+
+    if force or stamps.get("debug") != project_key:
+        invoke(runner, ["debug"])
+        stamps["debug"] = project_key
+        save_stamps(stamps)
+    else:
+        print("⏭️ dbt debug skipped: profiles / project files unchanged since the last successful check")
+
+    if not force and stamps.get("deps") == packages_key and os.path.isdir(DBT_PACKAGES_DIR):
+        print("⏭️ dbt deps skipped: packages unchanged and installed")
+    elif not force and restore_packages(packages_key):
+        print(f"♻️ dbt_packages restored from cache ({packages_key})")
+        stamps["deps"] = packages_key
+        save_stamps(stamps)
+    else:
+        invoke(runner, ["deps"])
+        cache_packages(packages_key)
+        stamps["deps"] = packages_key
+        save_stamps(stamps)
+
+    restore_partial_parse(project_key)
+    manifest = invoke(runner, ["parse", "--vars", vars_str]).result
+    cache_partial_parse(project_key)
+
+    if seed:
+        # Reuse the parsed manifest: seed starts without parsing the project again
+        invoke(dbtRunner(manifest=manifest), ["seed", "--vars", vars_str])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run dbt debug / deps / parse / seed in one process, skipping what did not change.")
+    parser.add_argument("--vars", default="{}", help="dbt vars of the run (same as the model tasks, keeps the partial parse valid)")
+    parser.add_argument("--skip-seed", action="store_true", help="Stop after parse")
+    parser.add_argument("--force", action="store_true", help="Always run debug and deps")
+    args = parser.parse_args()
+
+    try:
+        prepare(args.vars, seed=not args.skip_seed, force=args.force)
+    except RuntimeError as e:
+        print(e)
+        sys.exit(1)
@@ -0,0 +1,168 @@
+import os
+import sys
+import json
+import shutil
+import argparse
+
+# --- Determine the project root directory (this script lives in 'scripts') ---
+PROJECT_ROOT_DIR = os.getenv("PROJECT_ROOT_DIR", os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT_DIR, "extract_load"))
+
+from utils.ingest_config import INGEST_MANIFEST_PATH  # noqa: E402
+
+DBT_FOLDER_NAME = os.getenv("DBT_FOLDER_NAME", "olist_elt_pipeline")
+DBT_PROJECT_DIR = os.path.join(PROJECT_ROOT_DIR, DBT_FOLDER_NAME)
+# Folder of profiles.yml, resolved like scripts/generate_profiles.py writes it (and like dbt itself reads it)
+DBT_PROFILES_DIR = os.getenv("DBT_PROFILES_DIR", DBT_PROJECT_DIR)
+DBT_PROJECT_NAME = os.getenv("DBT_PROJECT_NAME", "olist_elt_pipeline")
+
+# --------------- SELECTION STATE ---------------
+# Artifacts of the last successful production run: dbt manifest (for state:modified) and ingest manifest (for changed sources)
+DBT_STATE_DIR = os.getenv("DBT_STATE_DIR", os.path.join(PROJECT_ROOT_DIR, "logs", "dbt_state"))
+# dbt source holding the ingested tables (models/sources/*.yml), its table names are the ingest table names
+DBT_RAW_SOURCE = os.getenv("DBT_RAW_SOURCE", "raw")
+# Written for the DAG tasks: one selected node name per line, '*' when everything is selected
+SELECTION_PATH = os.path.join(DBT_PROJECT_DIR, "target", "airflow", "selected_nodes.txt")
+# Ingest manifest as read by the selection: saved as the state after the run, not the ingest manifest
+# of that time (an ingest finishing during the run must still be seen as changed by the next run)
+INGEST_SNAPSHOT_PATH = os.path.join(DBT_PROJECT_DIR, "target", "airflow", "ingest_manifest.json")
+SELECT_ALL = "*"
+
+# Ingest manifest fields telling that a table's content changed (loaded_at alone is a reload of the same file)
+CHANGE_FIELDS = ["sha256", "total_rows", "watermark"]
+
+def load_json(path: str) -> dict:
+    """Read a JSON file, empty dict if it does not exist."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def snapshot_ingest_manifest(path: str = INGEST_SNAPSHOT_PATH) -> dict:
+    """
+    Copy the ingest manifest to `path` (removed when there is none) and read the copy: the run is selected
+    from exactly the manifest save_state() keeps.
+
+    Returns:
+        dict: The ingest manifest, empty if it does not exist.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if not os.path.exists(INGEST_MANIFEST_PATH):
+        if os.path.exists(path):
+            os.remove(path)
+        return {}
+    shutil.copy2(INGEST_MANIFEST_PATH, path)
+    return load_json(path)
+
+def changed_tables(ingest_manifest: dict, last_state: dict) -> list:
+    """Ingested tables whose content, row count or watermark changed since the last successful dbt run."""
+    return sorted(
+        table for table, entry in ingest_manifest.items()
+        if any(entry.get(field) != (last_state.get(table) or {}).get(field) for field in CHANGE_FIELDS)
+    )
+
+def build_selector(tables: list, has_state: bool) -> str:
+    """
+    dbt selector of the nodes to rebuild: everything downstream of the changed sources,
+    plus everything downstream of models / seeds / macros changed since the production manifest.
+    """
+    selectors = [f"source:{DBT_RAW_SOURCE}.{table}+" for table in tables]
+    if has_state:
+        selectors.append("state:modified+")
+    return " ".join(selectors)
+
+def list_selected_nodes(selector: str, state_dir: str, vars_str: str) -> list:
+    """
+    Resolve a selector with `dbt ls`, in this process (tests of the selected models are included).
+
+    Returns:
+        list: [{'name', 'resource_type', 'package_name'}]
+    """
+    from dbt.cli.main import dbtRunner
+
+    args = [
+        "ls", "--select", *selector.split(),
+        "--output", "json", "--output-keys", "name", "resource_type", "package_name",
+        "--vars", vars_str, "--project-dir", DBT_PROJECT_DIR, "--profiles-dir", DBT_PROFILES_DIR,
+    ]
+    if "state:" in selector:
+        args += ["--state", state_dir]
+    result = dbtRunner().invoke(args)
+    if not result.success:
+        raise RuntimeError(f"❌ dbt ls failed: {result.exception or 'see the dbt logs above'}")
+    return [json.loads(line) for line in result.result]
+
+def selection_names(nodes: list) -> list:
+    """
+    Names written to the selection file: node names, plus 'package_<name>' for models of installed packages
+    (the DAG runs each package as one task group).
+    """
+    names = {node["name"] for node in nodes}
+    names |= {
+        f"package_{node['package_name']}" for node in nodes
+        if node["resource_type"] == "model" and node["package_name"] != DBT_PROJECT_NAME
+    }
+    return sorted(names)
+
+def write_selection(names: list, path: str = SELECTION_PATH):
+    """Write the selection file read by the DAG tasks."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(names) + ("\n" if names else ""))
+
+def select(full: bool, vars_str: str) -> list:
+    """
+    Decide what the run rebuilds.
+
+    Returns:
+        list: Selected node names, or [SELECT_ALL].
+    """
+    dbt_state_manifest = os.path.join(DBT_STATE_DIR, "manifest.json")
+    # Snapshot taken on every path, full runs included: it is what save_state() keeps
+    ingest_manifest = snapshot_ingest_manifest()
+    if full:
+        print("🔁 Full run requested, every model is selected.")
+        return [SELECT_ALL]
+    if not os.path.exists(dbt_state_manifest):
+        print(f"🔁 No production state in {DBT_STATE_DIR} yet, every model is selected.")
+        return [SELECT_ALL]
+    if not ingest_manifest:
+        print(f"🔁 No ingest manifest at {INGEST_MANIFEST_PATH}, source changes are unknown: every model is selected.")
+        return [SELECT_ALL]
+
+    tables = changed_tables(ingest_manifest, load_json(os.path.join(DBT_STATE_DIR, "ingest_manifest.json")))
+    print(f"📥 Changed sources since the last successful run: {', '.join(tables) or 'none'}")
+    selector = build_selector(tables, has_state=True)
+    print(f"🎯 dbt selector: {selector}")
+    nodes = list_selected_nodes(selector, DBT_STATE_DIR, vars_str)
+    models = [node["name"] for node in nodes if node["resource_type"] == "model"]
+    print(f"🧩 {len(models)} model(s) selected: {', '.join(models) or 'none (nothing to rebuild)'}")
+    return selection_names(nodes)
+
+def save_state():
+    """
+    After a successful run: keep its dbt manifest and the ingest manifest it was selected from (snapshot of select()),
+    the next run only rebuilds what changed since.
+    """
+    os.makedirs(DBT_STATE_DIR, exist_ok=True)
+    shutil.copy2(os.path.join(DBT_PROJECT_DIR, "target", "manifest.json"), os.path.join(DBT_STATE_DIR, "manifest.json"))
+    if os.path.exists(INGEST_SNAPSHOT_PATH):
+        shutil.copy2(INGEST_SNAPSHOT_PATH, os.path.join(DBT_STATE_DIR, "ingest_manifest.json"))
+    print(f"💾 Production state saved in {DBT_STATE_DIR}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Select the dbt nodes downstream of changed sources and changed code.")
+    parser.add_argument("--full", action="store_true", help="Select every model (e.g., backfill with date vars)")
+    parser.add_argument("--vars", default="{}", help="dbt vars of the run (same as the run, keeps the partial parse valid)")
+    parser.add_argument("--save-state", action="store_true", help="Store the current manifests as the production state")
+    args = parser.parse_args()
+
+    if args.save_state:
+        save_state()
+        sys.exit(0)
+    try:
+        write_selection(select(args.full, args.vars))
+    except RuntimeError as e:
+        print(e)
+        sys.exit(1)
+    print(f"📁 Selection written to {SELECTION_PATH}")
@@ -49,8 +49,19 @@ DBT_PROJECT_NAME = os.getenv("DBT_PROJECT_NAME", "olist_elt_pipeline")
 # Example: /opt/airflow/olist_elt_pipeline (in Docker) or /home/user/my_project/olist_elt_pipeline (local)
 dbt_project_path = os.path.join(project_root_dir, DBT_FOLDER_NAME)
 
-# Path to the profiles.yml file
-output_path = os.path.join(dbt_project_path, "profiles.yml")
+# Path to the profiles.yml file (DBT_PROFILES_DIR, the folder dbt itself reads it from, else the dbt project)
+profiles_dir = os.getenv("DBT_PROFILES_DIR", dbt_project_path)
+output_path = os.path.join(profiles_dir, "profiles.yml")
+
+# --- Target type: 'snowflake' (default) or 'duckdb' (fully local, no warehouse needed) ---
+DBT_TARGET_TYPE = os.getenv("DBT_TARGET_TYPE", "snowflake").lower()
+if DBT_TARGET_TYPE not in ("snowflake", "duckdb"):
+    print(f"[❌ ERROR] Unsupported DBT_TARGET_TYPE '{DBT_TARGET_TYPE}'. Use 'snowflake' or 'duckdb'.")
+    sys.exit(1)
+
+# DuckDB database file, the same file the ingest 'duckdb' sink loads RAW into (see extract_load/utils/ingest_config.py)
+duckdb_path = os.getenv("INGEST_DUCKDB_PATH", os.path.join(project_root_dir, "data", "warehouse", "olist.duckdb"))
+duckdb_target = os.getenv("DUCKDB_ENV", "local")
 
 # --- Load credentials for OLIST_ELT_PIPELINE profile from environment variable ---
 # Get the target environment (e.g., 'dev', 'prod')
@@ -74,81 +85,124 @@ elementary_warehouse = os.getenv('ELEMENTARY_WAREHOUSE')
 elementary_database = os.getenv('ELEMENTARY_DATABASE')
 elementary_schema = os.getenv('ELEMENTARY_SCHEMA')
 
-# --- Check required variables (HIGHLY RECOMMENDED) ---
-# Check variables for OLIST_ELT_PIPELINE profile
-required_vars_olist = { 
-    'SNOWFLAKE_ACCOUNT': snowflake_account, 
-    'SNOWFLAKE_USER': snowflake_user, 
-    'SNOWFLAKE_PASSWORD': snowflake_password, 
-    'SNOWFLAKE_WAREHOUSE': snowflake_warehouse, 
-    'SNOWFLAKE_DATABASE': snowflake_database, 
-    'SNOWFLAKE_SCHEMA': snowflake_schema, 
-    'SNOWFLAKE_ENV': snowflake_env_target
-}
-
-missing_vars_olist = [key for key, value in required_vars_olist.items() if value is None or str(value).strip() == '']
-if missing_vars_olist: 
-    print(f"[❌ ERROR] Missing one or more required Snowflake environment variables: {', '.join(missing_vars_olist)}") 
-    sys.exit(1)
+# --- DuckDB target: no credentials, RAW is read from the DuckDB 'raw' schema or from local files ---
+def build_duckdb_profiles():
+    """
+    Build a fully local profile: dbt and Elementary both run on the DuckDB file at duckdb_path.
+    RAW tables come from the 'raw' schema of that file (ingest with INGEST_SINK=duckdb),
+    or straight from local CSV / Parquet files when DBT_DUCKDB_RAW_LOCATION is set (see models/sources/*.yml).
+    """
+    os.makedirs(os.path.dirname(duckdb_path), exist_ok=True)
+    return {
+        DBT_PROJECT_NAME: {
+            'target': duckdb_target,
+            'outputs': {
+                duckdb_target: {
+                    'type': 'duckdb',
+                    'path': duckdb_path,
+                    'schema': 'main',
+                    'threads': 4
+                }
+            }
+        },
+        # Named after ELEMENTARY_ENV: `edr report --profile-target $ELEMENTARY_ENV` (dbt_full_pipeline_dag) works on both targets
+        'elementary': {
+            'target': elementary_env_target,
+            'outputs': {
+                elementary_env_target: {
+                    'type': 'duckdb',
+                    'path': duckdb_path,
+                    'schema': 'elementary',
+                    'threads': 1
+                }
+            }
+        }
+    }
 
-# Check variables for ELEMENTARY profile
-required_vars_elementary = {
-    'ELEMENTARY_ACCOUNT': elementary_account,
-    'ELEMENTARY_USER': elementary_user,
-    'ELEMENTARY_PASSWORD': elementary_password,
-    'ELEMENTARY_WAREHOUSE': elementary_warehouse,
-    'ELEMENTARY_DATABASE': elementary_database,
-    'ELEMENTARY_SCHEMA': elementary_schema,
-    'ELEMENTARY_ENV': elementary_env_target
-}
-
-missing_vars_elementary = [key for key, value in required_vars_elementary.items() if value is None or str(value).strip() == '']
-if missing_vars_elementary: 
-    print(f"[❌ ERROR] Missing one or more required Elementary environment variables: {', '.join(missing_vars_elementary)}") 
-    sys.exit(1)
+if DBT_TARGET_TYPE == "duckdb":
+    profiles = build_duckdb_profiles()
+    print(f"[ℹ️ INFO] DuckDB target: {duckdb_path}")
+    if os.getenv("DBT_DUCKDB_RAW_LOCATION"):
+        print(f"[ℹ️ INFO] RAW tables read from: {os.getenv('DBT_DUCKDB_RAW_LOCATION')}")
+    else:
+        print("[ℹ️ INFO] RAW tables read from the 'raw' schema (set DBT_DUCKDB_RAW_LOCATION to read CSV / Parquet files directly)")
+
+else:
+    # --- Check required variables (HIGHLY RECOMMENDED) ---
+    # Check variables for OLIST_ELT_PIPELINE profile
+    required_vars_olist = { 
+        'SNOWFLAKE_ACCOUNT': snowflake_account, 
+        'SNOWFLAKE_USER': snowflake_user, 
+        'SNOWFLAKE_PASSWORD': snowflake_password, 
+        'SNOWFLAKE_WAREHOUSE': snowflake_warehouse, 
+        'SNOWFLAKE_DATABASE': snowflake_database, 
+        'SNOWFLAKE_SCHEMA': snowflake_schema, 
+        'SNOWFLAKE_ENV': snowflake_env_target
+    }
 
-# --- Build dictionary for profiles.yml ---
-profiles = {
-    DBT_PROJECT_NAME: {
-        'target': snowflake_env_target,
-        'outputs': {
-            snowflake_env_target: {
-                'type': 'snowflake',
-                'account': snowflake_account,
-                'user': snowflake_user,
-                'password': snowflake_password,
-                'role': snowflake_role,
-                'warehouse': snowflake_warehouse,
-                'database': snowflake_database,
-                'schema': snowflake_schema,
-                'threads': 4,
-                'client_session_keep_alive': True
+    missing_vars_olist = [key for key, value in required_vars_olist.items() if value is None or str(value).strip() == '']
+    if missing_vars_olist: 
+        print(f"[❌ ERROR] Missing one or more required Snowflake environment variables: {', '.join(missing_vars_olist)}") 
+        sys.exit(1)
+
+    # Check variables for ELEMENTARY profile
+    required_vars_elementary = {
+        'ELEMENTARY_ACCOUNT': elementary_account,
+        'ELEMENTARY_USER': elementary_user,
+        'ELEMENTARY_PASSWORD': elementary_password,
+        'ELEMENTARY_WAREHOUSE': elementary_warehouse,
+        'ELEMENTARY_DATABASE': elementary_database,
+        'ELEMENTARY_SCHEMA': elementary_schema,
+        'ELEMENTARY_ENV': elementary_env_target
+    }
+
+    missing_vars_elementary = [key for key, value in required_vars_elementary.items() if value is None or str(value).strip() == '']
+    if missing_vars_elementary: 
+        print(f"[❌ ERROR] Missing one or more required Elementary environment variables: {', '.join(missing_vars_elementary)}") 
+        sys.exit(1)
+
+    # --- Build dictionary for profiles.yml ---
+    profiles = {
+        DBT_PROJECT_NAME: {
+            'target': snowflake_env_target,
+            'outputs': {
+                snowflake_env_target: {
+                    'type': 'snowflake',
+                    'account': snowflake_account,
+                    'user': snowflake_user,
+                    'password': snowflake_password,
+                    'role': snowflake_role,
+                    'warehouse': snowflake_warehouse,
+                    'database': snowflake_database,
+                    'schema': snowflake_schema,
+                    'threads': 4,
+                    'client_session_keep_alive': True
+                }
             }
-        }
-    },
-    'elementary': {
-        'target': elementary_env_target,
-        'outputs': {
-            elementary_env_target: {
-                'type': 'snowflake',
-                'account': elementary_account,
-                'user': elementary_user,
-                'password': elementary_password,
-                'role': elementary_role,
-                'warehouse': elementary_warehouse,
-                'database': elementary_database,
-                'schema': elementary_schema,
-                'threads': 1,
-                'client_session_keep_alive': True
+        },
+        'elementary': {
+            'target': elementary_env_target,
+            'outputs': {
+                elementary_env_target: {
+                    'type': 'snowflake',
+                    'account': elementary_account,
+                    'user': elementary_user,
+                    'password': elementary_password,
+                    'role': elementary_role,
+                    'warehouse': elementary_warehouse,
+                    'database': elementary_database,
+                    'schema': elementary_schema,
+                    'threads': 1,
+                    'client_session_keep_alive': True
+                }
             }
         }
     }
-}
 
 # --- Main Execution ---
 if __name__ == "__main__":
     try:
-        os.makedirs(dbt_project_path, exist_ok=True)
+        os.makedirs(profiles_dir, exist_ok=True)
         with open(output_path, "w") as f:
             yaml.dump(profiles, f, default_flow_style=False, sort_keys=False)
         print(f"[✅] profiles.yml generated successfully at: {output_path}")
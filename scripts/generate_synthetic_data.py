@@ -0,0 +1,291 @@
+import os
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+
+# --------------- BASE VOLUMES (scale factor 1.0 ~ public Olist dataset) ---------------
+BASE_ROWS = {
+    "orders": 99_441,
+    "unique_customers": 96_096,
+    "products": 32_951,
+    "sellers": 3_095,
+    "geolocation": 1_000_163,
+    "zip_prefixes": 19_015,
+}
+
+# Zip code prefixes are 5 digits, so their number cannot grow with the scale factor forever
+MAX_ZIP_PREFIXES = 90_000
+
+# Output file names, same as extract_load/utils/ingest_config.py file_map
+FILE_NAMES = {
+    "customers": "olist_customers_dataset.csv",
+    "geolocation": "olist_geolocation_dataset.csv",
+    "order_items": "olist_order_items_dataset.csv",
+    "order_payments": "olist_order_payments_dataset.csv",
+    "order_reviews": "olist_order_reviews_dataset.csv",
+    "orders": "olist_orders_dataset.csv",
+    "products": "olist_products_dataset.csv",
+    "sellers": "olist_sellers_dataset.csv",
+    "product_category_name_translation": "product_category_name_translation.csv",
+}
+
+# Brazilian states with their approximate share of Olist customers (SP dominates)
+STATE_WEIGHTS = {
+    "SP": 0.42, "RJ": 0.13, "MG": 0.117, "RS": 0.055, "PR": 0.051, "SC": 0.037, "BA": 0.034,
+    "DF": 0.022, "ES": 0.02, "GO": 0.02, "PE": 0.017, "CE": 0.013, "PA": 0.01, "MT": 0.009,
+    "MA": 0.008, "MS": 0.007, "PB": 0.005, "PI": 0.005, "RN": 0.005, "AL": 0.004, "SE": 0.003,
+    "TO": 0.003, "RO": 0.003, "AM": 0.001, "AC": 0.001, "AP": 0.001, "RR": 0.001,
+}
+
+ORDER_STATUS_WEIGHTS = {
+    "delivered": 0.970, "shipped": 0.011, "canceled": 0.006, "unavailable": 0.006,
+    "invoiced": 0.003, "processing": 0.003, "created": 0.0005, "approved": 0.0005,
+}
+
+PAYMENT_TYPE_WEIGHTS = {"credit_card": 0.76, "boleto": 0.2, "debit_card": 0.015, "voucher": 0.025}
+
+REVIEW_SCORE_WEIGHTS = {5: 0.577, 4: 0.193, 3: 0.082, 2: 0.032, 1: 0.116}
+
+# Purchase window of the public dataset
+PURCHASE_START = pd.Timestamp("2016-09-04")
+PURCHASE_END = pd.Timestamp("2018-10-17")
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+def weighted_choice(rng, weights: dict, size: int) -> np.ndarray:
+    """Draw `size` keys of `weights` proportionally to their weights."""
+    keys = list(weights.keys())
+    p = np.array(list(weights.values()), dtype=float)
+    return np.array(keys, dtype=object)[rng.choice(len(keys), size=size, p=p / p.sum())]
+
+def random_ids(rng, size: int) -> np.ndarray:
+    """Generate `size` random 32-char hex ids (same shape as Olist ids)."""
+    raw = rng.integers(0, 2**63 - 1, size=(size, 2), dtype=np.int64)
+    return np.char.add(
+        np.char.zfill(np.char.mod("%x", raw[:, 0]).astype(str), 16),
+        np.char.zfill(np.char.mod("%x", raw[:, 1]).astype(str), 16)
+    ).astype(object)
+
+def zipf_index(rng, n_items: int, size: int, a: float = 1.3) -> np.ndarray:
+    """Skewed (hot items first) indexes in [0, n_items)."""
+    return (rng.zipf(a, size=size) - 1) % n_items
+
+def format_ts(values) -> pd.Series:
+    """Format datetimes like the Olist CSVs (empty string for missing values)."""
+    return pd.Series(pd.to_datetime(values)).dt.strftime(TIMESTAMP_FORMAT).fillna("")
+
+def load_categories(translation_path: str) -> pd.DataFrame:
+    """Reuse the real category translation file when available."""
+    if os.path.exists(translation_path):
+        return pd.read_csv(translation_path, encoding="utf-8-sig")
+    return pd.DataFrame({
+        "product_category_name": ["beleza_saude", "informatica_acessorios", "automotivo", "cama_mesa_banho", "esporte_lazer"],
+        "product_category_name_english": ["health_beauty", "computers_accessories", "auto", "bed_bath_table", "sports_leisure"],
+    })
+
+def generate_zip_prefixes(rng, n_prefixes: int) -> pd.DataFrame:
+    """Zip prefix pool with a state, a city and a centre coordinate each."""
+    prefixes = rng.choice(100_000, size=n_prefixes, replace=False)
+    states = weighted_choice(rng, STATE_WEIGHTS, n_prefixes)
+    # A handful of cities per state, the first one being the most frequent
+    city_rank = zipf_index(rng, 40, n_prefixes, a=1.6)
+    return pd.DataFrame({
+        "zip_code_prefix": pd.Series(prefixes).astype(str).str.zfill(5),
+        "state": states,
+        "city": pd.Series(states).str.lower() + "_city_" + pd.Series(city_rank).astype(str),
+        "lat": rng.uniform(-33.0, 2.0, n_prefixes),
+        "lng": rng.uniform(-72.0, -35.0, n_prefixes),
+    })
+
+def generate_geolocation(rng, zips: pd.DataFrame, n_rows: int) -> pd.DataFrame:
+    """Several jittered points per zip prefix plus exact duplicate rows, as in the real file."""
+    n_unique = int(n_rows * 0.75)
+    idx = zipf_index(rng, len(zips), n_unique, a=1.1)
+    geo = pd.DataFrame({
+        "geolocation_zip_code_prefix": zips["zip_code_prefix"].values[idx],
+        "geolocation_lat": zips["lat"].values[idx] + rng.normal(0, 0.02, n_unique),
+        "geolocation_lng": zips["lng"].values[idx] + rng.normal(0, 0.02, n_unique),
+        "geolocation_city": zips["city"].values[idx],
+        "geolocation_state": zips["state"].values[idx],
+    })
+    duplicates = geo.iloc[rng.integers(0, n_unique, n_rows - n_unique)]
+    return pd.concat([geo, duplicates], ignore_index=True).sample(frac=1.0, random_state=int(rng.integers(1e9)))
+
+def generate(scale: float, output_dir: str, seed: int = 42) -> dict:
+    """
+    Generate the nine Olist datasets at a given scale factor, keeping referential integrity
+    between orders, items, payments, reviews, customers, sellers and products.
+
+    Returns:
+        dict: {table_name: row_count}
+    """
+    rng = np.random.default_rng(seed)
+    n_orders = max(10, int(BASE_ROWS["orders"] * scale))
+    n_unique_customers = max(10, int(BASE_ROWS["unique_customers"] * scale))
+    n_products = max(10, int(BASE_ROWS["products"] * scale))
+    n_sellers = max(5, int(BASE_ROWS["sellers"] * scale))
+    n_geo = max(100, int(BASE_ROWS["geolocation"] * scale))
+    n_zips = min(MAX_ZIP_PREFIXES, max(50, int(BASE_ROWS["zip_prefixes"] * scale)))
+    os.makedirs(output_dir, exist_ok=True)
+    counts = {}
+
+    def write(table_name, df):
+        df.to_csv(os.path.join(output_dir, FILE_NAMES[table_name]), index=False)
+        counts[table_name] = len(df)
+        print(f"✅ {table_name}: {len(df):,} rows")
+
+    # --- Categories (fixed size) ---
+    categories = load_categories(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", FILE_NAMES["product_category_name_translation"]))
+    write("product_category_name_translation", categories)
+
+    # --- Geolocation ---
+    zips = generate_zip_prefixes(rng, n_zips)
+    write("geolocation", generate_geolocation(rng, zips, n_geo))
+
+    # --- Sellers ---
+    seller_zip = rng.integers(0, n_zips, n_sellers)
+    sellers = pd.DataFrame({
+        "seller_id": random_ids(rng, n_sellers),
+        "seller_zip_code_prefix": zips["zip_code_prefix"].values[seller_zip],
+        "seller_city": zips["city"].values[seller_zip],
+        "seller_state": zips["state"].values[seller_zip],
+    })
+    write("sellers", sellers)
+
+    # --- Products (each product is mostly sold by one seller, big sellers own more products) ---
+    category_idx = zipf_index(rng, len(categories), n_products, a=1.2)
+    category_names = categories["product_category_name"].values[category_idx].astype(object)
+    category_names[rng.random(n_products) < 0.0185] = None
+    products = pd.DataFrame({
+        "product_id": random_ids(rng, n_products),
+        "product_category_name": category_names,
+        "product_name_lenght": rng.integers(5, 77, n_products),
+        "product_description_lenght": rng.integers(4, 3993, n_products),
+        "product_photos_qty": rng.integers(1, 21, n_products),
+        "product_weight_g": np.round(rng.lognormal(6.6, 1.2, n_products)).astype(int),
+        "product_length_cm": rng.integers(7, 106, n_products),
+        "product_height_cm": rng.integers(2, 106, n_products),
+        "product_width_cm": rng.integers(6, 119, n_products),
+    })
+    write("products", products)
+    product_seller = zipf_index(rng, n_sellers, n_products, a=1.1)
+    product_price = np.round(rng.lognormal(4.4, 0.9, n_products) + 0.85, 2)
+
+    # --- Customers (one customer_id per order, ~3% repeat buyers share a customer_unique_id) ---
+    unique_ids = random_ids(rng, n_unique_customers)
+    unique_idx = np.concatenate([
+        rng.permutation(n_unique_customers)[:min(n_unique_customers, n_orders)],
+        rng.integers(0, n_unique_customers, max(0, n_orders - n_unique_customers))
+    ])
+    customer_zip = zipf_index(rng, n_zips, n_unique_customers, a=1.05)[unique_idx]
+    customers = pd.DataFrame({
+        "customer_id": random_ids(rng, n_orders),
+        "customer_unique_id": unique_ids[unique_idx],
+        "customer_zip_code_prefix": zips["zip_code_prefix"].values[customer_zip],
+        "customer_city": zips["city"].values[customer_zip],
+        "customer_state": zips["state"].values[customer_zip],
+    })
+    write("customers", customers)
+
+    # --- Orders (volume grows over time) ---
+    n_days = (PURCHASE_END - PURCHASE_START).days + 1
+    day_weights = np.linspace(0.1, 1.0, n_days)
+    purchase = (
+        PURCHASE_START
+        + pd.to_timedelta(rng.choice(n_days, n_orders, p=day_weights / day_weights.sum()), unit="D")
+        + pd.to_timedelta(rng.integers(0, 86_400, n_orders), unit="s")
+    )
+    status = weighted_choice(rng, ORDER_STATUS_WEIGHTS, n_orders)
+    approved = purchase + pd.to_timedelta(rng.exponential(10 * 3600, n_orders).astype(int), unit="s")
+    carrier = approved + pd.to_timedelta(rng.exponential(2.8 * 86_400, n_orders).astype(int), unit="s")
+    delivered = carrier + pd.to_timedelta(rng.gamma(3.0, 3.0 * 86_400, n_orders).astype(int), unit="s")
+    estimated = (purchase + pd.to_timedelta(rng.integers(10, 40, n_orders), unit="D")).normalize()
+    is_delivered = status == "delivered"
+    has_carrier = np.isin(status, ["delivered", "shipped"])
+    has_approval = ~np.isin(status, ["created", "canceled"])
+    orders = pd.DataFrame({
+        "order_id": random_ids(rng, n_orders),
+        "customer_id": customers["customer_id"].values,
+        "order_status": status,
+        "order_purchase_timestamp": format_ts(purchase),
+        "order_approved_at": format_ts(approved.where(has_approval)),
+        "order_delivered_carrier_date": format_ts(carrier.where(has_carrier)),
+        "order_delivered_customer_date": format_ts(delivered.where(is_delivered)),
+        "order_estimated_delivery_date": format_ts(estimated),
+    })
+    write("orders", orders)
+
+    # --- Order items (hot products via Zipf) ---
+    items_per_order = rng.geometric(0.885, n_orders)
+    n_items = int(items_per_order.sum())
+    item_order = np.repeat(np.arange(n_orders), items_per_order)
+    item_seq = np.arange(n_items) - np.repeat(np.cumsum(items_per_order) - items_per_order, items_per_order) + 1
+    item_product = rng.permutation(n_products)[zipf_index(rng, n_products, n_items)]
+    price = product_price[item_product]
+    freight = np.round(rng.lognormal(2.8, 0.55, n_items), 2)
+    order_items = pd.DataFrame({
+        "order_id": orders["order_id"].values[item_order],
+        "order_item_id": item_seq,
+        "product_id": products["product_id"].values[item_product],
+        "seller_id": sellers["seller_id"].values[product_seller[item_product]],
+        "shipping_limit_date": format_ts(purchase[item_order] + pd.Timedelta(days=6)),
+        "price": price,
+        "freight_value": freight,
+    })
+    write("order_items", order_items)
+
+    # --- Payments (most orders pay once, ~3% split the amount over several payments) ---
+    order_total = np.round(np.bincount(item_order, weights=price + freight, minlength=n_orders), 2)
+    payments_per_order = np.where(rng.random(n_orders) < 0.03, rng.integers(2, 5, n_orders), 1)
+    pay_order = np.repeat(np.arange(n_orders), payments_per_order)
+    pay_seq = np.arange(len(pay_order)) - np.repeat(np.cumsum(payments_per_order) - payments_per_order, payments_per_order) + 1
+    shares = rng.random(len(pay_order))
+    shares = shares / np.bincount(pay_order, weights=shares)[pay_order]
+    pay_type = weighted_choice(rng, PAYMENT_TYPE_WEIGHTS, len(pay_order))
+    # Split payments are vouchers plus one final payment of another type
+    is_split = payments_per_order[pay_order] > 1
+    pay_type[is_split & (pay_seq < payments_per_order[pay_order])] = "voucher"
+    installments = np.where(pay_type == "credit_card", rng.integers(1, 11, len(pay_order)), 1)
+    order_payments = pd.DataFrame({
+        "order_id": orders["order_id"].values[pay_order],
+        "payment_sequential": pay_seq,
+        "payment_type": pay_type,
+        "payment_installments": installments,
+        "payment_value": np.round(order_total[pay_order] * shares, 2),
+    })
+    write("order_payments", order_payments)
+
+    # --- Reviews (~99% of orders, a few review_ids shared between orders) ---
+    reviewed = np.flatnonzero(rng.random(n_orders) < 0.992)
+    n_reviews = len(reviewed)
+    review_ids = random_ids(rng, n_reviews)
+    dup = rng.random(n_reviews) < 0.008
+    review_ids[dup] = review_ids[rng.integers(0, n_reviews, int(dup.sum()))]
+    review_base = pd.Series(delivered[reviewed]).where(is_delivered[reviewed], pd.Series(estimated[reviewed]))
+    creation = (review_base + pd.Timedelta(days=1)).dt.normalize()
+    has_message = rng.random(n_reviews) < 0.41
+    order_reviews = pd.DataFrame({
+        "review_id": review_ids,
+        "order_id": orders["order_id"].values[reviewed],
+        "review_score": weighted_choice(rng, REVIEW_SCORE_WEIGHTS, n_reviews),
+        "review_comment_title": np.where(rng.random(n_reviews) < 0.12, "recomendo", None),
+        "review_comment_message": np.where(has_message, "produto chegou no prazo,\nrecomendo", None),
+        "review_creation_date": format_ts(creation),
+        "review_answer_timestamp": format_ts(creation + pd.to_timedelta(rng.exponential(3 * 86_400, n_reviews).astype(int), unit="s")),
+    })
+    write("order_reviews", order_reviews)
+
+    return counts
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic Olist datasets at a configurable scale factor.")
+    parser.add_argument("--scale", type=float, default=1.0, help="Scale factor (1.0 ~ public Olist volume, 10 = 10x)")
+    parser.add_argument("--output-dir", default=os.path.join("data", "synthetic"), help="Folder for the generated CSV files")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (same seed + scale = same data)")
+    args = parser.parse_args()
+
+    print(f"🔧 Generating Olist data at scale {args.scale} into {args.output_dir}")
+    generate(args.scale, args.output_dir, args.seed)
+    print(f"📌 Ingest it with: INGEST_DATA_DIR={os.path.abspath(args.output_dir)} ./ingest_all.sh --force")
+    sys.exit(0)